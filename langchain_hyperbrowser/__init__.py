@@ -1,14 +1,17 @@
-from importlib import metadata
-
-from langchain_hyperbrowser.hyperbrowser_loader import HyperbrowserLoader
-from langchain_hyperbrowser.extract_tool import HyperbrowserExtractTool
-from langchain_hyperbrowser.browser_use_tool import HyperbrowserBrowserUseTool
-from langchain_hyperbrowser.claude_computer_use_tool import (
-    HyperbrowserClaudeComputerUseTool,
-)
-from langchain_hyperbrowser.openai_cua_tool import HyperbrowserOpenAICUATool
-from langchain_hyperbrowser.crawl_tool import HyperbrowserCrawlTool
-from langchain_hyperbrowser.scrape_tool import HyperbrowserScrapeTool
+from importlib import import_module, metadata
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from langchain_hyperbrowser._utilities import aclose_clients, close_clients
+    from langchain_hyperbrowser.browser_use_tool import HyperbrowserBrowserUseTool
+    from langchain_hyperbrowser.claude_computer_use_tool import (
+        HyperbrowserClaudeComputerUseTool,
+    )
+    from langchain_hyperbrowser.crawl_tool import HyperbrowserCrawlTool
+    from langchain_hyperbrowser.extract_tool import HyperbrowserExtractTool
+    from langchain_hyperbrowser.hyperbrowser_loader import HyperbrowserLoader
+    from langchain_hyperbrowser.openai_cua_tool import HyperbrowserOpenAICUATool
+    from langchain_hyperbrowser.scrape_tool import HyperbrowserScrapeTool
 
 try:
     __version__ = metadata.version(__package__ or "langchain_hyperbrowser")
@@ -17,6 +20,34 @@ except metadata.PackageNotFoundError:
     __version__ = ""
 del metadata  # optional, avoids polluting the results of dir(__package__)
 
+# Public names are resolved on first access (PEP 562) so that importing the
+# package, or only the loader, does not pull in every tool and the SDK models.
+_LAZY_IMPORTS = {
+    "HyperbrowserLoader": "hyperbrowser_loader",
+    "HyperbrowserExtractTool": "extract_tool",
+    "HyperbrowserBrowserUseTool": "browser_use_tool",
+    "HyperbrowserClaudeComputerUseTool": "claude_computer_use_tool",
+    "HyperbrowserOpenAICUATool": "openai_cua_tool",
+    "HyperbrowserScrapeTool": "scrape_tool",
+    "HyperbrowserCrawlTool": "crawl_tool",
+    "close_clients": "_utilities",
+    "aclose_clients": "_utilities",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
+
+
 __all__ = [
     "HyperbrowserLoader",
     "HyperbrowserExtractTool",
@@ -25,5 +56,7 @@ __all__ = [
     "HyperbrowserOpenAICUATool",
     "HyperbrowserScrapeTool",
     "HyperbrowserCrawlTool",
+    "close_clients",
+    "aclose_clients",
     "__version__",
 ]
@@ -0,0 +1,332 @@
+"""Shared base class for the Hyperbrowser tools."""
+
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Collection,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from hyperbrowser import AsyncHyperbrowser, Hyperbrowser
+from hyperbrowser.models import CreateSessionParams
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import get_config_list
+from langchain_core.tools import BaseTool
+from pydantic import Field, PrivateAttr, SecretStr, field_validator, model_validator
+
+from ._utilities import ClientRefs, initialize_client
+from .batching import BatchExecutor, get_default_batch_executor
+from .common import SimpleSessionParams, session_params
+from .job_scheduler import JobScheduler, get_default_scheduler
+from .keypool import KeyPool, as_key_pool
+from .lifecycle import JobTracker
+from .output import OutputOptions, encode_output
+from .profiling import Profiler, instrument_client, phase
+
+# Results fetched ahead of time by a native batch call, keyed by the tool's
+# ``_batch_key`` for the arguments that produced them.
+_prefetched: ContextVar[Optional[Dict[Hashable, Any]]] = ContextVar(
+    "hyperbrowser_prefetched", default=None
+)
+
+
+class HyperbrowserBaseTool(BaseTool):
+    """Base tool holding the API key and lazily resolved Hyperbrowser clients.
+
+    ``client`` and ``async_client`` may be passed explicitly. Otherwise the
+    shared client for the tool's API key is looked up on first use, so a tool
+    that only ever runs synchronously never builds an async client and
+    vice versa.
+
+    Every remote job is admitted through a :class:`JobScheduler` (the shared
+    default unless ``scheduler`` is set) under the tool's ``priority`` class.
+
+    With ``output`` set, results are returned as compact JSON strings shaped
+    by those :class:`OutputOptions` instead of dicts of response objects.
+
+    With ``profiler`` set, every call is recorded there with per-phase
+    timings.
+
+    With ``key_pool`` set, each job leases one of several API keys instead of
+    using ``api_key``.
+
+    Tools are context managers (``with`` and ``async with``); leaving the
+    block, or calling :meth:`close` or :meth:`aclose`, stops new calls, waits
+    for running jobs (stopping agent tasks if the block raised) and releases
+    the tool's shared clients, closing those no other tool or loader uses.
+    """
+
+    client: Optional[Hyperbrowser] = Field(default=None)
+    async_client: Optional[AsyncHyperbrowser] = Field(default=None)
+    api_key: SecretStr = Field(default=None)  # type: ignore
+    priority: str = Field(
+        default="interactive", description="Scheduler priority class for jobs"
+    )
+    scheduler: Optional[JobScheduler] = Field(default=None)
+    output: Optional[OutputOptions] = Field(
+        default=None, description="Compact encoding of the tool result"
+    )
+    profiler: Optional[Profiler] = Field(
+        default=None, description="Profiler recording per-phase call timings"
+    )
+    session_profile: Optional[str] = Field(
+        default=None,
+        description="Registered session profile that calls start from",
+    )
+    key_pool: Optional[KeyPool] = Field(
+        default=None,
+        description=(
+            "API keys that jobs are spread across. Accepts a KeyPool, a list "
+            "of keys or a dict of key to weight"
+        ),
+    )
+    _jobs: JobTracker = PrivateAttr(default_factory=JobTracker)
+    _clients: ClientRefs = PrivateAttr(default_factory=ClientRefs)
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_environment(cls, values: Dict) -> Any:
+        """Validate the environment."""
+        values = initialize_client(values)
+        return values
+
+    _build_key_pool = field_validator("key_pool", mode="before")(as_key_pool)
+
+    def _api_key(self) -> str:
+        """The key leased for the running job, else the tool's API key."""
+        if self.key_pool is not None:
+            key = self.key_pool.current()
+            if key is not None:
+                return key
+        return self.api_key.get_secret_value()
+
+    def _get_client(self) -> Hyperbrowser:
+        """Return the synchronous client for this tool."""
+        client = self.client or self._clients.get(self._api_key())
+        if self.profiler is not None:
+            instrument_client(client)
+        return client
+
+    def _get_async_client(self) -> AsyncHyperbrowser:
+        """Return the async client for this tool on the running event loop."""
+        client = self.async_client or self._clients.get_async(self._api_key())
+        if self.profiler is not None:
+            instrument_client(client)
+        return client
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        if self.profiler is None:
+            return super().run(*args, **kwargs)
+        with self.profiler.call(self.name):
+            return super().run(*args, **kwargs)
+
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        if self.profiler is None:
+            return await super().arun(*args, **kwargs)
+        with self.profiler.call(self.name):
+            return await super().arun(*args, **kwargs)
+
+    def _session_params(
+        self, options: Optional[SimpleSessionParams]
+    ) -> Optional[CreateSessionParams]:
+        """Session parameters for a call, based on the tool's session profile."""
+        return session_params(options, self.session_profile)
+
+    def _format_result(self, result: Any, omit: Collection[str] = ()) -> Any:
+        """Apply the tool's output options to a result."""
+        if self.output is None:
+            return result
+        with phase("result"):
+            return encode_output(result, self.output, omit)
+
+    @contextmanager
+    def _job_slot(self) -> Iterator[None]:
+        """Hold a scheduler slot while a remote job runs."""
+        scheduler = self.scheduler or get_default_scheduler()
+        with self._jobs.track(), ExitStack() as stack:
+            with phase("queue"):
+                stack.enter_context(scheduler.slot(self.priority))
+            if self.key_pool is not None:
+                stack.enter_context(self.key_pool.lease())
+            with phase("job"):
+                yield
+
+    @asynccontextmanager
+    async def _ajob_slot(self) -> AsyncIterator[None]:
+        """Hold a scheduler slot while a remote job runs."""
+        scheduler = self.scheduler or get_default_scheduler()
+        with self._jobs.track():
+            async with AsyncExitStack() as stack:
+                with phase("queue"):
+                    await stack.enter_async_context(scheduler.aslot(self.priority))
+                if self.key_pool is not None:
+                    stack.enter_context(self.key_pool.lease())
+                with phase("job"):
+                    yield
+
+    def close(self, timeout: Optional[float] = None, cancel: bool = False) -> bool:
+        """Shut the tool down and close its synchronous connection pool.
+
+        Args:
+            timeout: Seconds to wait for running jobs, or None to wait for all.
+            cancel: Stop running agent tasks instead of letting them finish.
+
+        Returns:
+            Whether every running job finished within ``timeout``.
+        """
+        self._jobs.close(cancel=cancel)
+        drained = self._jobs.drain(timeout)
+        self._close_sync_client()
+        return drained
+
+    async def aclose(
+        self, timeout: Optional[float] = None, cancel: bool = False
+    ) -> bool:
+        """Shut the tool down and close its connection pools on this loop."""
+        self._jobs.close(cancel=cancel)
+        drained = await self._jobs.adrain(timeout)
+        if self.async_client is not None:
+            await self.async_client.close()
+        else:
+            await self._clients.aclose()
+        self._close_sync_client()
+        return drained
+
+    def _close_sync_client(self) -> None:
+        if self.client is not None:
+            self.client.close()
+        else:
+            self._clients.close()
+
+    def __enter__(self) -> "HyperbrowserBaseTool":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close(cancel=exc_type is not None)
+
+    async def __aenter__(self) -> "HyperbrowserBaseTool":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.aclose(cancel=exc_type is not None)
+
+
+def _tool_args(tool_input: Any) -> Optional[Dict[str, Any]]:
+    """Return the keyword arguments carried by a tool input, if it has any."""
+    if isinstance(tool_input, dict):
+        if tool_input.get("type") == "tool_call" and "args" in tool_input:
+            return tool_input["args"]
+        return tool_input
+    return None
+
+
+class HyperbrowserBatchTool(HyperbrowserBaseTool):
+    """Base for tools with native ``batch`` and ``abatch`` implementations.
+
+    Items run through a :class:`BatchExecutor` (the shared default unless
+    ``batch_executor`` is set), so concurrent batches across tools share one
+    concurrency bound; ``max_concurrency`` in the run config tightens it per
+    call. Tools whose backend accepts many inputs in one job override
+    ``_prefetch_batch`` and ``_aprefetch_batch`` to fetch results up front;
+    each item is then still invoked individually, so validation, callbacks
+    and ``ToolMessage`` formatting behave exactly as with ``invoke``.
+
+    Results come back in input order. With ``return_exceptions=True`` a
+    failing item yields its exception instead of aborting the batch.
+    """
+
+    batch_executor: Optional[BatchExecutor] = Field(default=None)
+
+    def _batch_key(self, **kwargs: Any) -> Optional[Hashable]:
+        """Key identifying a prefetched result for the given tool arguments."""
+        return None
+
+    def _prefetch_batch(self, args: List[Dict[str, Any]]) -> Dict[Hashable, Any]:
+        """Fetch results for many argument sets at once, keyed by ``_batch_key``."""
+        return {}
+
+    async def _aprefetch_batch(self, args: List[Dict[str, Any]]) -> Dict[Hashable, Any]:
+        """Asynchronously fetch results for many argument sets at once."""
+        return {}
+
+    def _take_prefetched(self, **kwargs: Any) -> Tuple[bool, Any]:
+        """Look up a result prefetched by the surrounding batch call."""
+        prefetched = _prefetched.get()
+        if prefetched:
+            key = self._batch_key(**kwargs)
+            if key is not None and key in prefetched:
+                return True, prefetched[key]
+        return False, None
+
+    def _batch_args(self, inputs: Sequence[Any]) -> List[Dict[str, Any]]:
+        args = []
+        for tool_input in inputs:
+            tool_args = _tool_args(tool_input)
+            if tool_args is None and isinstance(tool_input, str):
+                tool_args = {"url": tool_input}
+            if tool_args is not None:
+                args.append(tool_args)
+        return args
+
+    def batch(
+        self,
+        inputs: List[Any],
+        config: Optional[Union[RunnableConfig, List[RunnableConfig]]] = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[Any]:
+        if not inputs:
+            return []
+        configs = get_config_list(config, len(inputs))
+        executor = self.batch_executor or get_default_batch_executor()
+
+        def invoke(item: Tuple[Any, RunnableConfig]) -> Any:
+            return self.invoke(item[0], item[1], **kwargs)
+
+        token = _prefetched.set(self._prefetch_batch(self._batch_args(inputs)))
+        try:
+            return executor.map(
+                invoke,
+                list(zip(inputs, configs)),
+                max_concurrency=configs[0].get("max_concurrency"),
+                return_exceptions=return_exceptions,
+            )
+        finally:
+            _prefetched.reset(token)
+
+    async def abatch(
+        self,
+        inputs: List[Any],
+        config: Optional[Union[RunnableConfig, List[RunnableConfig]]] = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[Any]:
+        if not inputs:
+            return []
+        configs = get_config_list(config, len(inputs))
+        executor = self.batch_executor or get_default_batch_executor()
+
+        async def ainvoke(item: Tuple[Any, RunnableConfig]) -> Any:
+            return await self.ainvoke(item[0], item[1], **kwargs)
+
+        token = _prefetched.set(await self._aprefetch_batch(self._batch_args(inputs)))
+        try:
+            return await executor.amap(
+                ainvoke,
+                list(zip(inputs, configs)),
+                max_concurrency=configs[0].get("max_concurrency"),
+                return_exceptions=return_exceptions,
+            )
+        finally:
+            _prefetched.reset(token)
@@ -1,18 +1,197 @@
+import asyncio
+import atexit
 import os
-from typing import Dict
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from hyperbrowser import ClientConfig, Hyperbrowser, AsyncHyperbrowser  # type: ignore
 from langchain_core.utils import convert_to_secret_str
 
+if TYPE_CHECKING:
+    from hyperbrowser import AsyncHyperbrowser, Hyperbrowser
+
+# Clients are shared by API key so that tools and loaders instantiated per
+# request reuse one connection pool instead of building their own. Async
+# clients are additionally keyed by event loop, since an httpx connection pool
+# cannot be shared across loops.
+_clients: Dict[str, "Hyperbrowser"] = {}
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+# Number of ClientRefs holding each shared client, by key and by loop and key.
+_refs: Dict[str, int] = {}
+_async_refs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
 
 def initialize_client(values: Dict) -> Dict:
-    """Initialize the client."""
+    """Resolve the API key. Clients are created lazily on first use."""
     api_key = values.get("api_key") or os.environ.get("HYPERBROWSER_API_KEY") or ""
     values["api_key"] = convert_to_secret_str(api_key)
-    args = {
-        "api_key": values["api_key"].get_secret_value(),
-    }
-    values["client"] = Hyperbrowser(ClientConfig(**args))
-    values["async_client"] = AsyncHyperbrowser(ClientConfig(**args))
 
     return values
+
+
+def _shared_client(api_key: str) -> "Hyperbrowser":
+    client = _clients.get(api_key)
+    if client is None:
+        from hyperbrowser import ClientConfig, Hyperbrowser
+
+        client = Hyperbrowser(ClientConfig(api_key=api_key))
+        _clients[api_key] = client
+    return client
+
+
+def _shared_async_client(loop: Any, api_key: str) -> "AsyncHyperbrowser":
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(api_key)
+    if client is None:
+        from hyperbrowser import AsyncHyperbrowser, ClientConfig
+
+        client = AsyncHyperbrowser(ClientConfig(api_key=api_key))
+        clients[api_key] = client
+    return client
+
+
+def get_client(api_key: str) -> "Hyperbrowser":
+    """Return the shared synchronous client for ``api_key``, creating it if needed."""
+    with _lock:
+        return _shared_client(api_key)
+
+
+def get_async_client(api_key: str) -> "AsyncHyperbrowser":
+    """Return the shared async client for ``api_key`` on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        return _shared_async_client(loop, api_key)
+
+
+class ClientRefs:
+    """The shared clients used by one tool or loader.
+
+    Each shared client counts the ``ClientRefs`` holding it. :meth:`close`
+    and :meth:`aclose` release only this holder's references, and a client
+    is closed once no holder is left, so closing one tool does not close
+    the connection pool of another tool on the same key.
+    """
+
+    def __init__(self) -> None:
+        self._held: Dict[str, "Hyperbrowser"] = {}
+        self._async_held: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get(self, api_key: str) -> "Hyperbrowser":
+        """Return the shared synchronous client for ``api_key``, holding it."""
+        with _lock:
+            client = _shared_client(api_key)
+            if self._held.get(api_key) is not client:
+                self._held[api_key] = client
+                _refs[api_key] = _refs.get(api_key, 0) + 1
+            return client
+
+    def get_async(self, api_key: str) -> "AsyncHyperbrowser":
+        """Return the shared async client for ``api_key`` on the running loop."""
+        loop = asyncio.get_running_loop()
+        with _lock:
+            client = _shared_async_client(loop, api_key)
+            held = self._async_held.setdefault(loop, {})
+            if held.get(api_key) is not client:
+                held[api_key] = client
+                refs = _async_refs.setdefault(loop, {})
+                refs[api_key] = refs.get(api_key, 0) + 1
+            return client
+
+    def close(self) -> None:
+        """Release the synchronous clients, closing those no one else holds."""
+        with _lock:
+            closing = _release(_clients, _refs, self._held)
+            self._held = {}
+        for client in closing:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Release the async clients held on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with _lock:
+            closing = _release(
+                _async_clients.get(loop, {}),
+                _async_refs.get(loop, {}),
+                self._async_held.pop(loop, {}),
+            )
+        for client in closing:
+            await client.close()
+
+
+def _release(
+    clients: Dict[str, Any], refs: Dict[str, int], held: Dict[str, Any]
+) -> List[Any]:
+    """Drop references to held clients; return those no one holds any more.
+
+    Clients already closed and replaced since they were taken are skipped.
+    """
+    closing = []
+    for api_key, client in held.items():
+        if clients.get(api_key) is not client:
+            continue
+        count = refs.get(api_key, 0) - 1
+        if count > 0:
+            refs[api_key] = count
+        else:
+            refs.pop(api_key, None)
+            closing.append(clients.pop(api_key))
+    return closing
+
+
+def _pop(clients: Dict[str, Any], api_key: Optional[str]) -> List[Any]:
+    """Remove and return all clients, or just the one for ``api_key``."""
+    if api_key is None:
+        popped = list(clients.values())
+        clients.clear()
+        return popped
+    client = clients.pop(api_key, None)
+    return [] if client is None else [client]
+
+
+def _forget(refs: Dict[str, int], api_key: Optional[str]) -> None:
+    if api_key is None:
+        refs.clear()
+    else:
+        refs.pop(api_key, None)
+
+
+def close_clients(api_key: Optional[str] = None) -> None:
+    """Close every shared client that can be closed from synchronous code.
+
+    With ``api_key``, only that key's clients are closed; later calls for the
+    key create fresh ones. Async clients bound to a loop that is still
+    running must be closed from that loop with :func:`aclose_clients`. This
+    runs automatically at exit.
+    """
+    with _lock:
+        clients = _pop(_clients, api_key)
+        _forget(_refs, api_key)
+        for loop in list(_async_refs):
+            if not loop.is_running():
+                _forget(_async_refs[loop], api_key)
+        idle_loops = [
+            (loop, _pop(_async_clients[loop], api_key))
+            for loop in list(_async_clients)
+            if not loop.is_running()
+        ]
+    for client in clients:
+        client.close()
+    for loop, async_clients in idle_loops:
+        if loop.is_closed():
+            continue
+        for async_client in async_clients:
+            loop.run_until_complete(async_client.close())
+
+
+async def aclose_clients(api_key: Optional[str] = None) -> None:
+    """Close the shared async clients bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _pop(_async_clients.get(loop, {}), api_key)
+        _forget(_async_refs.get(loop, {}), api_key)
+    for client in clients:
+        await client.close()
+
+
+atexit.register(close_clients)
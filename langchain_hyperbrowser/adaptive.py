@@ -0,0 +1,213 @@
+"""Adaptive concurrency limiting driven by observed latency and errors."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+from .job_scheduler import _Waiter
+
+# Status codes that mean the backend is shedding load.
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether ``error`` (or an error it wraps) is a rate limit or overload."""
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if getattr(current, "status_code", None) in OVERLOAD_STATUS_CODES:
+            return True
+        current = getattr(current, "original_error", None) or current.__cause__
+    return False
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that adapts to how the backend is coping.
+
+    The limit grows additively, by about one slot per ``limit`` successful
+    jobs, while jobs are using the whole limit, the error rate is low and
+    latency stays within ``latency_tolerance`` times the best latency seen
+    recently. It is cut multiplicatively by ``backoff`` on 429/503 responses
+    or a high error rate, and shrinks gently while latency (which includes
+    time spent queued server-side) is inflated. At most one multiplicative
+    cut happens per smoothed latency interval, so a burst of rate-limit
+    errors from jobs started together counts as a single congestion signal.
+
+    Slots are taken from threads with :meth:`slot` and from coroutines with
+    :meth:`aslot`. The current limit is exposed as :attr:`limit` and in
+    :meth:`stats`.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        max_error_rate: float = 0.1,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        if latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be greater than 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.smoothing = smoothing
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._error_rate = 0.0
+        self._last_cut = float("-inf")
+        self._completed = 0
+        self._overloads = 0
+        self._queue_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Number of jobs currently allowed in flight."""
+        return int(self._limit)
+
+    def _try_acquire(self) -> bool:
+        """Take a slot if one is free and nobody is queued. Requires the lock."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return True
+        return False
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued waiters in FIFO order. Requires the lock."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.cancelled:
+                continue
+            self._in_flight += 1
+            self._queue_seconds += time.monotonic() - waiter.enqueued
+            waiter.wake()
+
+    def _cut(self, factor: float, now: float) -> None:
+        if self._latency is not None and now - self._last_cut < self._latency:
+            return
+        self._last_cut = now
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+    def _record(self, latency: float, error: Optional[BaseException]) -> None:
+        """Update the limit with one finished job. Requires the lock."""
+        saturated = self._in_flight >= self.limit
+        now = self._clock()
+        self._completed += 1
+        self._error_rate += self.smoothing * (
+            (1.0 if error is not None else 0.0) - self._error_rate
+        )
+        if error is not None:
+            if is_overload_error(error):
+                self._overloads += 1
+                self._cut(self.backoff, now)
+            elif self._error_rate > self.max_error_rate:
+                self._cut(self.backoff, now)
+            return
+
+        if self._latency is None or self._baseline is None:
+            self._latency = self._baseline = latency
+        else:
+            self._latency += self.smoothing * (latency - self._latency)
+            # The baseline tracks the best recent latency but drifts upwards
+            # slowly, so a permanent shift in job duration is eventually
+            # accepted as the new normal.
+            if latency < self._baseline:
+                self._baseline = latency
+            else:
+                self._baseline += 0.01 * (latency - self._baseline)
+
+        if self._latency > self._baseline * self.latency_tolerance:
+            self._limit = max(float(self.min_limit), self._limit * 0.95)
+        elif saturated and self._error_rate <= self.max_error_rate:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _release(self, started: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            self._record(self._clock() - started, error)
+            self._in_flight -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a slot while a job runs, recording its latency and outcome."""
+        waiter = _Waiter("")
+        with self._lock:
+            acquired = self._try_acquire()
+            if not acquired:
+                waiter.event = threading.Event()
+                self._waiters.append(waiter)
+        if not acquired:
+            waiter.event.wait()  # type: ignore[union-attr]
+        started = self._clock()
+        try:
+            yield
+        except BaseException as e:
+            self._release(started, e)
+            raise
+        self._release(started, None)
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        """Hold a slot while a job runs, recording its latency and outcome."""
+        waiter = _Waiter("")
+        with self._lock:
+            acquired = self._try_acquire()
+            if not acquired:
+                waiter.loop = asyncio.get_running_loop()
+                waiter.future = waiter.loop.create_future()
+                self._waiters.append(waiter)
+        if not acquired:
+            try:
+                await waiter.future  # type: ignore[misc]
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter.granted:
+                        self._in_flight -= 1
+                        self._dispatch()
+                raise
+        started = self._clock()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Cancellation says nothing about the backend's health.
+            with self._lock:
+                self._in_flight -= 1
+                self._dispatch()
+            raise
+        except BaseException as e:
+            self._release(started, e)
+            raise
+        self._release(started, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current limit and the signals that drive it."""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "latency": self._latency,
+                "baseline_latency": self._baseline,
+                "error_rate": self._error_rate,
+                "completed": self._completed,
+                "overloads": self._overloads,
+                "queue_seconds": self._queue_seconds,
+            }
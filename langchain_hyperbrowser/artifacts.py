@@ -0,0 +1,183 @@
+"""Content-addressed local storage for binary scrape artifacts.
+
+Screenshots arrive as base64 strings. Instead of keeping them in tool
+results and Document metadata, they are decoded chunk by chunk into files
+named after their SHA-256 digest, and results carry a reference. Reading an
+artifact maps its file, so the bytes are not copied into Python memory.
+"""
+
+import binascii
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from pydantic import BaseModel
+
+ARTIFACT_SCHEME = "artifact://sha256/"
+# Base64 characters read at a time.
+_CHUNK_CHARS = 1 << 20
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+_WHITESPACE = re.compile(r"\s+")
+_REMOTE = ("http://", "https://", ARTIFACT_SCHEME)
+
+
+def _media_type(head: bytes) -> str:
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"%PDF"):
+        return "application/pdf"
+    return "application/octet-stream"
+
+
+class ArtifactRef(BaseModel):
+    """Reference to an artifact in an :class:`ArtifactStore`."""
+
+    sha256: str
+    size: int
+    media_type: str
+    path: str
+
+    @property
+    def uri(self) -> str:
+        return ARTIFACT_SCHEME + self.sha256
+
+    def view(self) -> memoryview:
+        """Map the artifact's file read-only and return a view of its bytes."""
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return memoryview(b"")
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+ArtifactLike = Union[ArtifactRef, Dict[str, Any], str]
+
+
+class ArtifactStore:
+    """A directory of artifacts keyed by the SHA-256 of their content.
+
+    Files are written to a temporary name and renamed into place, so readers
+    never see a partial artifact, and storing the same bytes twice keeps one
+    file. ``root`` defaults to ``hyperbrowser-artifacts`` in the system temp
+    dir.
+    """
+
+    def __init__(self, root: Optional[str] = None, chunk_chars: int = _CHUNK_CHARS):
+        if chunk_chars < 4 or chunk_chars % 4:
+            raise ValueError("chunk_chars must be a positive multiple of 4")
+        self.root = root or os.path.join(
+            tempfile.gettempdir(), "hyperbrowser-artifacts"
+        )
+        self.chunk_chars = chunk_chars
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _put(self, chunks: Iterable[bytes]) -> ArtifactRef:
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
+        fd, temp = tempfile.mkstemp(prefix=".artifact-", dir=self.root)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for chunk in chunks:
+                    if len(head) < 12:
+                        head = (head + chunk)[:12]
+                    digest.update(chunk)
+                    file.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            path = self._path(sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                os.remove(temp)
+            else:
+                os.replace(temp, path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        return ArtifactRef(
+            sha256=sha256, size=size, media_type=_media_type(head), path=path
+        )
+
+    def put_bytes(self, data: bytes) -> ArtifactRef:
+        """Store raw bytes."""
+        return self._put([data])
+
+    def put_base64(self, data: str) -> ArtifactRef:
+        """Store base64 data, or a base64 ``data:`` URI, decoding it in chunks.
+
+        Whitespace, such as the line breaks of MIME-wrapped base64, is
+        skipped; characters past a multiple of 4 carry over to the next chunk.
+        """
+        start = data.index(",") + 1 if data.startswith("data:") else 0
+
+        def chunks() -> Iterator[bytes]:
+            carry = ""
+            for offset in range(start, len(data), self.chunk_chars):
+                piece = data[offset : offset + self.chunk_chars]
+                text = carry + _WHITESPACE.sub("", piece)
+                end = len(text) - len(text) % 4
+                carry = text[end:]
+                if end:
+                    yield binascii.a2b_base64(text[:end])
+            if carry:
+                yield binascii.a2b_base64(carry)
+
+        return self._put(chunks())
+
+    def get(self, ref: ArtifactLike) -> ArtifactRef:
+        """Resolve an :class:`ArtifactRef`, its dict, URI or digest."""
+        if isinstance(ref, ArtifactRef):
+            return ref
+        if isinstance(ref, dict):
+            return ArtifactRef(**ref)
+        digest = ref[len(ARTIFACT_SCHEME) :] if ref.startswith(ARTIFACT_SCHEME) else ref
+        path = self._path(digest)
+        if not _DIGEST.fullmatch(digest) or not os.path.exists(path):
+            raise KeyError(ref)
+        with open(path, "rb") as file:
+            head = file.read(12)
+        return ArtifactRef(
+            sha256=digest,
+            size=os.path.getsize(path),
+            media_type=_media_type(head),
+            path=path,
+        )
+
+    def open(self, ref: ArtifactLike) -> memoryview:
+        """Return a read-only, memory-mapped view of an artifact's bytes."""
+        return self.get(ref).view()
+
+
+def store_screenshot(data: Any, store: ArtifactStore) -> Optional[ArtifactRef]:
+    """Move a scrape's base64 screenshot into ``store``.
+
+    ``data.screenshot`` is replaced by the artifact's URI. Screenshots given
+    as URLs, or already stored, are left as they are and ``None`` is returned.
+    """
+    screenshot = getattr(data, "screenshot", None)
+    if not screenshot or screenshot.startswith(_REMOTE):
+        return None
+    ref = store.put_base64(screenshot)
+    data.screenshot = ref.uri
+    return ref
+
+
+def as_artifact_store(value: Any) -> Any:
+    """Build an :class:`ArtifactStore` from ``True`` or a directory path."""
+    if value is True:
+        return ArtifactStore()
+    if value is False:
+        return None
+    if isinstance(value, (str, os.PathLike)):
+        return ArtifactStore(os.fspath(value))
+    return value
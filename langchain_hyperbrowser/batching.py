@@ -0,0 +1,151 @@
+"""Shared bounded-concurrency execution for tool batches."""
+
+import asyncio
+import contextvars
+import threading
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from .adaptive import AdaptiveLimiter
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BatchExecutor:
+    """Run batch items with a concurrency bound shared by every caller.
+
+    Synchronous batches share one thread pool and asynchronous batches share
+    one semaphore per event loop, so many concurrent ``batch``/``abatch`` calls
+    never start more than ``max_concurrency`` remote jobs between them. Each
+    call may ask for a tighter per-call limit. With a ``limiter``, items are
+    further admitted through that :class:`AdaptiveLimiter`, so the effective
+    concurrency follows observed latency and errors below ``max_concurrency``.
+    """
+
+    def __init__(
+        self, max_concurrency: int = 8, limiter: Optional[AdaptiveLimiter] = None
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.limiter = limiter
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="hyperbrowser-batch",
+                )
+            return self._pool
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(
+                    self.max_concurrency
+                )
+            return semaphore
+
+    def _call(self, fn: Callable[[T], R], item: T, return_exceptions: bool) -> Any:
+        try:
+            if self.limiter is None:
+                return fn(item)
+            with self.limiter.slot():
+                return fn(item)
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
+    async def _acall(
+        self, fn: Callable[[T], Awaitable[R]], item: T, return_exceptions: bool
+    ) -> Any:
+        try:
+            if self.limiter is None:
+                return await fn(item)
+            async with self.limiter.aslot():
+                return await fn(item)
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
+    def map(
+        self,
+        fn: Callable[[T], R],
+        items: Sequence[T],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Apply ``fn`` to ``items`` and return the results in input order.
+
+        Each item runs in a copy of the caller's context. With
+        ``return_exceptions`` a failing item yields its exception; otherwise
+        the first exception is re-raised once all submitted items finished.
+        """
+        pool = self._get_pool()
+        limit = max_concurrency or len(items) or 1
+        results: List[Any] = [None] * len(items)
+        running: Dict[Future, int] = {}
+        next_index = 0
+        error: Optional[BaseException] = None
+        while next_index < len(items) or running:
+            while error is None and next_index < len(items) and len(running) < limit:
+                context = contextvars.copy_context()
+                future = pool.submit(
+                    context.run, self._call, fn, items[next_index], return_exceptions
+                )
+                running[future] = next_index
+                next_index += 1
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                try:
+                    results[index] = future.result()
+                except BaseException as e:  # noqa: BLE001
+                    error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    async def amap(
+        self,
+        fn: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Await ``fn`` over ``items`` and return the results in input order."""
+        shared = self._get_semaphore()
+        local = asyncio.Semaphore(max_concurrency or len(items) or 1)
+
+        async def run(item: T) -> Any:
+            async with local, shared:
+                return await self._acall(fn, item, return_exceptions)
+
+        return list(await asyncio.gather(*(run(item) for item in items)))
+
+    def shutdown(self) -> None:
+        """Stop the shared thread pool; it is recreated on next use."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+_default_executor = BatchExecutor()
+
+
+def get_default_batch_executor() -> BatchExecutor:
+    """Return the executor shared by all tool batches."""
+    return _default_executor
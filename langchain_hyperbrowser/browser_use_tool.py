@@ -1,14 +1,14 @@
 """Hyperbrowser browser use tool."""
 
-from typing import Optional, Dict, Any
-from langchain_core.tools import BaseTool
-from hyperbrowser import Hyperbrowser, AsyncHyperbrowser
+import re
+import threading
+import time
+from typing import Dict, Literal, Optional, Any
 from hyperbrowser.models import (
     StartBrowserUseTaskParams,
     BrowserUseLlm,
-    CreateSessionParams,
 )
-from pydantic import BaseModel, Field, SecretStr, model_validator
+from pydantic import BaseModel, Field, PrivateAttr
 
 from langchain_core.callbacks import (
     CallbackManagerForToolRun,
@@ -16,7 +16,48 @@ from langchain_core.callbacks import (
 
 from langchain_hyperbrowser.common import SimpleSessionParams
 
-from ._utilities import initialize_client
+from ._base import HyperbrowserBaseTool
+from .profiling import phase
+
+
+VisionMode = Literal["on", "off", "auto"]
+
+# Tasks mentioning these need screenshots; others run on the DOM alone.
+_VISUAL_HINTS = re.compile(
+    r"\b(?:screenshots?|images?|pictures?|photos?|charts?|graphs?|diagrams?|"
+    r"maps?|icons?|logos?|colou?rs?|visual(?:ly)?|looks?|layout|design|"
+    r"captchas?|canvas|video)\b",
+    re.IGNORECASE,
+)
+
+
+def needs_vision(task: str) -> bool:
+    """Whether a task description asks about what the page looks like."""
+    return _VISUAL_HINTS.search(task) is not None
+
+
+class BrowserUseBudget(BaseModel):
+    """Cost and latency limits applied to every browser-use task of a tool."""
+
+    name: str = Field(
+        default="default", description="Task class the usage is reported under"
+    )
+    vision: VisionMode = Field(
+        default="auto",
+        description=(
+            "'auto' sends screenshots only for tasks that mention visual content"
+        ),
+    )
+    max_steps: Optional[int] = Field(default=None, ge=1, description="Step cap")
+    max_input_tokens: Optional[int] = Field(
+        default=None, ge=1, description="Input token cap per step"
+    )
+    max_actions_per_step: Optional[int] = Field(default=None, ge=1)
+    max_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Wall-clock limit after which the task is stopped",
+    )
 
 
 class BrowserUseArgs(BaseModel):
@@ -26,7 +67,13 @@ class BrowserUseArgs(BaseModel):
     session_options: Optional[SimpleSessionParams] = Field(default=None)
 
 
-class HyperbrowserBrowserUseTool(BaseTool):
+def _cap(requested: Optional[int], limit: Optional[int]) -> Optional[int]:
+    if requested is None or limit is None:
+        return requested if limit is None else limit
+    return min(requested, limit)
+
+
+class HyperbrowserBrowserUseTool(HyperbrowserBaseTool):
     """Tool for executing tasks using a browser agent."""
 
     name: str = "hyperbrowser_browser_use"
@@ -36,94 +83,162 @@ class HyperbrowserBrowserUseTool(BaseTool):
     Provide a task description and optionally configure the agent's behavior.
     Returns the task result and metadata."""
     )
-    client: Hyperbrowser = Field(default=None)  # type: ignore
-    async_client: AsyncHyperbrowser = Field(default=None)  # type: ignore
-    api_key: SecretStr = Field(default=None)  # type: ignore
     args_schema: type[BrowserUseArgs] = BrowserUseArgs
+    budget: Optional[BrowserUseBudget] = Field(
+        default=None,
+        description=(
+            "Step, token, vision and wall-clock limits; results then include "
+            "a 'usage' report"
+        ),
+    )
+    _usage_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _usage: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
+
+    def _task_params(
+        self,
+        task: str,
+        max_steps: Optional[int],
+        max_input_tokens: Optional[int],
+        session_options: Optional[SimpleSessionParams],
+    ) -> StartBrowserUseTaskParams:
+        budget = self.budget
+        if budget is None:
+            return StartBrowserUseTaskParams(
+                task=task,
+                use_vision=True,
+                max_steps=max_steps,
+                max_input_tokens=max_input_tokens,
+                session_options=self._session_params(session_options),
+            )
+        if budget.vision == "auto":
+            use_vision = needs_vision(task)
+        else:
+            use_vision = budget.vision == "on"
+        return StartBrowserUseTaskParams(
+            task=task,
+            use_vision=use_vision,
+            use_vision_for_planner=use_vision,
+            max_steps=_cap(max_steps, budget.max_steps),
+            max_input_tokens=_cap(max_input_tokens, budget.max_input_tokens),
+            max_actions_per_step=budget.max_actions_per_step,
+            session_options=self._session_params(session_options),
+        )
 
-    @model_validator(mode="before")
-    @classmethod
-    def validate_environment(cls, values: Dict) -> Any:
-        """Validate the environment."""
-        values = initialize_client(values)
-        return values
+    def _result(
+        self, response: Any, params: StartBrowserUseTaskParams, seconds: float
+    ) -> Any:
+        result: Dict[str, Any] = {
+            "data": response.data.final_result if response.data is not None else None,
+            "error": response.error,
+        }
+        if self.budget is not None:
+            result["usage"] = self._record_usage(self.budget, response, params, seconds)
+        return self._format_result(result)
+
+    def _record_usage(
+        self,
+        budget: BrowserUseBudget,
+        response: Any,
+        params: StartBrowserUseTaskParams,
+        seconds: float,
+    ) -> Dict[str, Any]:
+        steps = response.data.steps if response.data is not None else []
+        input_tokens = sum(
+            step.metadata.input_tokens for step in steps if step.metadata is not None
+        )
+        usage = {
+            "steps": len(steps),
+            "input_tokens": input_tokens,
+            "seconds": round(seconds, 3),
+            "vision": bool(params.use_vision),
+            "stopped": response.status == "stopped",
+        }
+        with self._usage_lock:
+            totals = self._usage.setdefault(
+                budget.name,
+                {
+                    "runs": 0,
+                    "steps": 0,
+                    "input_tokens": 0,
+                    "seconds": 0.0,
+                    "stopped": 0,
+                },
+            )
+            totals["runs"] += 1
+            totals["steps"] += usage["steps"]
+            totals["input_tokens"] += input_tokens
+            totals["seconds"] += seconds
+            totals["stopped"] += int(usage["stopped"])
+        return usage
+
+    def usage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return run, step, token and time totals per budget task class."""
+        with self._usage_lock:
+            return {
+                name: {
+                    **totals,
+                    "steps_per_run": totals["steps"] / totals["runs"],
+                    "tokens_per_run": totals["input_tokens"] / totals["runs"],
+                }
+                for name, totals in self._usage.items()
+            }
 
     def _run(
         self,
         task: str,
+        max_input_tokens: Optional[int] = None,
         max_steps: Optional[int] = None,
         session_options: Optional[SimpleSessionParams] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> Dict[str, Any]:
+    ) -> Any:
         """Execute a task using a browser agent.
 
         Args:
             task: The task to execute (e.g. "go to Hacker News and summarize the top 5 posts")
-            use_vision: Optional flag to enable vision capabilities for the agent
             max_input_tokens: Optional limit on the number of input tokens
             max_steps: Optional maximum number of steps to execute
             session_options: Optional parameters for browser session configuration
 
         Returns:
-            Dict containing the task result and metadata with keys 'data' and 'error'
+            Dict containing the task result and metadata with keys 'data' and
+            'error', plus 'usage' when the tool has a budget
         """
 
         # Create browser use task parameters
-        task_params = StartBrowserUseTaskParams(
-            task=task,
-            use_vision=True,
-            max_steps=max_steps,
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options is not None
-                else None
-            ),
-        )
+        with phase("params"):
+            task_params = self._task_params(
+                task, max_steps, max_input_tokens, session_options
+            )
+        timeout = self.budget.max_seconds if self.budget is not None else None
 
         # Start and wait for browser use task
-        response = self.client.agents.browser_use.start_and_wait(task_params)
-        return {
-            "data": response.data.final_result if response.data is not None else None,
-            "error": response.error,
-        }
+        started = time.monotonic()
+        with self._job_slot():
+            agent = self._get_client().agents.browser_use
+            response = self._jobs.run(agent, task_params, timeout=timeout)
+        return self._result(response, task_params, time.monotonic() - started)
 
     async def _arun(
         self,
         task: str,
+        max_input_tokens: Optional[int] = None,
         max_steps: Optional[int] = None,
         session_options: Optional[SimpleSessionParams] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> Dict[str, Any]:
+    ) -> Any:
         """Async version of _run."""
         # Initialize async Hyperbrowser client
 
-        task_params = StartBrowserUseTaskParams(
-            task=task,
-            use_vision=True,
-            max_steps=max_steps,
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options is not None
-                else None
-            ),
-        )
+        with phase("params"):
+            task_params = self._task_params(
+                task, max_steps, max_input_tokens, session_options
+            )
+        timeout = self.budget.max_seconds if self.budget is not None else None
 
         # Start and wait for browser use task
-        response = await self.async_client.agents.browser_use.start_and_wait(
-            task_params
-        )
+        started = time.monotonic()
+        async with self._ajob_slot():
+            agent = self._get_async_client().agents.browser_use
+            response = await self._jobs.arun(agent, task_params, timeout=timeout)
 
-        return {
-            "data": response.data.final_result if response.data is not None else None,
-            "error": response.error,
-        }
+        return self._result(response, task_params, time.monotonic() - started)
@@ -1,16 +1,118 @@
-from typing import Optional, List
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from hyperbrowser.models import Country, CreateSessionParams, ScrapeFormat
 from pydantic import BaseModel, Field
-from hyperbrowser.models import Country, ScrapeFormat
 
 
 class SimpleSessionParams(BaseModel):
+    """Session options exposed to agents.
+
+    New session options are added here and in ``_SESSION_FIELDS``; every tool
+    picks them up through :func:`session_params`.
+    """
+
+    session_profile: Optional[str] = Field(
+        default=None,
+        description="Name of a registered session profile to start from",
+    )
     use_proxy: bool = Field(default=False, serialization_alias="useProxy")
     proxy_country: Optional[Country] = Field(
         default=None, serialization_alias="proxyCountry"
     )
     solve_captchas: bool = Field(default=False, serialization_alias="solveCaptchas")
     adblock: bool = Field(default=False, serialization_alias="adblock")
+    use_stealth: bool = Field(default=False, serialization_alias="useStealth")
+    accept_cookies: bool = Field(default=False, serialization_alias="acceptCookies")
 
 
 class SimpleScrapeOptions(BaseModel):
     formats: List[ScrapeFormat] = Field(default=["markdown"])
+
+
+# SimpleSessionParams fields that map one to one onto CreateSessionParams.
+_SESSION_FIELDS = (
+    "use_proxy",
+    "proxy_country",
+    "solve_captchas",
+    "adblock",
+    "use_stealth",
+    "accept_cookies",
+)
+
+_profiles_lock = threading.Lock()
+_profiles: Dict[str, CreateSessionParams] = {
+    "stealth": CreateSessionParams(
+        use_stealth=True, use_proxy=True, solve_captchas=True
+    ),
+    "fast": CreateSessionParams(adblock=True, trackers=True, annoyances=True),
+}
+
+
+def register_session_profile(
+    name: str,
+    params: Union[CreateSessionParams, Dict[str, Any], None] = None,
+    **options: Any,
+) -> CreateSessionParams:
+    """Register a named session profile, validated once, for all tools.
+
+    ``params`` may be ``CreateSessionParams`` or a dict of its fields;
+    keyword options are merged on top. Registering an existing name
+    replaces that profile.
+    """
+    if isinstance(params, CreateSessionParams):
+        params = params.model_dump(exclude_unset=True)
+    profile = CreateSessionParams(**{**(params or {}), **options})
+    with _profiles_lock:
+        _profiles[name] = profile
+    _build_session_params.cache_clear()
+    return profile
+
+
+def get_session_profile(name: str) -> CreateSessionParams:
+    """Return the session profile registered under ``name``."""
+    with _profiles_lock:
+        profile = _profiles.get(name)
+    if profile is None:
+        raise ValueError(f"unknown session profile: {name!r}")
+    return profile
+
+
+def session_profiles() -> List[str]:
+    """Return the names of the registered session profiles."""
+    with _profiles_lock:
+        return sorted(_profiles)
+
+
+@lru_cache(maxsize=256)
+def _build_session_params(
+    profile: Optional[str], overrides: Optional[Tuple[Tuple[str, Any], ...]]
+) -> Optional[CreateSessionParams]:
+    if profile is None and overrides is None:
+        return None
+    base = get_session_profile(profile) if profile is not None else None
+    if base is not None and not overrides:
+        return base
+    fields = base.model_dump(exclude_unset=True) if base is not None else {}
+    return CreateSessionParams(**{**fields, **dict(overrides or ())})
+
+
+def session_params(
+    options: Optional[SimpleSessionParams], default_profile: Optional[str] = None
+) -> Optional[CreateSessionParams]:
+    """Build ``CreateSessionParams`` from agent-facing session options.
+
+    Options start from their ``session_profile`` (or ``default_profile``),
+    and any fields set explicitly are applied on top. Results are cached, so
+    the same options return the same validated instance; treat it as
+    read-only.
+    """
+    if options is None:
+        return _build_session_params(default_profile, None)
+    overrides = tuple(
+        (name, getattr(options, name))
+        for name in _SESSION_FIELDS
+        if name in options.model_fields_set
+    )
+    return _build_session_params(options.session_profile or default_profile, overrides)
@@ -1,10 +1,23 @@
-from typing import Optional, Union, Dict, Any
-from langchain_core.tools import BaseTool
-from hyperbrowser import Hyperbrowser, AsyncHyperbrowser
-from hyperbrowser.models.crawl import StartCrawlJobParams
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+)
+from hyperbrowser.exceptions import HyperbrowserError
+from hyperbrowser.models.consts import POLLING_ATTEMPTS
+from hyperbrowser.models.crawl import (
+    CrawlJobResponse,
+    GetCrawlJobParams,
+    StartCrawlJobParams,
+)
 from hyperbrowser.models.scrape import ScrapeOptions
-from hyperbrowser.models.session import CreateSessionParams
-from pydantic import BaseModel, Field, SecretStr, model_validator
+from pydantic import BaseModel, Field, field_validator
 
 from langchain_core.callbacks import (
     CallbackManagerForToolRun,
@@ -12,7 +25,11 @@ from langchain_core.callbacks import (
 
 from langchain_hyperbrowser.common import SimpleSessionParams, SimpleScrapeOptions
 
-from ._utilities import initialize_client
+from ._base import HyperbrowserBatchTool
+from .artifacts import ArtifactStore, as_artifact_store, store_screenshot
+from .output import SCRAPE_FORMATS
+from .profiling import phase
+from .spill import ResultBudget, SpillBuffer
 
 
 class CrawlArgs(BaseModel):
@@ -26,24 +43,147 @@ class CrawlArgs(BaseModel):
     )
 
 
-class HyperbrowserCrawlTool(BaseTool):
+def _retry(call: Callable[[], Any]) -> Any:
+    for attempt in range(POLLING_ATTEMPTS):
+        try:
+            return call()
+        except Exception:
+            if attempt == POLLING_ATTEMPTS - 1:
+                raise
+            time.sleep(0.5)
+
+
+async def _aretry(call: Callable[[], Awaitable[Any]]) -> Any:
+    for attempt in range(POLLING_ATTEMPTS):
+        try:
+            return await call()
+        except Exception:
+            if attempt == POLLING_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(0.5)
+
+
+def iter_crawl_batches(
+    client: Any, params: StartCrawlJobParams, batch_size: int = 100
+) -> Iterator[CrawlJobResponse]:
+    """Run a crawl job and yield its results one page batch at a time.
+
+    Unlike ``client.crawl.start_and_wait``, only one batch of pages is held in
+    memory at a time.
+    """
+    job_id = client.crawl.start(params).job_id
+    if not job_id:
+        raise HyperbrowserError("Failed to start crawl job")
+    while _retry(lambda: client.crawl.get_status(job_id)).status not in (
+        "completed",
+        "failed",
+    ):
+        time.sleep(2)
+    page = 0
+    while True:
+        batch_params = GetCrawlJobParams(page=page + 1, batch_size=batch_size)
+        batch = _retry(lambda: client.crawl.get(job_id, batch_params))
+        yield batch
+        page = batch.current_page_batch
+        if page >= batch.total_page_batches:
+            return
+
+
+async def aiter_crawl_batches(
+    client: Any, params: StartCrawlJobParams, batch_size: int = 100
+) -> AsyncIterator[CrawlJobResponse]:
+    """Async variant of :func:`iter_crawl_batches`."""
+    job_id = (await client.crawl.start(params)).job_id
+    if not job_id:
+        raise HyperbrowserError("Failed to start crawl job")
+    while (await _aretry(lambda: client.crawl.get_status(job_id))).status not in (
+        "completed",
+        "failed",
+    ):
+        await asyncio.sleep(2)
+    page = 0
+    while True:
+        batch_params = GetCrawlJobParams(page=page + 1, batch_size=batch_size)
+        batch = await _aretry(lambda: client.crawl.get(job_id, batch_params))
+        yield batch
+        page = batch.current_page_batch
+        if page >= batch.total_page_batches:
+            return
+
+
+class HyperbrowserCrawlTool(HyperbrowserBatchTool):
     name: str = "hyperbrowser_crawl_data"
     description: str = (
         """Crawl a website starting from a given URL.
     Provide a URL and optionally configure crawling options like max pages and scraping settings.
     Returns the crawled content from all pages in markdown or HTML format along with metadata."""
     )
-    client: Hyperbrowser = Field(default=None)  # type: ignore
-    async_client: AsyncHyperbrowser = Field(default=None)  # type: ignore
-    api_key: SecretStr = Field(default=None)  # type: ignore
     args_schema: type[CrawlArgs] = CrawlArgs
+    result_budget: Optional[ResultBudget] = Field(
+        default=None,
+        description=(
+            "Byte and page limits on the returned crawl; larger results are "
+            "written to disk and returned as a reference with a summary"
+        ),
+    )
+    artifacts: Optional[ArtifactStore] = Field(
+        default=None,
+        description=(
+            "Store page screenshots in a local content-addressed directory and "
+            "return their artifact:// URI instead of the base64 data. Accepts "
+            "an ArtifactStore, a directory path or True"
+        ),
+    )
+
+    _build_artifacts = field_validator("artifacts", mode="before")(as_artifact_store)
+
+    def _store_artifacts(self, pages: Optional[Iterable[Any]]) -> None:
+        if self.artifacts is None:
+            return
+        with phase("artifacts"):
+            for page in pages or []:
+                store_screenshot(page, self.artifacts)
 
-    @model_validator(mode="before")
-    @classmethod
-    def validate_environment(cls, values: Dict) -> Any:
-        """Validate the environment."""
-        values = initialize_client(values)
-        return values
+    def _buffer_batch(self, buffer: SpillBuffer, pages: Any) -> None:
+        """Store a batch's screenshots and add its pages to ``buffer``."""
+        self._store_artifacts(pages)
+        for page in pages or []:
+            buffer.add(page)
+
+    def _budgeted_crawl(
+        self, crawl_params: StartCrawlJobParams, budget: ResultBudget
+    ) -> Any:
+        """Crawl batch by batch, spilling to disk once over the budget."""
+        buffer = SpillBuffer(budget, prefix="hyperbrowser-crawl-")
+        error = None
+        try:
+            for batch in iter_crawl_batches(
+                self._get_client(), crawl_params, budget.batch_size
+            ):
+                error = batch.error
+                self._buffer_batch(buffer, batch.data)
+        except BaseException:
+            buffer.discard()
+            raise
+        return {"data": buffer.result(), "error": error}
+
+    async def _abudgeted_crawl(
+        self, crawl_params: StartCrawlJobParams, budget: ResultBudget
+    ) -> Any:
+        """Asynchronously crawl batch by batch within the budget."""
+        buffer = SpillBuffer(budget, prefix="hyperbrowser-crawl-")
+        error = None
+        try:
+            async for batch in aiter_crawl_batches(
+                self._get_async_client(), crawl_params, budget.batch_size
+            ):
+                error = batch.error
+                # Serializing pages, and writing them once spilled, blocks.
+                await asyncio.to_thread(self._buffer_batch, buffer, batch.data)
+        except BaseException:
+            buffer.discard()
+            raise
+        return {"data": buffer.result(), "error": error}
 
     def _run(
         self,
@@ -66,30 +206,29 @@ class HyperbrowserCrawlTool(BaseTool):
             Dict containing the crawled content and metadata from all pages
         """
         # Create crawl job parameters
-        crawl_params = StartCrawlJobParams(
-            url=url,
-            max_pages=max_pages,
-            scrape_options=(
-                ScrapeOptions(formats=scrape_options.formats)
-                if scrape_options
-                else None
-            ),
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options is not None
-                else None
-            ),
-        )
+        with phase("params"):
+            crawl_params = StartCrawlJobParams(
+                url=url,
+                max_pages=max_pages,
+                scrape_options=(
+                    ScrapeOptions(formats=scrape_options.formats)
+                    if scrape_options
+                    else None
+                ),
+                session_options=self._session_params(session_options),
+            )
 
         # Start and wait for crawl job
-        response = self.client.crawl.start_and_wait(crawl_params)
+        with self._job_slot():
+            if self.result_budget is not None:
+                result = self._budgeted_crawl(crawl_params, self.result_budget)
+            else:
+                response = self._get_client().crawl.start_and_wait(crawl_params)
+                self._store_artifacts(response.data)
+                result = {"data": response.data, "error": response.error}
 
-        return {"data": response.data, "error": response.error}
+        formats = scrape_options.formats if scrape_options else ["markdown"]
+        return self._format_result(result, SCRAPE_FORMATS.difference(formats))
 
     async def _arun(
         self,
@@ -112,27 +251,31 @@ class HyperbrowserCrawlTool(BaseTool):
             Dict containing the crawled content and metadata from all pages
         """
         # Create crawl job parameters
-        crawl_params = StartCrawlJobParams(
-            url=url,
-            max_pages=max_pages,
-            scrape_options=(
-                ScrapeOptions(formats=scrape_options.formats)
-                if scrape_options
-                else None
-            ),
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options is not None
-                else None
-            ),
-        )
+        with phase("params"):
+            crawl_params = StartCrawlJobParams(
+                url=url,
+                max_pages=max_pages,
+                scrape_options=(
+                    ScrapeOptions(formats=scrape_options.formats)
+                    if scrape_options
+                    else None
+                ),
+                session_options=self._session_params(session_options),
+            )
 
         # Start and wait for crawl job
-        response = await self.async_client.crawl.start_and_wait(crawl_params)
+        async with self._ajob_slot():
+            if self.result_budget is not None:
+                result = await self._abudgeted_crawl(
+                    crawl_params, self.result_budget
+                )
+            else:
+                client = self._get_async_client()
+                response = await client.crawl.start_and_wait(crawl_params)
+                result = {"data": response.data, "error": response.error}
+        if self.result_budget is None:
+            # Decoding and writing screenshots blocks; keep it off the loop.
+            await asyncio.to_thread(self._store_artifacts, result["data"])
 
-        return {"data": response.data, "error": response.error}
+        formats = scrape_options.formats if scrape_options else ["markdown"]
+        return self._format_result(result, SCRAPE_FORMATS.difference(formats))
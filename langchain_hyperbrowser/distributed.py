@@ -0,0 +1,605 @@
+"""Distributed loading: workers lease URLs from a shared queue.
+
+URLs are put on a :class:`WorkQueue` once (see
+:meth:`HyperbrowserLoader.enqueue`), and any number of :class:`Worker`
+processes, on any number of machines, lease them in batches, scrape them and
+write the Documents to a :class:`DocumentSink`. A lease that is not
+completed within its visibility timeout, because a worker crashed or
+stalled, is handed to another worker.
+
+Each URL is completed exactly once: completion is only accepted from the
+worker holding the URL's current lease. Documents are written to the sink
+before the lease is completed, so after a crash a URL can be written again
+by the worker that retries it; sinks keyed by URL, like :class:`MemorySink`
+and :class:`SQLiteSink`, replace the earlier write.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from langchain_core.documents import Document
+
+if TYPE_CHECKING:
+    from langchain_hyperbrowser.hyperbrowser_loader import HyperbrowserLoader
+
+
+class Lease(NamedTuple):
+    url: str
+    token: str
+    attempts: int
+
+
+class WorkQueue:
+    """A queue of URLs leased by workers with a visibility timeout.
+
+    A leased URL is invisible to other workers until it is completed, failed
+    or its lease expires. Failed and expired URLs are retried until they
+    have been leased ``max_attempts`` times.
+    """
+
+    max_attempts: int = 3
+
+    def enqueue(self, urls: Iterable[str]) -> int:
+        """Add URLs that were never enqueued before; return how many were added."""
+        raise NotImplementedError
+
+    def lease(self, count: int, visibility_timeout: float) -> List[Lease]:
+        """Lease up to ``count`` URLs for ``visibility_timeout`` seconds."""
+        raise NotImplementedError
+
+    def extend(self, lease: Lease, visibility_timeout: float) -> bool:
+        """Push a held lease's expiry out; False if the lease was lost."""
+        raise NotImplementedError
+
+    def complete(self, lease: Lease) -> bool:
+        """Mark a leased URL done; False if the lease was lost or already used."""
+        raise NotImplementedError
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """Release a leased URL for a retry, or fail it after ``max_attempts``."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of pending, leased, done and failed URLs."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Work queue in a SQLite database.
+
+    ``":memory:"`` gives a queue for a single process, which is handy in
+    tests; a file path can be shared by worker processes on one machine.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            "url TEXT PRIMARY KEY, state TEXT NOT NULL DEFAULT 'pending', "
+            "token TEXT, expires REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "error TEXT)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS urls_state ON urls (state, expires)"
+        )
+
+    def _transaction(self, body: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = body()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def enqueue(self, urls: Iterable[str]) -> int:
+        def insert() -> int:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (url) VALUES (?)", ((u,) for u in urls)
+            )
+            return self._conn.total_changes - before
+
+        return self._transaction(insert)
+
+    def lease(self, count: int, visibility_timeout: float) -> List[Lease]:
+        now = self._clock()
+
+        def take() -> List[Lease]:
+            self._conn.execute(
+                "UPDATE urls SET state = 'failed', token = NULL, "
+                "error = 'lease expired' "
+                "WHERE state = 'leased' AND expires <= ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            rows = self._conn.execute(
+                "SELECT url, attempts FROM urls WHERE state = 'pending' "
+                "OR (state = 'leased' AND expires <= ?) LIMIT ?",
+                (now, count),
+            ).fetchall()
+            leases = []
+            for url, attempts in rows:
+                lease = Lease(url, uuid.uuid4().hex, attempts + 1)
+                self._conn.execute(
+                    "UPDATE urls SET state = 'leased', token = ?, expires = ?, "
+                    "attempts = ? WHERE url = ?",
+                    (lease.token, now + visibility_timeout, lease.attempts, url),
+                )
+                leases.append(lease)
+            return leases
+
+        return self._transaction(take)
+
+    def _update(self, sql: str, lease: Lease, *args: Any) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"{sql} WHERE url = ? AND state = 'leased' AND token = ?",
+                (*args, lease.url, lease.token),
+            )
+            return cursor.rowcount == 1
+
+    def extend(self, lease: Lease, visibility_timeout: float) -> bool:
+        expires = self._clock() + visibility_timeout
+        return self._update("UPDATE urls SET expires = ?", lease, expires)
+
+    def complete(self, lease: Lease) -> bool:
+        return self._update(
+            "UPDATE urls SET state = 'done', token = NULL, expires = NULL", lease
+        )
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        state = "failed" if lease.attempts >= self.max_attempts else "pending"
+        return self._update(
+            "UPDATE urls SET state = ?, token = NULL, expires = NULL, error = ?",
+            lease,
+            state,
+            error,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        counts = dict.fromkeys(("pending", "leased", "done", "failed"), 0)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM urls GROUP BY state"
+            ).fetchall()
+        counts.update(rows)
+        return counts
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# Redis scripts run atomically server-side and read the server's clock, so
+# workers on different machines agree on when a lease expires.
+_NOW = "local t = redis.call('TIME') local now = tonumber(t[1]) + tonumber(t[2]) / 1e6"
+
+_ENQUEUE = """
+local added = 0
+for _, url in ipairs(ARGV) do
+  if redis.call('SADD', KEYS[2], url) == 1 then
+    redis.call('RPUSH', KEYS[1], url)
+    added = added + 1
+  end
+end
+return added
+"""
+
+# KEYS: pending, leased, tokens, attempts, failed
+# ARGV: visibility timeout, max attempts, one token per URL to lease
+_LEASE = (
+    _NOW
+    + """
+for _, url in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+  redis.call('ZREM', KEYS[2], url)
+  redis.call('HDEL', KEYS[3], url)
+  if tonumber(redis.call('HGET', KEYS[4], url) or '0') >= tonumber(ARGV[2]) then
+    redis.call('HSET', KEYS[5], url, 'lease expired')
+  else
+    redis.call('LPUSH', KEYS[1], url)
+  end
+end
+local leased = {}
+for i = 3, #ARGV do
+  local url = redis.call('LPOP', KEYS[1])
+  if not url then break end
+  redis.call('ZADD', KEYS[2], now + tonumber(ARGV[1]), url)
+  redis.call('HSET', KEYS[3], url, ARGV[i])
+  local attempts = redis.call('HINCRBY', KEYS[4], url, 1)
+  table.insert(leased, url)
+  table.insert(leased, ARGV[i])
+  table.insert(leased, attempts)
+end
+return leased
+"""
+)
+
+# KEYS: leased, tokens; ARGV: url, token, visibility timeout
+_EXTEND = (
+    _NOW
+    + """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+return 1
+"""
+)
+
+# KEYS: leased, tokens, done; ARGV: url, token
+_COMPLETE = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('SADD', KEYS[3], ARGV[1])
+return 1
+"""
+
+# KEYS: leased, tokens, attempts, pending, failed
+# ARGV: url, token, max attempts, error
+_FAIL = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[1], ARGV[1])
+if tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0') >= tonumber(ARGV[3]) then
+  redis.call('HSET', KEYS[5], ARGV[1], ARGV[4])
+else
+  redis.call('RPUSH', KEYS[4], ARGV[1])
+end
+return 1
+"""
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RedisWorkQueue(WorkQueue):
+    """Work queue in Redis, or any server speaking its protocol and Lua.
+
+    ``client`` is a ``redis.Redis`` (or compatible) client. All keys share
+    the ``{name}`` hash tag, so the queue also works on Redis Cluster.
+    """
+
+    def __init__(self, client: Any, name: str = "hyperbrowser", max_attempts: int = 3):
+        self.client = client
+        self.max_attempts = max_attempts
+        prefix = f"{{{name}}}"
+        self._pending = f"{prefix}:pending"
+        self._seen = f"{prefix}:seen"
+        self._leased = f"{prefix}:leased"
+        self._tokens = f"{prefix}:tokens"
+        self._attempts = f"{prefix}:attempts"
+        self._done = f"{prefix}:done"
+        self._failed = f"{prefix}:failed"
+        self._enqueue = client.register_script(_ENQUEUE)
+        self._lease = client.register_script(_LEASE)
+        self._extend = client.register_script(_EXTEND)
+        self._complete = client.register_script(_COMPLETE)
+        self._fail = client.register_script(_FAIL)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisWorkQueue":
+        """Connect with ``redis.Redis.from_url``; needs the ``redis`` package."""
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "RedisWorkQueue.from_url requires the redis package: "
+                'pip install "langchain-hyperbrowser[redis]"'
+            ) from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def enqueue(self, urls: Iterable[str], chunk_size: int = 1000) -> int:
+        added = 0
+        chunk: List[str] = []
+        for url in urls:
+            chunk.append(url)
+            if len(chunk) == chunk_size:
+                added += int(self._enqueue([self._pending, self._seen], chunk))
+                chunk = []
+        if chunk:
+            added += int(self._enqueue([self._pending, self._seen], chunk))
+        return added
+
+    def lease(self, count: int, visibility_timeout: float) -> List[Lease]:
+        tokens = [uuid.uuid4().hex for _ in range(count)]
+        keys = [self._pending, self._leased, self._tokens, self._attempts]
+        reply = self._lease(
+            keys + [self._failed], [visibility_timeout, self.max_attempts, *tokens]
+        )
+        return [
+            Lease(_text(reply[i]), _text(reply[i + 1]), int(reply[i + 2]))
+            for i in range(0, len(reply), 3)
+        ]
+
+    def extend(self, lease: Lease, visibility_timeout: float) -> bool:
+        keys = [self._leased, self._tokens]
+        return bool(self._extend(keys, [lease.url, lease.token, visibility_timeout]))
+
+    def complete(self, lease: Lease) -> bool:
+        keys = [self._leased, self._tokens, self._done]
+        return bool(self._complete(keys, [lease.url, lease.token]))
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        keys = [self._leased, self._tokens, self._attempts, self._pending]
+        args = [lease.url, lease.token, self.max_attempts, error]
+        return bool(self._fail(keys + [self._failed], args))
+
+    def stats(self) -> Dict[str, int]:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.llen(self._pending)
+        pipe.zcard(self._leased)
+        pipe.scard(self._done)
+        pipe.hlen(self._failed)
+        pending, leased, done, failed = pipe.execute()
+        return {"pending": pending, "leased": leased, "done": done, "failed": failed}
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class DocumentSink:
+    """Destination for the Documents workers produce, written per URL.
+
+    A URL may be written more than once if its first worker crashed after
+    writing; sinks should replace earlier writes for the same URL.
+    """
+
+    def write(self, url: str, documents: List[Document]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySink(DocumentSink):
+    """Keep Documents in memory, keyed by URL."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._documents: Dict[str, List[Document]] = {}
+
+    def write(self, url: str, documents: List[Document]) -> None:
+        with self._lock:
+            self._documents[url] = list(documents)
+
+    def documents(self) -> List[Document]:
+        with self._lock:
+            return [doc for docs in self._documents.values() for doc in docs]
+
+
+class SQLiteSink(DocumentSink):
+    """Store Documents in a SQLite table, replacing earlier writes per URL."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "url TEXT NOT NULL, position INTEGER NOT NULL, page_content TEXT, "
+            "metadata TEXT, PRIMARY KEY (url, position))"
+        )
+
+    def write(self, url: str, documents: List[Document]) -> None:
+        rows = [
+            (url, i, doc.page_content, json.dumps(doc.metadata, default=str))
+            for i, doc in enumerate(documents)
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM documents WHERE url = ?", (url,))
+                self._conn.executemany(
+                    "INSERT INTO documents VALUES (?, ?, ?, ?)", rows
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def lazy_load(self) -> Iterator[Document]:
+        """Read back every stored Document."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page_content, metadata FROM documents ORDER BY url, position"
+            ).fetchall()
+        for page_content, metadata in rows:
+            yield Document(page_content=page_content, metadata=json.loads(metadata))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class Worker:
+    """Lease URLs from a queue, scrape them with a loader, write to a sink.
+
+    Each batch holds ``batch_size`` leases (the loader's ``max_concurrency``
+    by default) and scrapes them concurrently through the loader, so its
+    scheduler, limiter, fast path and key pool all apply. The worker
+    returns once the queue has nothing pending or leased, or after
+    ``max_urls`` URLs. While a URL is scraped its lease is extended every
+    ``heartbeat_interval`` seconds (a third of ``visibility_timeout`` by
+    default), so slow scrapes keep their lease and the timeout only bounds
+    how long a crashed worker's URLs stay invisible.
+    """
+
+    def __init__(
+        self,
+        loader: "HyperbrowserLoader",
+        queue: WorkQueue,
+        sink: DocumentSink,
+        batch_size: Optional[int] = None,
+        visibility_timeout: float = 600.0,
+        poll_interval: float = 5.0,
+        heartbeat_interval: Optional[float] = None,
+    ):
+        loader._prepare_params()
+        self.loader = loader
+        self.queue = queue
+        self.sink = sink
+        self.batch_size = batch_size or loader.max_concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or visibility_timeout / 3
+        self._lock = threading.Lock()
+        self._counts = {"completed": 0, "failed": 0, "lost": 0}
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def _finish(self, lease: Lease, documents: List[Document]) -> None:
+        self.sink.write(lease.url, documents)
+        self._count("completed" if self.queue.complete(lease) else "lost")
+
+    def _fail(self, lease: Lease, error: Exception) -> None:
+        self.queue.fail(lease, f"{type(error).__name__}: {error}")
+        self._count("failed")
+
+    def _extend(self, lease: Lease) -> bool:
+        try:
+            return self.queue.extend(lease, self.visibility_timeout)
+        except Exception:
+            # A missed heartbeat is retried; the lease outlives a few of them.
+            return True
+
+    @contextmanager
+    def _heartbeat(self, lease: Lease) -> Iterator[None]:
+        """Keep extending ``lease`` on a thread until the block exits."""
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.heartbeat_interval):
+                if not self._extend(lease):
+                    return
+
+        thread = threading.Thread(
+            target=beat, name="hyperbrowser-heartbeat", daemon=True
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    @asynccontextmanager
+    async def _aheartbeat(self, lease: Lease) -> AsyncIterator[None]:
+        """Keep extending ``lease`` from a task until the block exits."""
+
+        async def beat() -> None:
+            while True:
+                await asyncio.sleep(self.heartbeat_interval)
+                if not await asyncio.to_thread(self._extend, lease):
+                    return
+
+        task = asyncio.ensure_future(beat())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    def _process(self, lease: Lease) -> None:
+        try:
+            with self._heartbeat(lease):
+                documents = [self.loader._scrape_url(lease.url)]
+        except Exception as e:
+            self._fail(lease, e)
+            return
+        self._finish(lease, documents)
+
+    async def _aprocess(self, lease: Lease) -> None:
+        try:
+            async with self._aheartbeat(lease):
+                documents = [await self.loader._ascrape_url(lease.url)]
+        except Exception as e:
+            await asyncio.to_thread(self._fail, lease, e)
+            return
+        await asyncio.to_thread(self._finish, lease, documents)
+
+    def _drained(self) -> bool:
+        stats = self.queue.stats()
+        return stats["pending"] == 0 and stats["leased"] == 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the URLs this worker completed, failed and lost to expiry."""
+        with self._lock:
+            return dict(self._counts)
+
+    def run(self, max_urls: Optional[int] = None) -> Dict[str, int]:
+        """Process URLs until the queue is drained; return :meth:`stats`."""
+        processed = 0
+        with ThreadPoolExecutor(
+            max_workers=self.batch_size, thread_name_prefix="hyperbrowser-worker"
+        ) as pool:
+            while max_urls is None or processed < max_urls:
+                count = self.batch_size
+                if max_urls is not None:
+                    count = min(count, max_urls - processed)
+                leases = self.queue.lease(count, self.visibility_timeout)
+                if not leases:
+                    if self._drained():
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                list(pool.map(self._process, leases))
+                processed += len(leases)
+        self.loader._save_caches()
+        return self.stats()
+
+    async def arun(self, max_urls: Optional[int] = None) -> Dict[str, int]:
+        """Async version of :meth:`run`."""
+        processed = 0
+        while max_urls is None or processed < max_urls:
+            count = self.batch_size
+            if max_urls is not None:
+                count = min(count, max_urls - processed)
+            leases = await asyncio.to_thread(
+                self.queue.lease, count, self.visibility_timeout
+            )
+            if not leases:
+                if await asyncio.to_thread(self._drained):
+                    break
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await asyncio.gather(*(self._aprocess(lease) for lease in leases))
+            processed += len(leases)
+        await asyncio.to_thread(self.loader._save_caches)
+        return self.stats()
@@ -0,0 +1,171 @@
+"""Streaming export of scraped pages to JSON Lines or Parquet files.
+
+Pages are written as rows of ``url``, ``content`` and flattened metadata
+columns, without building LangChain Documents, so the files can be read
+directly by Spark, DuckDB, pandas and similar tools.
+"""
+
+import gzip
+import json
+import re
+from typing import IO, Any, Dict, List, Optional
+
+from .output import dumps
+
+_UNSAFE = re.compile(r"[^0-9a-zA-Z_]+")
+# Flattened metadata columns all start with "meta_", so this cannot collide.
+EXTRA_COLUMN = "extra_metadata"
+
+
+def flatten_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Flatten page metadata into ``meta_`` columns.
+
+    Nested dicts join their keys with ``_``, characters other than letters,
+    digits and underscores become ``_``, and lists and other non-scalar
+    values are JSON encoded.
+    """
+    columns: Dict[str, Any] = {}
+
+    def add(prefix: str, value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                add(f"{prefix}_{_UNSAFE.sub('_', str(key))}", item)
+        elif value is None or isinstance(value, (str, int, float, bool)):
+            columns[prefix] = value
+        else:
+            columns[prefix] = json.dumps(value, default=str, ensure_ascii=False)
+
+    add("meta", metadata or {})
+    return columns
+
+
+class PageSink:
+    """Destination for pages exported with :meth:`HyperbrowserLoader.export`."""
+
+    rows: int = 0
+
+    def write(self, url: str, content: str, metadata: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "PageSink":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+
+class JSONLinesSink(PageSink):
+    """Write one JSON object per page; paths ending in ``.gz`` are gzipped.
+
+    Encoded lines are buffered and written ``buffer_rows`` at a time.
+    """
+
+    def __init__(self, path: str, buffer_rows: int = 1000):
+        self.path = path
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+        self._buffer: List[str] = []
+        self._file: IO[str] = (
+            gzip.open(path, "wt", encoding="utf-8")
+            if path.endswith(".gz")
+            else open(path, "w", encoding="utf-8")
+        )
+
+    def write(self, url: str, content: str, metadata: Dict[str, Any]) -> None:
+        row = {"url": url, "content": content, **flatten_metadata(metadata)}
+        self._buffer.append(dumps(row))
+        self.rows += 1
+        if len(self._buffer) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class ParquetSink(PageSink):
+    """Write pages to a Parquet file, one row group per ``row_group_size`` pages.
+
+    Needs ``pyarrow``. All columns are strings, so the schema stays the same
+    across row groups. The metadata columns are ``metadata_columns`` (flattened
+    names such as ``meta_title``) or, by default, those seen in the first row
+    group; metadata outside them is kept as JSON in ``extra_metadata``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        row_group_size: int = 10_000,
+        compression: str = "zstd",
+        metadata_columns: Optional[List[str]] = None,
+    ):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "ParquetSink requires pyarrow: "
+                'pip install "langchain-hyperbrowser[parquet]"'
+            ) from e
+        self.path = path
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.metadata_columns = metadata_columns
+        self.rows = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def write(self, url: str, content: str, metadata: Dict[str, Any]) -> None:
+        self._buffer.append(
+            {"url": url, "content": content, **flatten_metadata(metadata)}
+        )
+        self.rows += 1
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def _columns(self) -> List[str]:
+        if self.metadata_columns is not None:
+            return list(self.metadata_columns)
+        seen: Dict[str, None] = {}
+        for row in self._buffer:
+            seen.update(dict.fromkeys(key for key in row if key.startswith("meta_")))
+        return list(seen)
+
+    def flush(self) -> None:
+        """Write the buffered pages as one row group."""
+        if not self._buffer:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            names = ["url", "content", *self._columns(), EXTRA_COLUMN]
+            self._schema = pa.schema([(name, pa.string()) for name in names])
+            self._writer = pq.ParquetWriter(
+                self.path, self._schema, compression=self.compression
+            )
+        known = set(self._schema.names)
+        data: Dict[str, List[Optional[str]]] = {n: [] for n in self._schema.names}
+        for row in self._buffer:
+            extra = {k: v for k, v in row.items() if k not in known}
+            row[EXTRA_COLUMN] = json.dumps(extra, default=str) if extra else None
+            for name, values in data.items():
+                value = row.get(name)
+                values.append(None if value is None else str(value))
+        self._writer.write_table(pa.table(data, schema=self._schema))
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -1,16 +1,17 @@
-from typing import Optional, Union, Dict, Any
-from langchain_core.tools import BaseTool
-from hyperbrowser import Hyperbrowser, AsyncHyperbrowser
+from typing import Optional, Union, Dict, Any, List, Mapping, Sequence
+import jsonref
 from hyperbrowser.models.extract import StartExtractJobParams
 from hyperbrowser.models.session import CreateSessionParams
-from pydantic import BaseModel, Field, SecretStr, model_validator
+from pydantic import BaseModel, Field, field_validator
 
 
 from langchain_core.callbacks import (
     CallbackManagerForToolRun,
 )
 
-from ._utilities import initialize_client
+from ._base import HyperbrowserBatchTool
+from .hedging import Hedger, as_hedger
+from .profiling import phase
 
 
 class ExtractArgs(BaseModel):
@@ -23,7 +24,56 @@ class ExtractArgs(BaseModel):
     )
 
 
-class HyperbrowserExtractTool(BaseTool):
+Schema = Union[object, Dict[str, Any]]
+
+
+def _json_schema(schema: Schema) -> Dict[str, Any]:
+    """JSON schema of a Pydantic model or a dict, with references inlined.
+
+    Inlining keeps ``$ref`` pointers such as ``#/$defs/A`` valid once the
+    schema is nested under another schema's properties.
+    """
+    if hasattr(schema, "model_json_schema"):
+        schema = schema.model_json_schema()
+    plain = dict(schema)  # type: ignore[call-overload]
+    return jsonref.replace_refs(plain, proxies=False, lazy_load=False)
+
+
+def _named_schemas(
+    schemas: Union[Mapping[str, Schema], Sequence[Schema]],
+) -> Dict[str, Schema]:
+    """Key schemas by name: a model's class name or a JSON schema's title."""
+    if isinstance(schemas, Mapping):
+        return dict(schemas)
+    named: Dict[str, Schema] = {}
+    for i, schema in enumerate(schemas):
+        name = getattr(schema, "__name__", None)
+        if name is None and isinstance(schema, dict):
+            name = schema.get("title")
+        name = name or f"schema_{i}"
+        if name in named:
+            raise ValueError(f"Duplicate schema name {name!r}; pass a dict instead")
+        named[name] = schema
+    return named
+
+
+def merge_schemas(schemas: Mapping[str, Schema]) -> Dict[str, Any]:
+    """Combine named schemas into one object schema with a property per name."""
+    return {
+        "type": "object",
+        "properties": {name: _json_schema(schema) for name, schema in schemas.items()},
+        "required": list(schemas),
+    }
+
+
+def split_extracted(data: Any, names: List[str]) -> Dict[str, Any]:
+    """Split the data extracted with :func:`merge_schemas` back out by name."""
+    if not isinstance(data, dict):
+        return dict.fromkeys(names)
+    return {name: data.get(name) for name in names}
+
+
+class HyperbrowserExtractTool(HyperbrowserBatchTool):
 
     name: str = "hyperbrowser_extract_data"
     description: str = (
@@ -34,17 +84,31 @@ class HyperbrowserExtractTool(BaseTool):
     Prefer the schema since that is more concrete.
     Returns the extracted data and metadata."""
     )
-    client: Hyperbrowser = Field(default=None)  # type: ignore
-    async_client: AsyncHyperbrowser = Field(default=None)  # type: ignore
-    api_key: SecretStr = Field(default=None)  # type: ignore
     args_schema: type[ExtractArgs] = ExtractArgs
+    hedging: Optional[Hedger] = Field(
+        default=None,
+        description=(
+            "Fire a duplicate extract job when one runs past the recent latency "
+            "percentile and keep the first result. Accepts HedgingPolicy, a "
+            "dict of it or True"
+        ),
+    )
+
+    _build_hedging = field_validator("hedging", mode="before")(as_hedger)
 
-    @model_validator(mode="before")
-    @classmethod
-    def validate_environment(cls, values: Dict) -> Any:
-        """Validate the environment."""
-        values = initialize_client(values)
-        return values
+    def close(self, timeout: Optional[float] = None, cancel: bool = False) -> bool:
+        drained = super().close(timeout, cancel)
+        if self.hedging is not None:
+            self.hedging.close()
+        return drained
+
+    async def aclose(
+        self, timeout: Optional[float] = None, cancel: bool = False
+    ) -> bool:
+        drained = await super().aclose(timeout, cancel)
+        if self.hedging is not None:
+            self.hedging.close()
+        return drained
 
     def _run(
         self,
@@ -68,16 +132,13 @@ class HyperbrowserExtractTool(BaseTool):
             Dict containing the extracted data and any error information
         """
         # Create extract job parameters
-        extract_params = StartExtractJobParams(
-            urls=[url],
-            schema=schema,
-            session_options=session_options,
-        )
+        with phase("params"):
+            extract_params = self._extract_params(url, schema, session_options)
 
         # Start and wait for extract job
-        response = self.client.extract.start_and_wait(extract_params)
+        response = self._start_and_wait(extract_params)
 
-        return {"data": response.data, "error": response.error}
+        return self._format_result({"data": response.data, "error": response.error})
 
     async def _arun(
         self,
@@ -101,13 +162,85 @@ class HyperbrowserExtractTool(BaseTool):
             Dict containing the extracted data and any error information
         """
         # Create extract job parameters
-        extract_params = StartExtractJobParams(
+        with phase("params"):
+            extract_params = self._extract_params(url, schema, session_options)
+
+        # Start and wait for extract job
+        response = await self._astart_and_wait(extract_params)
+
+        return self._format_result({"data": response.data, "error": response.error})
+
+    def extract_many(
+        self,
+        url: str,
+        schemas: Union[Mapping[str, Schema], Sequence[Schema]],
+        session_options: Optional[CreateSessionParams] = None,
+    ) -> Any:
+        """Extract data for several schemas from a single render of a page.
+
+        The schemas are merged into one extract job, so the page is fetched
+        once, and the result is split back out per schema.
+
+        Args:
+            url: The URL to extract data from
+            schemas: Pydantic models or JSON schemas keyed by name. A list is
+                keyed by model class name or JSON schema title.
+            session_options: Optional parameters for the browser session
+
+        Returns:
+            Dict with the extracted data keyed by schema name, and any error
+        """
+        named = _named_schemas(schemas)
+        with phase("params"):
+            extract_params = self._extract_params(
+                url, merge_schemas(named), session_options
+            )
+        response = self._start_and_wait(extract_params)
+        data = split_extracted(response.data, list(named))
+        return self._format_result({"data": data, "error": response.error})
+
+    async def aextract_many(
+        self,
+        url: str,
+        schemas: Union[Mapping[str, Schema], Sequence[Schema]],
+        session_options: Optional[CreateSessionParams] = None,
+    ) -> Any:
+        """Asynchronously extract data for several schemas from one render."""
+        named = _named_schemas(schemas)
+        with phase("params"):
+            extract_params = self._extract_params(
+                url, merge_schemas(named), session_options
+            )
+        response = await self._astart_and_wait(extract_params)
+        data = split_extracted(response.data, list(named))
+        return self._format_result({"data": data, "error": response.error})
+
+    def _extract_params(
+        self,
+        url: str,
+        schema: Schema,
+        session_options: Optional[CreateSessionParams],
+    ) -> StartExtractJobParams:
+        return StartExtractJobParams(
             urls=[url],
             schema=schema,
-            session_options=session_options,
+            session_options=(
+                session_options
+                if session_options is not None
+                else self._session_params(None)
+            ),
         )
 
-        # Start and wait for extract job
-        response = await self.async_client.extract.start_and_wait(extract_params)
-
-        return {"data": response.data, "error": response.error}
+    def _start_and_wait(self, extract_params: StartExtractJobParams) -> Any:
+        with self._job_slot():
+            manager = self._get_client().extract
+            if self.hedging is not None:
+                return self.hedging.run(manager, extract_params)
+            return manager.start_and_wait(extract_params)
+
+    async def _astart_and_wait(self, extract_params: StartExtractJobParams) -> Any:
+        async with self._ajob_slot():
+            manager = self._get_async_client().extract
+            if self.hedging is not None:
+                return await self.hedging.arun(manager, extract_params)
+            return await manager.start_and_wait(extract_params)
@@ -0,0 +1,408 @@
+"""Local HTTP fast path for static pages, falling back to a browser scrape."""
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Literal, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from .markdown import MarkdownConverter
+from .politeness import host_key
+
+if TYPE_CHECKING:
+    import httpx
+    from hyperbrowser.models.scrape import ScrapeJobData
+
+FastPathMode = Literal["auto", "local", "browser"]
+
+# Formats the fast path can produce; anything else needs the browser.
+LOCAL_FORMATS = frozenset({"markdown", "html"})
+
+_BLOCKED_STATUSES = frozenset({401, 403, 407, 429, 503})
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+_CHALLENGE_MARKERS = (
+    "cf-browser-verification",
+    "challenge-platform",
+    "cf_chl_",
+    "<title>just a moment...</title>",
+    "_incapsula_resource",
+    "px-captcha",
+    "ddos protection by",
+)
+_JS_MARKERS = (
+    "enable javascript",
+    "requires javascript",
+    "javascript is required",
+    "javascript to run this app",
+    "turn on javascript",
+)
+_EMPTY_APP_ROOT = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt|svelte)[\"'][^>]*>\s*</div>",
+    re.IGNORECASE,
+)
+
+
+class FastPathOptions(BaseModel):
+    """When to fetch pages locally instead of starting a Hyperbrowser job."""
+
+    default_mode: FastPathMode = Field(
+        default="auto",
+        description=(
+            "'auto' fetches locally and falls back to the browser when the page "
+            "looks JS-rendered or blocked; 'local' falls back only when the "
+            "fetch fails or is blocked; 'browser' always uses Hyperbrowser"
+        ),
+    )
+    domains: Dict[str, FastPathMode] = Field(
+        default_factory=dict,
+        description=(
+            "Per-domain modes, keyed by host or by '.example.com' to include "
+            "subdomains"
+        ),
+    )
+    min_text_chars: int = Field(
+        default=200,
+        ge=0,
+        description="Pages with less Markdown than this are treated as JS-rendered",
+    )
+    timeout: float = Field(default=10.0, gt=0, description="Local fetch timeout")
+    max_bytes: int = Field(
+        default=5_000_000, ge=1, description="Larger pages go to the browser"
+    )
+    learn: bool = Field(
+        default=True,
+        description="Send 'auto' domains that keep falling back to the browser",
+    )
+    learn_min_samples: int = Field(
+        default=3, ge=1, description="Fetches per domain before a decision is made"
+    )
+    learn_fallback_ratio: float = Field(
+        default=0.5,
+        gt=0,
+        le=1,
+        description="Fallback share at which a domain is sent to the browser",
+    )
+    learn_ttl: float = Field(
+        default=86400.0, gt=0, description="Seconds before a learned decision expires"
+    )
+    cache_path: Optional[str] = Field(
+        default=None, description="JSON file persisting learned domain decisions"
+    )
+    save_interval: float = Field(
+        default=5.0, ge=0, description="Minimum seconds between writes of cache_path"
+    )
+    user_agent: str = Field(
+        default="Mozilla/5.0 (compatible; langchain-hyperbrowser)",
+        description="User-Agent sent with local fetches",
+    )
+
+
+def fallback_reason(
+    status: int,
+    content_type: Optional[str],
+    html: str,
+    markdown: str,
+    mode: FastPathMode,
+    min_text_chars: int,
+) -> Optional[str]:
+    """Return why a locally fetched page needs the browser, or None if it is fine."""
+    if status in _BLOCKED_STATUSES:
+        return "blocked"
+    if status >= 400:
+        return "http-error"
+    if content_type is not None and not content_type.startswith(_HTML_TYPES):
+        return "non-html"
+    lowered = html.lower()
+    if any(marker in lowered for marker in _CHALLENGE_MARKERS):
+        return "blocked"
+    if mode == "auto" and len(markdown) < min_text_chars:
+        if _EMPTY_APP_ROOT.search(html) or any(m in lowered for m in _JS_MARKERS):
+            return "javascript"
+        return "thin-content"
+    return None
+
+
+def _set_options(options: Any) -> Dict[str, Any]:
+    if options is None:
+        return {}
+    if isinstance(options, BaseModel):
+        return options.model_dump(exclude_defaults=True)
+    return {key: value for key, value in dict(options).items() if value is not None}
+
+
+def needs_browser(scrape_options: Any = None, session_options: Any = None) -> bool:
+    """Whether a call's options ask for more than a plain HTTP fetch can give.
+
+    Session options such as a proxy country or stealth change how the page is
+    loaded, and so do scrape options other than ``formats``; calls setting
+    either go straight to Hyperbrowser.
+    """
+    scrape = _set_options(scrape_options)
+    scrape.pop("formats", None)
+    return bool(scrape or _set_options(session_options))
+
+
+class _DomainStats:
+    __slots__ = ("local", "fallback", "updated")
+
+    def __init__(self, local: int = 0, fallback: int = 0, updated: float = 0.0):
+        self.local = local
+        self.fallback = fallback
+        self.updated = updated
+
+
+class FastPathFetcher:
+    """Fetch pages over plain HTTP and convert them to Markdown locally.
+
+    :meth:`fetch` returns ``ScrapeJobData`` for pages that can be served
+    locally and ``None`` when the caller should start a Hyperbrowser scrape
+    instead: when the domain's mode is "browser", a requested format cannot
+    be produced locally, the fetch fails, or the page looks blocked or
+    JS-rendered. Outcomes are counted per domain, and "auto" domains that
+    mostly fall back are sent straight to the browser until the learned
+    decision expires.
+
+    Learned decisions are written to ``cache_path`` at most every
+    ``save_interval`` seconds, and when the fetcher is closed.
+    """
+
+    def __init__(
+        self, options: Optional[FastPathOptions] = None, transport: Optional[Any] = None
+    ):
+        self.options = options or FastPathOptions()
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._stats: Dict[str, _DomainStats] = {}
+        self._dirty = False
+        self._saved_at = float("-inf")
+        self._client: Optional["httpx.Client"] = None
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        if self.options.cache_path and os.path.exists(self.options.cache_path):
+            with open(self.options.cache_path, encoding="utf-8") as f:
+                for host, stats in json.load(f).items():
+                    self._stats[host] = _DomainStats(**stats)
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "timeout": self.options.timeout,
+            "follow_redirects": True,
+            "headers": {"User-Agent": self.options.user_agent},
+        }
+        if self.transport is not None:
+            kwargs["transport"] = self.transport
+        return kwargs
+
+    def _get_client(self) -> "httpx.Client":
+        with self._lock:
+            if self._client is None:
+                import httpx
+
+                self._client = httpx.Client(**self._client_kwargs())
+            return self._client
+
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import httpx
+
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    **self._client_kwargs()
+                )
+            return client
+
+    def close(self) -> None:
+        """Save learned decisions and close the pooled synchronous HTTP client."""
+        self.save()
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Save learned decisions and close the running loop's async client."""
+        await asyncio.to_thread(self.save)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def configured_mode(self, url: str) -> FastPathMode:
+        """Return the mode configured for the URL's domain."""
+        host = host_key(url).split(":", 1)[0]
+        domains = self.options.domains
+        if host in domains:
+            return domains[host]
+        for pattern, mode in domains.items():
+            if pattern.startswith(".") and (
+                host.endswith(pattern) or host == pattern[1:]
+            ):
+                return mode
+        return self.options.default_mode
+
+    def mode(self, url: str) -> FastPathMode:
+        """Return the effective mode for ``url``, including learned decisions."""
+        mode = self.configured_mode(url)
+        if mode != "auto" or not self.options.learn:
+            return mode
+        with self._lock:
+            stats = self._stats.get(host_key(url))
+            if stats is None:
+                return mode
+            if time.time() - stats.updated > self.options.learn_ttl:
+                del self._stats[host_key(url)]
+                return mode
+            total = stats.local + stats.fallback
+            if (
+                total >= self.options.learn_min_samples
+                and stats.fallback / total >= self.options.learn_fallback_ratio
+            ):
+                return "browser"
+        return mode
+
+    def would_try(self, url: str, formats: Sequence[str] = ("markdown",)) -> bool:
+        """Whether :meth:`fetch` would attempt ``url`` locally."""
+        return set(formats) <= LOCAL_FORMATS and self.mode(url) != "browser"
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return local and fallback counts per domain with the learned mode."""
+        with self._lock:
+            hosts = {host: (s.local, s.fallback) for host, s in self._stats.items()}
+        return {
+            host: {
+                "local": local,
+                "fallback": fallback,
+                "mode": self.mode(f"http://{host}/"),
+            }
+            for host, (local, fallback) in hosts.items()
+        }
+
+    def _record(self, url: str, fell_back: bool) -> bool:
+        """Count an outcome; return whether ``cache_path`` is due a write."""
+        with self._lock:
+            stats = self._stats.setdefault(host_key(url), _DomainStats())
+            if fell_back:
+                stats.fallback += 1
+            else:
+                stats.local += 1
+            stats.updated = time.time()
+            self._dirty = True
+            elapsed = time.monotonic() - self._saved_at
+        return bool(self.options.cache_path) and elapsed >= self.options.save_interval
+
+    def save(self) -> None:
+        """Write learned decisions to ``cache_path`` if they changed."""
+        if not self.options.cache_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                self._saved_at = time.monotonic()
+                data = {
+                    host: {
+                        "local": s.local,
+                        "fallback": s.fallback,
+                        "updated": s.updated,
+                    }
+                    for host, s in self._stats.items()
+                }
+            tmp_path = f"{self.options.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.options.cache_path)
+
+    def _convert(
+        self,
+        url: str,
+        response: "httpx.Response",
+        body: bytes,
+        formats: Sequence[str],
+        mode: FastPathMode,
+    ) -> Tuple[Optional["ScrapeJobData"], Optional[str]]:
+        from hyperbrowser.models.scrape import ScrapeJobData
+
+        html = body.decode(response.encoding or "utf-8", errors="replace")
+        converter = MarkdownConverter()
+        converter.feed(html)
+        converter.close()
+        markdown = converter.markdown()
+        content_type = response.headers.get("content-type")
+        reason = fallback_reason(
+            response.status_code,
+            content_type.split(";", 1)[0].strip().lower() if content_type else None,
+            html,
+            markdown,
+            mode,
+            self.options.min_text_chars,
+        )
+        if reason is not None:
+            return None, reason
+        metadata: Dict[str, Any] = {
+            "sourceURL": url,
+            "url": str(response.url),
+            "fetchedVia": "local",
+        }
+        if converter.title:
+            metadata["title"] = converter.title
+        if converter.description:
+            metadata["description"] = converter.description
+        data = ScrapeJobData(
+            metadata=metadata,
+            markdown=markdown if "markdown" in formats else None,
+            html=html if "html" in formats else None,
+        )
+        return data, None
+
+    def fetch(
+        self, url: str, formats: Sequence[str] = ("markdown",)
+    ) -> Optional["ScrapeJobData"]:
+        """Fetch ``url`` locally, or return None if it needs the browser."""
+        if not self.would_try(url, formats):
+            return None
+        mode = self.mode(url)
+        try:
+            with self._get_client().stream("GET", url) as response:
+                body = bytearray()
+                for chunk in response.iter_bytes():
+                    body += chunk
+                    if len(body) > self.options.max_bytes:
+                        raise ValueError("page too large")
+                data, reason = self._convert(url, response, bytes(body), formats, mode)
+        except Exception:
+            data, reason = None, "fetch-error"
+        if self._record(url, fell_back=reason is not None):
+            self.save()
+        return data
+
+    async def afetch(
+        self, url: str, formats: Sequence[str] = ("markdown",)
+    ) -> Optional["ScrapeJobData"]:
+        """Asynchronously fetch ``url`` locally, or return None."""
+        if not self.would_try(url, formats):
+            return None
+        mode = self.mode(url)
+        try:
+            async with self._get_async_client().stream("GET", url) as response:
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > self.options.max_bytes:
+                        raise ValueError("page too large")
+            data, reason = await asyncio.to_thread(
+                self._convert, url, response, bytes(body), formats, mode
+            )
+        except Exception:
+            data, reason = None, "fetch-error"
+        if self._record(url, fell_back=reason is not None):
+            await asyncio.to_thread(self.save)
+        return data
@@ -0,0 +1,280 @@
+"""Hedged remote jobs: fire a duplicate when a job runs unusually long."""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# Job statuses after which the result can be fetched.
+_FINISHED = ("completed", "failed")
+
+
+class HedgingPolicy(BaseModel):
+    """When to fire a duplicate job and how many duplicates are allowed."""
+
+    percentile: float = Field(
+        default=0.95,
+        gt=0,
+        lt=1,
+        description="Latency percentile after which a duplicate job is fired",
+    )
+    min_samples: int = Field(
+        default=20, ge=1, description="Latencies observed before the percentile is used"
+    )
+    initial_delay: float = Field(
+        default=30.0, gt=0, description="Hedge delay until min_samples are observed"
+    )
+    min_delay: float = Field(
+        default=2.0, ge=0, description="Lower bound on the hedge delay"
+    )
+    window: int = Field(
+        default=500, ge=1, description="Recent latencies the percentile is taken over"
+    )
+    budget_ratio: float = Field(
+        default=0.05,
+        ge=0,
+        le=1,
+        description=(
+            "Duplicate jobs allowed per job started; 0.05 caps the extra job "
+            "volume at 5%"
+        ),
+    )
+    max_burst: float = Field(
+        default=5.0, ge=1, description="Unused hedges that can accumulate"
+    )
+    poll_interval: float = Field(
+        default=1.0, gt=0, description="Seconds between job status polls"
+    )
+
+
+def _stop(manager: Any, job_id: str) -> None:
+    # Only agent tasks can be stopped; other jobs are simply no longer polled.
+    stop = getattr(manager, "stop", None)
+    if stop is not None:
+        try:
+            stop(job_id)
+        except Exception:
+            pass
+
+
+def _poll(
+    manager: Any, params: Any, cancelled: threading.Event, interval: float
+) -> Any:
+    """Start a job and poll it until it finishes or ``cancelled`` is set."""
+    from hyperbrowser.exceptions import HyperbrowserError
+    from hyperbrowser.models.consts import POLLING_ATTEMPTS
+
+    job_id = manager.start(params).job_id
+    if not job_id:
+        raise HyperbrowserError("Failed to start job")
+    failures = 0
+    while not cancelled.is_set():
+        try:
+            if manager.get_status(job_id).status in _FINISHED:
+                return manager.get(job_id)
+            failures = 0
+        except Exception as e:
+            failures += 1
+            if failures >= POLLING_ATTEMPTS:
+                raise HyperbrowserError(
+                    f"Failed to poll job {job_id} after {POLLING_ATTEMPTS} "
+                    f"attempts: {e}",
+                    original_error=e,
+                )
+        cancelled.wait(interval)
+    _stop(manager, job_id)
+    return None
+
+
+async def _apoll(manager: Any, params: Any, interval: float) -> Any:
+    """Async version of :func:`_poll`, stopped by cancelling the task."""
+    from hyperbrowser.exceptions import HyperbrowserError
+    from hyperbrowser.models.consts import POLLING_ATTEMPTS
+
+    job_id = (await manager.start(params)).job_id
+    if not job_id:
+        raise HyperbrowserError("Failed to start job")
+    failures = 0
+    try:
+        while True:
+            try:
+                if (await manager.get_status(job_id)).status in _FINISHED:
+                    return await manager.get(job_id)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                if failures >= POLLING_ATTEMPTS:
+                    raise HyperbrowserError(
+                        f"Failed to poll job {job_id} after {POLLING_ATTEMPTS} "
+                        f"attempts: {e}",
+                        original_error=e,
+                    )
+            await asyncio.sleep(interval)
+    except asyncio.CancelledError:
+        stop = getattr(manager, "stop", None)
+        if stop is not None:
+            try:
+                await stop(job_id)
+            except Exception:
+                pass
+        raise
+
+
+class Hedger:
+    """Run jobs with a hedge: a duplicate fired once the job is slow.
+
+    If a job has not finished after the ``percentile`` latency of recent jobs,
+    an identical job is started and whichever finishes first wins; the other
+    is no longer polled (agent tasks are also stopped; scrape and extract
+    jobs have no stop endpoint and finish server-side). Hedges are drawn from
+    a token bucket refilled by ``budget_ratio`` per job, so hedging adds at
+    most that share of extra jobs on top of a small burst.
+    """
+
+    def __init__(self, policy: Optional[HedgingPolicy] = None, max_workers: int = 32):
+        self.policy = policy or HedgingPolicy()
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=self.policy.window)
+        self._tokens = 0.0
+        self._jobs = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def delay(self) -> float:
+        """Seconds a job may run before it is hedged."""
+        with self._lock:
+            if len(self._latencies) < self.policy.min_samples:
+                return self.policy.initial_delay
+            ordered = sorted(self._latencies)
+        index = min(int(self.policy.percentile * len(ordered)), len(ordered) - 1)
+        return max(ordered[index], self.policy.min_delay)
+
+    def _start(self) -> None:
+        with self._lock:
+            self._jobs += 1
+            self._tokens = min(
+                self.policy.max_burst, self._tokens + self.policy.budget_ratio
+            )
+
+    def _try_hedge(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._hedges += 1
+            return True
+
+    def _finish(self, latency: float, hedge_won: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._hedge_wins += int(hedge_won)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="hyperbrowser-hedge",
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker threads used by :meth:`run`."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job and hedge counts with the current hedge delay."""
+        delay = self.delay()
+        with self._lock:
+            return {
+                "jobs": self._jobs,
+                "hedges": self._hedges,
+                "hedge_wins": self._hedge_wins,
+                "hedge_ratio": self._hedges / self._jobs if self._jobs else 0.0,
+                "delay": delay,
+            }
+
+    def run(self, manager: Any, params: Any) -> Any:
+        """Run a job through an SDK job manager, hedging it if it is slow."""
+        pool = self._executor()
+        cancelled = threading.Event()
+        interval = self.policy.poll_interval
+        started = time.monotonic()
+
+        def submit() -> Future:
+            # Each job runs in a copy of the caller's context, so the
+            # profiler's phases are recorded from the worker threads too.
+            context = contextvars.copy_context()
+            return pool.submit(context.run, _poll, manager, params, cancelled, interval)
+
+        self._start()
+        futures: List[Future] = [submit()]
+        try:
+            done, _ = wait(futures, timeout=self.delay())
+            if not done and self._try_hedge():
+                futures.append(submit())
+            pending = set(futures)
+            errors: List[BaseException] = []
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    error = future.exception()
+                    if error is None:
+                        self._finish(
+                            time.monotonic() - started, future is not futures[0]
+                        )
+                        return future.result()
+                    errors.append(error)
+            raise errors[0]
+        finally:
+            cancelled.set()
+
+    async def arun(self, manager: Any, params: Any) -> Any:
+        """Async version of :meth:`run`; the losing job's task is cancelled."""
+        interval = self.policy.poll_interval
+        started = time.monotonic()
+        self._start()
+        tasks = [asyncio.ensure_future(_apoll(manager, params, interval))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.delay())
+            if not done and self._try_hedge():
+                tasks.append(asyncio.ensure_future(_apoll(manager, params, interval)))
+            pending = set(tasks)
+            errors: List[BaseException] = []
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        self._finish(time.monotonic() - started, task is not tasks[0])
+                        return task.result()
+                    errors.append(error)
+            raise errors[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def as_hedger(value: Any) -> Any:
+    """Build a :class:`Hedger` from a tool's ``hedging`` option."""
+    if value is True:
+        return Hedger()
+    if value is False:
+        return None
+    if isinstance(value, dict):
+        value = HedgingPolicy(**value)
+    if isinstance(value, HedgingPolicy):
+        return Hedger(value)
+    return value
@@ -1,18 +1,64 @@
 """Hyperbrowser document loader."""
 
-from typing import AsyncIterator, Iterator, Literal, Optional, Sequence, Union
+import asyncio
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, nullcontext
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from langchain_core.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 from langchain_core.utils import get_from_env
-from hyperbrowser import Hyperbrowser, AsyncHyperbrowser
-from hyperbrowser.models.scrape import (
-    StartScrapeJobParams,
-    ScrapeOptions,
-    ScrapeJobData,
+
+from langchain_hyperbrowser._utilities import ClientRefs
+from langchain_hyperbrowser.adaptive import AdaptiveLimiter
+from langchain_hyperbrowser.artifacts import (
+    ArtifactStore,
+    as_artifact_store,
+    store_screenshot,
 )
-from hyperbrowser.models.crawl import StartCrawlJobParams
-from hyperbrowser.models.session import CreateSessionParams
+from langchain_hyperbrowser.job_scheduler import JobScheduler, get_default_scheduler
+from langchain_hyperbrowser.keypool import KeyPool, as_key_pool
+from langchain_hyperbrowser.lifecycle import JobTracker
+from langchain_hyperbrowser.profiling import Profiler, instrument_client, phase
+
+if TYPE_CHECKING:
+    # The SDK pulls in its whole client and model tree, so it is only imported
+    # once a load actually runs. The opt-in helpers are likewise imported by
+    # the code paths that use them.
+    from hyperbrowser import AsyncHyperbrowser, Hyperbrowser
+    from hyperbrowser.models.scrape import ScrapeJobData
+
+    from langchain_hyperbrowser.distributed import WorkQueue
+    from langchain_hyperbrowser.export import PageSink
+    from langchain_hyperbrowser.fastpath import FastPathOptions
+    from langchain_hyperbrowser.focused import FocusedCrawler, FocusedCrawlOptions
+    from langchain_hyperbrowser.politeness import DomainScheduler, PolitenessPolicy
+    from langchain_hyperbrowser.prefilter import PrefilterOptions
+    from langchain_hyperbrowser.sitemap import SitemapOptions
+
+
+async def _aiterate(urls: Iterable[str]) -> AsyncIterator[str]:
+    """Iterate URLs, reading lazy sources such as sitemaps in a thread."""
+    if isinstance(urls, Sequence):
+        for url in urls:
+            yield url
+        return
+    iterator = iter(urls)
+    while (url := await asyncio.to_thread(next, iterator, None)) is not None:
+        yield url
 
 
 class HyperbrowserLoader(BaseLoader):
@@ -81,24 +127,95 @@ class HyperbrowserLoader(BaseLoader):
             domain in literature without prior coordination or asking for permission.
 
             [More information...](https://www.iana.org/domains/example)' metadata={'title': 'Example Domain', 'viewport': 'width=device-width, initial-scale=1', 'sourceURL': 'https://example.com'}
+
+    Shutdown:
+        .. code-block:: python
+
+            async with HyperbrowserLoader(urls=urls) as loader:
+                docs = await loader.aload()
+            # running jobs are drained and connection pools closed here
     """  # noqa: E501
 
     def __init__(
         self,
         urls: Union[str, Sequence[str]],
         api_key: Optional[str] = None,
-        operation: Literal["scrape", "crawl"] = "scrape",
+        operation: Literal["scrape", "crawl", "sitemap", "focused_crawl"] = "scrape",
         params: Optional[dict] = None,
+        max_concurrency: int = 1,
+        politeness: Optional[Union["PolitenessPolicy", dict]] = None,
+        priority: str = "batch",
+        scheduler: Optional[JobScheduler] = None,
+        sitemap_options: Optional[Union["SitemapOptions", dict]] = None,
+        limiter: Optional[Union[AdaptiveLimiter, bool]] = None,
+        prefilter: Optional[Union["PrefilterOptions", dict, bool]] = None,
+        fast_path: Optional[Union["FastPathOptions", dict, bool]] = None,
+        local_markdown: Optional[Union[dict, bool]] = None,
+        profiler: Optional[Profiler] = None,
+        key_pool: Optional[Union[KeyPool, Sequence[str], dict]] = None,
+        crawl_options: Optional[Union["FocusedCrawlOptions", dict]] = None,
+        relevance: Optional[Callable[[Document], float]] = None,
+        artifacts: Optional[Union[ArtifactStore, str]] = None,
     ):
         """Initialize with API Key, operation, urls to scrape, and optional params.
         For full documentation, visit https://docs.hyperbrowser.ai
 
         Args:
-            urls: URL(s) to scrape or crawl.
+            urls: URL(s) to scrape or crawl. For "sitemap", sitemap URLs or site
+                roots whose sitemaps are discovered through robots.txt.
             api_key: Hyperbrowser API key.
-            operation: Operation to perform, either "scrape" or "crawl".
+            operation: Operation to perform: "scrape", "crawl", "sitemap" or
+                "focused_crawl". "sitemap" streams the given sitemaps and scrapes
+                every page URL they list, honoring ``max_concurrency``.
+                "focused_crawl" crawls from the given URLs client-side with
+                concurrent scrape jobs, following the best-scoring links first.
             params: Optional params for scrape or crawl. For more information on the supported params, visit https://docs.hyperbrowser.ai/reference/sdks/python/scrape#start-scrape-job-and-wait or https://docs.hyperbrowser.ai/reference/sdks/python/crawl#start-crawl-job-and-wait
+                ``session_options`` may also be the name of a registered session
+                profile, or a dict with a ``session_profile`` key and overrides.
+            max_concurrency: Maximum number of scrape jobs run at the same time.
+                With more than one, documents are yielded in completion order.
+            politeness: Optional per-host limits (concurrency, delay, robots.txt
+                hints) applied when scraping several URLs. Defaults to
+                ``PolitenessPolicy()`` whenever ``max_concurrency`` is above one.
+            priority: Priority class the loader's jobs are queued under.
+            scheduler: Job scheduler to submit through. Defaults to the shared
+                scheduler used by the tools, so bulk loads yield to interactive
+                tool calls when the account's concurrency is saturated.
+            sitemap_options: Optional lastmod, pattern and size filters for the
+                "sitemap" operation.
+            limiter: Adaptive concurrency limiter for scrape jobs, or ``True``
+                for one that starts low and grows up to ``max_concurrency``.
+                ``max_concurrency`` then acts as a ceiling, and the number of
+                jobs in flight follows observed latency and 429 responses.
+            prefilter: Probe URLs with cheap HTTP requests before scraping them
+                ("scrape" and "sitemap" only). Dead links, non-HTML resources,
+                duplicate redirect targets and, optionally, unchanged pages are
+                skipped. ``True`` uses the default ``PrefilterOptions``.
+            fast_path: Fetch pages over plain HTTP and convert them to
+                Markdown locally, starting a Hyperbrowser scrape only for pages
+                that look JS-rendered or blocked ("scrape" and "sitemap" only).
+                ``True`` uses the default ``FastPathOptions``.
+            local_markdown: Convert pages returned with only the "html" format
+                to Markdown locally. ``True`` also strips navigation, footers
+                and other boilerplate and keeps only the main content; a dict
+                sets ``remove_boilerplate``, ``main_content`` and, for crawls,
+                ``max_workers`` of the conversion process pool.
+            profiler: Records per-phase timings of each scraped URL or crawl.
+            key_pool: API keys that jobs are spread across, as a ``KeyPool``,
+                a list of keys or a dict of key to weight. ``api_key`` is then
+                optional.
+            crawl_options: Page budget, depth, link filters and URL pattern
+                scores for "focused_crawl".
+            relevance: Scores a fetched Document for "focused_crawl"; the
+                links on relevant pages are visited sooner.
+            artifacts: Where screenshots requested with the "screenshot"
+                format are stored, as an ``ArtifactStore`` or a directory.
+                Document metadata holds a reference to the stored file rather
+                than the base64 data. Defaults to a store in the temp dir.
         """
+        self.key_pool: Optional[KeyPool] = as_key_pool(key_pool)
+        if api_key is None and self.key_pool is not None:
+            api_key = self.key_pool.keys[0]
         self.api_key = api_key or get_from_env(
             "HYPERBROWSER_API_KEY", env_key="HYPERBROWSER_API_KEY"
         )
@@ -110,6 +227,56 @@ class HyperbrowserLoader(BaseLoader):
         self.operation = operation
         self.params = params or {}
 
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        if isinstance(politeness, dict) or (politeness is None and max_concurrency > 1):
+            from langchain_hyperbrowser.politeness import PolitenessPolicy
+
+            politeness = PolitenessPolicy(**(politeness or {}))
+        self.politeness = politeness
+        self.priority = priority
+        self.scheduler = scheduler
+        if isinstance(sitemap_options, dict):
+            from langchain_hyperbrowser.sitemap import SitemapOptions
+
+            sitemap_options = SitemapOptions(**sitemap_options)
+        self.sitemap_options = sitemap_options
+        if limiter is True:
+            limiter = AdaptiveLimiter(
+                initial_limit=min(4, max_concurrency), max_limit=max_concurrency
+            )
+        self.limiter = limiter or None
+        self.prefilter = None
+        if prefilter:
+            from langchain_hyperbrowser.prefilter import PrefilterOptions, URLPrefilter
+
+            if prefilter is True:
+                prefilter = PrefilterOptions()
+            elif isinstance(prefilter, dict):
+                prefilter = PrefilterOptions(**prefilter)
+            self.prefilter = URLPrefilter(prefilter)
+        self.fast_path = None
+        if fast_path:
+            from langchain_hyperbrowser.fastpath import FastPathFetcher, FastPathOptions
+
+            if fast_path is True:
+                fast_path = FastPathOptions()
+            elif isinstance(fast_path, dict):
+                fast_path = FastPathOptions(**fast_path)
+            self.fast_path = FastPathFetcher(fast_path)
+        if local_markdown is True:
+            local_markdown = {"remove_boilerplate": True, "main_content": True}
+        self.local_markdown = local_markdown or None
+        self.profiler = profiler
+        if isinstance(crawl_options, dict):
+            from langchain_hyperbrowser.focused import FocusedCrawlOptions
+
+            crawl_options = FocusedCrawlOptions(**crawl_options)
+        self.crawl_options = crawl_options
+        self.relevance = relevance
+        self.artifacts: ArtifactStore = as_artifact_store(artifacts) or ArtifactStore()
+
         if operation == "crawl":
             if isinstance(urls, str):
                 self.urls = [urls]
@@ -126,69 +293,497 @@ class HyperbrowserLoader(BaseLoader):
         if "scrape_options" in self.params:
             if "formats" in self.params["scrape_options"]:
                 formats = self.params["scrape_options"]["formats"]
-                if not all(fmt in ["markdown", "html"] for fmt in formats):
-                    raise ValueError("formats can only contain 'markdown' or 'html'")
+                if not all(
+                    fmt in ["markdown", "html", "screenshot"] for fmt in formats
+                ):
+                    raise ValueError(
+                        "formats can only contain 'markdown' or 'html' "
+                        "(and 'screenshot')"
+                    )
+
+        self._hyperbrowser: Optional["Hyperbrowser"] = None
+        self._async_hyperbrowser: Optional["AsyncHyperbrowser"] = None
+        self._clients = ClientRefs()
+        self._jobs = JobTracker()
+
+    def _api_key(self) -> str:
+        """The key leased for the running job, else the loader's API key."""
+        if self.key_pool is not None:
+            key = self.key_pool.current()
+            if key is not None:
+                return key
+        return self.api_key
+
+    def _lease(self) -> ContextManager[Any]:
+        """Lease an API key from the key pool, if the loader has one."""
+        return self.key_pool.lease() if self.key_pool is not None else nullcontext()
+
+    @property
+    def hyperbrowser(self) -> "Hyperbrowser":
+        """Synchronous client, shared per API key and created on first use."""
+        client = self._hyperbrowser or self._clients.get(self._api_key())
+        if self.profiler is not None:
+            instrument_client(client)
+        return client
+
+    @hyperbrowser.setter
+    def hyperbrowser(self, client: "Hyperbrowser") -> None:
+        self._hyperbrowser = client
+
+    @property
+    def async_hyperbrowser(self) -> "AsyncHyperbrowser":
+        """Async client for the running event loop, created on first use."""
+        client = self._async_hyperbrowser or self._clients.get_async(self._api_key())
+        if self.profiler is not None:
+            instrument_client(client)
+        return client
+
+    @async_hyperbrowser.setter
+    def async_hyperbrowser(self, client: "AsyncHyperbrowser") -> None:
+        self._async_hyperbrowser = client
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop starting jobs, wait for running ones and close connection pools.
+
+        Scrape and crawl jobs cannot be cancelled through the API, so they are
+        drained. Returns whether they all finished within ``timeout``.
+        """
+        self._jobs.close()
+        drained = self._jobs.drain(timeout)
+        if self._hyperbrowser is not None:
+            self._hyperbrowser.close()
+        else:
+            self._clients.close()
+        self._close_http()
+        return drained
+
+    async def aclose(self, timeout: Optional[float] = None) -> bool:
+        """Async version of :meth:`close`, closing this event loop's pools."""
+        self._jobs.close()
+        drained = await self._jobs.adrain(timeout)
+        if self._async_hyperbrowser is not None:
+            await self._async_hyperbrowser.close()
+        else:
+            await self._clients.aclose()
+        if self.fast_path is not None:
+            await self.fast_path.aclose()
+        return self.close(timeout=0) and drained
+
+    def _close_http(self) -> None:
+        if self.fast_path is not None:
+            self.fast_path.close()
+        if self.prefilter is not None:
+            self.prefilter.close()
+
+    def __enter__(self) -> "HyperbrowserLoader":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "HyperbrowserLoader":
+        return self
 
-        self.hyperbrowser = Hyperbrowser(api_key=api_key)
-        self.async_hyperbrowser = AsyncHyperbrowser(api_key=api_key)
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.aclose()
 
     def _prepare_params(self):
-        """Prepare session and scrape options parameters."""
-        if "session_options" in self.params:
-            self.params["session_options"] = CreateSessionParams(
-                **self.params["session_options"]
-            )
-        if "scrape_options" in self.params:
+        """Prepare session and scrape options parameters.
+
+        Options already converted by an earlier call are left as they are.
+        """
+        from hyperbrowser.models.scrape import ScrapeOptions
+        from hyperbrowser.models.session import CreateSessionParams
+
+        from langchain_hyperbrowser.common import get_session_profile
+
+        session_options = self.params.get("session_options")
+        if isinstance(session_options, str):
+            self.params["session_options"] = get_session_profile(session_options)
+        elif isinstance(session_options, dict):
+            options = dict(session_options)
+            profile = options.pop("session_profile", None)
+            if profile is not None:
+                base = get_session_profile(profile).model_dump(exclude_unset=True)
+                options = {**base, **options}
+            self.params["session_options"] = CreateSessionParams(**options)
+        if isinstance(self.params.get("scrape_options"), dict):
             self.params["scrape_options"] = ScrapeOptions(
                 **self.params["scrape_options"]
             )
 
+    def _formats(self) -> List[str]:
+        scrape_options = self.params.get("scrape_options")
+        formats = getattr(scrape_options, "formats", None)
+        return list(formats) if formats else ["markdown"]
+
     def _create_document(self, content: str, metadata: dict) -> Document:
         """Create a Document with content and metadata."""
         return Document(page_content=content, metadata=metadata)
 
-    def _extract_content_metadata(self, data: Union[ScrapeJobData, None]):
+    def _extract_content_metadata(self, data: Union["ScrapeJobData", None]):
         """Extract content and metadata from response data."""
         content = ""
         metadata = {}
         if data:
+            if self.local_markdown is not None and data.html and not data.markdown:
+                from langchain_hyperbrowser.markdown import html_to_markdown
+
+                options = dict(self.local_markdown)
+                options.pop("max_workers", None)
+                data.markdown = html_to_markdown(data.html, **options)
             content = data.markdown or data.html or ""
-            if data.metadata:
-                metadata = data.metadata
+            metadata = self._page_metadata(data)
         return content, metadata
 
-    def lazy_load(self) -> Iterator[Document]:
-        self._prepare_params()
+    def _page_metadata(self, page: Any) -> dict:
+        """A page's metadata, referencing its screenshot in the artifact store.
+
+        Base64 screenshots are moved to ``self.artifacts`` and replaced by the
+        ``ArtifactRef`` fields; screenshot URLs are kept as they are.
+        """
+        metadata = page.metadata or {}
+        screenshot = getattr(page, "screenshot", None)
+        if isinstance(screenshot, str) and screenshot:
+            ref = store_screenshot(page, self.artifacts)
+            if ref is not None:
+                screenshot = ref.model_dump()
+            metadata = {**metadata, "screenshot": screenshot}
+        return metadata
+
+    def _scheduler(self) -> JobScheduler:
+        return self.scheduler or get_default_scheduler()
+
+    def _profile(self, name: str) -> ContextManager[None]:
+        """Record a profiled call, if the loader has a profiler."""
+        return self.profiler.call(name) if self.profiler is not None else nullcontext()
+
+    def _limit(self) -> ContextManager[None]:
+        """Hold an adaptive limiter slot, if the loader has a limiter."""
+        return self.limiter.slot() if self.limiter is not None else nullcontext()
+
+    @asynccontextmanager
+    async def _alimit(self) -> AsyncIterator[None]:
+        """Hold an adaptive limiter slot, if the loader has a limiter."""
+        if self.limiter is None:
+            yield
+        else:
+            async with self.limiter.aslot():
+                yield
+
+    def _domain_scheduler(self, urls: Iterable[str]) -> Optional["DomainScheduler"]:
+        """Build a politeness scheduler when several URLs are scraped."""
+        if self.politeness is None:
+            return None
+        if isinstance(urls, Sequence) and len(urls) < 2:
+            return None
+        from langchain_hyperbrowser.politeness import DomainScheduler
+
+        return DomainScheduler(
+            urls, max_concurrency=self.max_concurrency, policy=self.politeness
+        )
+
+    def _sitemap_urls(self) -> Iterator[str]:
+        """Stream page URLs from the configured sitemaps as they are parsed."""
+        from langchain_hyperbrowser.sitemap import SitemapWalker
 
-        if self.operation == "scrape":
-            for url in self.urls:
-                scrape_params = StartScrapeJobParams(url=url, **self.params)
+        walker = SitemapWalker(self.sitemap_options)
+        return (entry.url for entry in walker.walk(self.urls))
+
+    def _scrape_urls(self) -> Iterable[str]:
+        """The URLs to scrape: sitemap URLs are streamed unless prefiltered."""
+        urls = self._sitemap_urls() if self.operation == "sitemap" else self.urls
+        if self.prefilter is not None:
+            urls = self.prefilter.filter(list(urls))
+        return urls
+
+    async def _ascrape_urls(self) -> Iterable[str]:
+        """Async version of :meth:`_scrape_urls`."""
+        urls: Iterable[str] = (
+            self._sitemap_urls() if self.operation == "sitemap" else self.urls
+        )
+        if self.prefilter is not None:
+            urls = await self.prefilter.afilter(await asyncio.to_thread(list, urls))
+        return urls
+
+    def _save_caches(self) -> None:
+        """Persist committed probe results and learned fast path decisions."""
+        if self.prefilter is not None:
+            self.prefilter.save()
+        if self.fast_path is not None:
+            self.fast_path.save()
+
+    def _scrape_url(self, url: str) -> Document:
+        return self._scrape_page(url)[0]
+
+    async def _ascrape_url(self, url: str) -> Document:
+        return (await self._ascrape_page(url))[0]
+
+    def _scrape_page(self, url: str) -> Tuple[Document, Any]:
+        """Scrape a URL, returning its Document and the scrape data."""
+        with self._profile("loader.scrape"):
+            data = self._scrape_data(url)
+            with phase("document"):
+                content, metadata = self._extract_content_metadata(data)
+                return self._create_document(content, metadata), data
+
+    async def _ascrape_page(self, url: str) -> Tuple[Document, Any]:
+        """Async version of :meth:`_scrape_page`."""
+        with self._profile("loader.scrape"):
+            data = await self._ascrape_data(url)
+            with phase("document"):
+                content, metadata = self._extract_content_metadata(data)
+                return self._create_document(content, metadata), data
+
+    def _scraped(self, url: str, data: Any) -> Any:
+        """Commit a URL's staged probe results once its scrape returned data."""
+        if self.prefilter is not None and data is not None:
+            self.prefilter.commit(url)
+        return data
+
+    def _needs_browser(self) -> bool:
+        """Whether the scrape params need a browser, ruling out the fast path."""
+        from langchain_hyperbrowser.fastpath import needs_browser
+
+        return needs_browser(
+            self.params.get("scrape_options"), self.params.get("session_options")
+        )
+
+    def _scrape_data(self, url: str) -> Optional["ScrapeJobData"]:
+        """Fetch a URL through the fast path or a scrape job."""
+        from hyperbrowser.models.scrape import StartScrapeJobParams
+
+        if self.fast_path is not None and not self._needs_browser():
+            with phase("fast_path"):
+                data = self.fast_path.fetch(url, self._formats())
+            if data is not None:
+                return self._scraped(url, data)
+
+        with phase("params"):
+            scrape_params = StartScrapeJobParams(url=url, **self.params)
+        with self._jobs.track(), ExitStack() as stack:
+            with phase("queue"):
+                stack.enter_context(self._limit())
+                stack.enter_context(self._scheduler().slot(self.priority))
+            stack.enter_context(self._lease())
+            with phase("job"):
                 scrape_resp = self.hyperbrowser.scrape.start_and_wait(scrape_params)
-                content, metadata = self._extract_content_metadata(scrape_resp.data)
-                yield self._create_document(content, metadata)
+        return self._scraped(url, scrape_resp.data)
+
+    async def _ascrape_data(self, url: str) -> Optional["ScrapeJobData"]:
+        """Async version of :meth:`_scrape_data`."""
+        from hyperbrowser.models.scrape import StartScrapeJobParams
+
+        if self.fast_path is not None and not self._needs_browser():
+            with phase("fast_path"):
+                data = await self.fast_path.afetch(url, self._formats())
+            if data is not None:
+                return self._scraped(url, data)
+
+        with phase("params"):
+            scrape_params = StartScrapeJobParams(url=url, **self.params)
+        with self._jobs.track():
+            async with AsyncExitStack() as stack:
+                with phase("queue"):
+                    await stack.enter_async_context(self._alimit())
+                    await stack.enter_async_context(
+                        self._scheduler().aslot(self.priority)
+                    )
+                stack.enter_context(self._lease())
+                with phase("job"):
+                    client = self.async_hyperbrowser
+                    scrape_resp = await client.scrape.start_and_wait(scrape_params)
+        return self._scraped(url, scrape_resp.data)
+
+    def enqueue(self, queue: "WorkQueue") -> int:
+        """Put the loader's URLs on a work queue for distributed workers.
+
+        For "sitemap" the sitemaps are expanded first, and URLs are
+        prefiltered if the loader has a prefilter. Probe results are cached
+        only when this loader scrapes a URL itself, so URLs scraped by other
+        workers are probed again next run. Returns the number of URLs
+        that were not already on the queue.
+        """
+        if self.operation not in ("scrape", "sitemap"):
+            raise ValueError("Only scrape and sitemap loads can be distributed")
+        return queue.enqueue(self._scrape_urls())
+
+    def _page_row(self, url: str) -> Tuple[str, str, dict]:
+        with self._profile("loader.scrape"):
+            data = self._scrape_data(url)
+            return (url, *self._extract_content_metadata(data))
+
+    async def _apage_row(self, url: str) -> Tuple[str, str, dict]:
+        with self._profile("loader.scrape"):
+            data = await self._ascrape_data(url)
+            return (url, *self._extract_content_metadata(data))
+
+    def _crawl_rows(self, pages: Any) -> Iterator[Tuple[str, str, dict]]:
+        for page in pages or []:
+            content = page.markdown or page.html or ""
+            yield page.url, content, self._page_metadata(page)
+
+    def export(self, sink: "PageSink", batch_size: int = 100) -> int:
+        """Stream pages into ``sink`` without building Documents.
+
+        Scrapes are written as they finish; crawls are paged in
+        ``batch_size`` pages at a time, so memory stays bounded by the batch
+        and the sink's buffer. The sink is not closed. Returns the number of
+        pages written.
+        """
+        self._prepare_params()
+        written = 0
+        if self.operation in ("scrape", "sitemap"):
+            urls = self._scrape_urls()
+            scheduler = self._domain_scheduler(urls)
+            if scheduler is None:
+                rows = (self._page_row(url) for url in urls)
+            else:
+                rows = (row for _, row in scheduler.map(self._page_row))
+            try:
+                for row in rows:
+                    sink.write(*row)
+                    written += 1
+            finally:
+                self._save_caches()
+        elif self.operation == "crawl":
+            from hyperbrowser.models.crawl import StartCrawlJobParams
+
+            from langchain_hyperbrowser.crawl_tool import iter_crawl_batches
+
+            crawl_params = StartCrawlJobParams(url=self.urls[0], **self.params)
+            with self._jobs.track(), self._scheduler().slot(self.priority):
+                with self._lease():
+                    client = self.hyperbrowser
+                    for batch in iter_crawl_batches(client, crawl_params, batch_size):
+                        if self.local_markdown is not None and batch.data:
+                            self._add_markdown(batch.data)
+                        for row in self._crawl_rows(batch.data):
+                            sink.write(*row)
+                            written += 1
         else:
+            raise ValueError(f"{self.operation} loads cannot be exported")
+        return written
+
+    async def aexport(self, sink: "PageSink", batch_size: int = 100) -> int:
+        """Async version of :meth:`export`."""
+        self._prepare_params()
+        written = 0
+        if self.operation in ("scrape", "sitemap"):
+            urls = await self._ascrape_urls()
+            scheduler = self._domain_scheduler(urls)
+            try:
+                if scheduler is None:
+                    async for url in _aiterate(urls):
+                        sink.write(*await self._apage_row(url))
+                        written += 1
+                else:
+                    async for _, row in scheduler.amap(self._apage_row):
+                        sink.write(*row)
+                        written += 1
+            finally:
+                await asyncio.to_thread(self._save_caches)
+        elif self.operation == "crawl":
+            from hyperbrowser.models.crawl import StartCrawlJobParams
+
+            from langchain_hyperbrowser.crawl_tool import aiter_crawl_batches
+
             crawl_params = StartCrawlJobParams(url=self.urls[0], **self.params)
-            crawl_resp = self.hyperbrowser.crawl.start_and_wait(crawl_params)
+            with self._jobs.track():
+                async with self._scheduler().aslot(self.priority):
+                    with self._lease():
+                        client = self.async_hyperbrowser
+                        batches = aiter_crawl_batches(client, crawl_params, batch_size)
+                        async for batch in batches:
+                            if self.local_markdown is not None and batch.data:
+                                await asyncio.to_thread(self._add_markdown, batch.data)
+                            for row in self._crawl_rows(batch.data):
+                                sink.write(*row)
+                                written += 1
+        else:
+            raise ValueError(f"{self.operation} loads cannot be exported")
+        return written
+
+    def _add_markdown(self, pages: Any) -> None:
+        """Convert crawled pages returned with only HTML to Markdown."""
+        from langchain_hyperbrowser.markdown import add_markdown
+
+        add_markdown(pages, **(self.local_markdown or {}))
+
+    def _focused_crawler(self) -> "FocusedCrawler":
+        from langchain_hyperbrowser.focused import FocusedCrawler
+
+        return FocusedCrawler(list(self.urls), self.crawl_options, self.relevance)
+
+    def lazy_load(self) -> Iterator[Document]:
+        self._prepare_params()
+
+        if self.operation == "focused_crawl":
+            crawler = self._focused_crawler()
+            yield from crawler.crawl(self._scrape_page, self.max_concurrency)
+        elif self.operation in ("scrape", "sitemap"):
+            urls = self._scrape_urls()
+            scheduler = self._domain_scheduler(urls)
+            try:
+                if scheduler is None:
+                    for url in urls:
+                        yield self._scrape_url(url)
+                else:
+                    for _, doc in scheduler.map(self._scrape_url):
+                        yield doc
+            finally:
+                self._save_caches()
+        else:
+            from hyperbrowser.models.crawl import StartCrawlJobParams
+
+            with self._profile("loader.crawl"):
+                with phase("params"):
+                    crawl_params = StartCrawlJobParams(url=self.urls[0], **self.params)
+                with self._jobs.track(), self._scheduler().slot(self.priority):
+                    with self._lease(), phase("job"):
+                        crawl_resp = self.hyperbrowser.crawl.start_and_wait(
+                            crawl_params
+                        )
+                if self.local_markdown is not None:
+                    with phase("markdown"):
+                        self._add_markdown(crawl_resp.data)
             for page in crawl_resp.data:
                 content = page.markdown or page.html or ""
-                yield self._create_document(content, page.metadata or {})
+                yield self._create_document(content, self._page_metadata(page))
 
     async def alazy_load(self) -> AsyncIterator[Document]:
         self._prepare_params()
 
-        if self.operation == "scrape":
-            for url in self.urls:
-                scrape_params = StartScrapeJobParams(url=url, **self.params)
-                scrape_resp = await self.async_hyperbrowser.scrape.start_and_wait(
-                    scrape_params
-                )
-                content, metadata = self._extract_content_metadata(scrape_resp.data)
-                yield self._create_document(content, metadata)
+        if self.operation == "focused_crawl":
+            crawler = self._focused_crawler()
+            async for doc in crawler.acrawl(self._ascrape_page, self.max_concurrency):
+                yield doc
+        elif self.operation in ("scrape", "sitemap"):
+            urls = await self._ascrape_urls()
+            scheduler = self._domain_scheduler(urls)
+            try:
+                if scheduler is None:
+                    async for url in _aiterate(urls):
+                        yield await self._ascrape_url(url)
+                else:
+                    async for _, doc in scheduler.amap(self._ascrape_url):
+                        yield doc
+            finally:
+                await asyncio.to_thread(self._save_caches)
         else:
-            crawl_params = StartCrawlJobParams(url=self.urls[0], **self.params)
-            crawl_resp = await self.async_hyperbrowser.crawl.start_and_wait(
-                crawl_params
-            )
+            from hyperbrowser.models.crawl import StartCrawlJobParams
+
+            with self._profile("loader.crawl"):
+                with phase("params"):
+                    crawl_params = StartCrawlJobParams(url=self.urls[0], **self.params)
+                with self._jobs.track():
+                    async with self._scheduler().aslot(self.priority):
+                        with self._lease(), phase("job"):
+                            client = self.async_hyperbrowser
+                            crawl_resp = await client.crawl.start_and_wait(crawl_params)
+                if self.local_markdown is not None:
+                    with phase("markdown"):
+                        await asyncio.to_thread(self._add_markdown, crawl_resp.data)
             for page in crawl_resp.data:
                 content = page.markdown or page.html or ""
-                yield self._create_document(content, page.metadata or {})
+                yield self._create_document(content, self._page_metadata(page))
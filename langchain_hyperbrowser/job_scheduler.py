@@ -0,0 +1,214 @@
+"""Client-side scheduling of Hyperbrowser jobs across priority classes."""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_WEIGHTS: Dict[str, float] = {"interactive": 8.0, "batch": 1.0}
+
+
+class _Waiter:
+    __slots__ = ("priority", "enqueued", "event", "loop", "future", "granted")
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.event: Optional[threading.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.future: Optional[asyncio.Future] = None
+        self.granted = False
+
+    def wake(self) -> None:
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+        elif self.loop is not None and self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.future is not None and self.future.cancelled()
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _ClassStats:
+    __slots__ = ("queued", "running", "dispatched", "wait_seconds")
+
+    def __init__(self) -> None:
+        self.queued = 0
+        self.running = 0
+        self.dispatched = 0
+        self.wait_seconds = 0.0
+
+
+class JobScheduler:
+    """Admission control for remote jobs with weighted fair queueing.
+
+    At most ``max_concurrent_jobs`` jobs hold a slot at once (``None`` means
+    unlimited, in which case slots are granted immediately). When the limit is
+    reached, waiting jobs are ordered by a virtual finish tag computed from the
+    weight of their priority class, so a class with weight 8 is served eight
+    times as often as a class with weight 1 while both have work queued, and an
+    idle class never accumulates credit. Scheduling is preemption-free: a job
+    keeps its slot until it finishes.
+
+    Slots can be taken from threads with :meth:`slot` and from coroutines with
+    :meth:`aslot`; both share the same queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_jobs: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        if max_concurrent_jobs is not None and max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be at least 1")
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        if any(weight <= 0 for weight in self.weights.values()):
+            raise ValueError("priority weights must be positive")
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[float, int, _Waiter]] = []
+        self._counter = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._running = 0
+        self._stats: Dict[str, _ClassStats] = {}
+
+    def _weight(self, priority: str) -> float:
+        try:
+            return self.weights[priority]
+        except KeyError:
+            raise ValueError(
+                f"Unknown priority class {priority!r}, "
+                f"expected one of {sorted(self.weights)}"
+            ) from None
+
+    def _class_stats(self, priority: str) -> _ClassStats:
+        stats = self._stats.get(priority)
+        if stats is None:
+            stats = self._stats[priority] = _ClassStats()
+        return stats
+
+    def _try_acquire(self, waiter: _Waiter) -> bool:
+        """Grant a slot immediately or enqueue the waiter. Requires the lock."""
+        weight = self._weight(waiter.priority)
+        stats = self._class_stats(waiter.priority)
+        if not self._queue and (
+            self.max_concurrent_jobs is None or self._running < self.max_concurrent_jobs
+        ):
+            self._running += 1
+            stats.running += 1
+            stats.dispatched += 1
+            return True
+        start = max(self._virtual_time, self._last_finish.get(waiter.priority, 0.0))
+        finish = start + 1.0 / weight
+        self._last_finish[waiter.priority] = finish
+        heapq.heappush(self._queue, (finish, next(self._counter), waiter))
+        stats.queued += 1
+        return False
+
+    def _release(self, priority: str) -> None:
+        with self._lock:
+            self._running -= 1
+            self._class_stats(priority).running -= 1
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the waiters with the smallest tags. Requires the lock."""
+        while self._queue and (
+            self.max_concurrent_jobs is None or self._running < self.max_concurrent_jobs
+        ):
+            finish, _, waiter = heapq.heappop(self._queue)
+            stats = self._class_stats(waiter.priority)
+            stats.queued -= 1
+            if waiter.cancelled:
+                continue
+            self._virtual_time = max(
+                self._virtual_time, finish - 1.0 / self._weight(waiter.priority)
+            )
+            self._running += 1
+            stats.running += 1
+            stats.dispatched += 1
+            stats.wait_seconds += time.monotonic() - waiter.enqueued
+            waiter.wake()
+
+    @contextmanager
+    def slot(self, priority: str = "interactive") -> Iterator[None]:
+        """Hold a job slot for the duration of the block (blocking)."""
+        waiter = _Waiter(priority)
+        with self._lock:
+            acquired = self._try_acquire(waiter)
+            if not acquired:
+                waiter.event = threading.Event()
+        if not acquired:
+            waiter.event.wait()  # type: ignore[union-attr]
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    @asynccontextmanager
+    async def aslot(self, priority: str = "interactive") -> AsyncIterator[None]:
+        """Hold a job slot for the duration of the block."""
+        waiter = _Waiter(priority)
+        with self._lock:
+            acquired = self._try_acquire(waiter)
+            if not acquired:
+                waiter.loop = asyncio.get_running_loop()
+                waiter.future = waiter.loop.create_future()
+        if not acquired:
+            try:
+                await waiter.future  # type: ignore[misc]
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted = waiter.granted
+                if granted:
+                    self._release(priority)
+                raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return queue depth, running jobs and wait totals per priority class."""
+        with self._lock:
+            return {
+                priority: {
+                    "queued": stats.queued,
+                    "running": stats.running,
+                    "dispatched": stats.dispatched,
+                    "wait_seconds": stats.wait_seconds,
+                }
+                for priority, stats in self._stats.items()
+            }
+
+
+_default_scheduler = JobScheduler()
+
+
+def get_default_scheduler() -> JobScheduler:
+    """Return the scheduler shared by all tools and loaders."""
+    return _default_scheduler
+
+
+def configure_scheduler(
+    max_concurrent_jobs: Optional[int] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> JobScheduler:
+    """Replace the shared scheduler, e.g. to match the account's concurrency limit.
+
+    Jobs already holding or waiting for a slot keep using the previous one.
+    """
+    global _default_scheduler
+    _default_scheduler = JobScheduler(max_concurrent_jobs, weights)
+    return _default_scheduler
@@ -0,0 +1,201 @@
+"""Spread jobs over several Hyperbrowser API keys."""
+
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+# Status codes that mean a key is out of capacity: rate limited or out of
+# credits. 503 is left out since it says nothing about the key.
+EXHAUSTED_STATUS_CODES = frozenset({402, 429})
+_QUOTA_MESSAGE = re.compile(
+    r"quota|rate.?limit|too many requests|credits|concurrency limit", re.IGNORECASE
+)
+
+# The key leased by the job running in this context, with the pool it is from.
+_leased: ContextVar[Optional[Tuple["KeyPool", str]]] = ContextVar(
+    "hyperbrowser_leased_key", default=None
+)
+
+
+def is_exhausted_error(error: BaseException) -> bool:
+    """Whether ``error`` (or an error it wraps) is a rate limit or quota error."""
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        status = getattr(current, "status_code", None)
+        if status in EXHAUSTED_STATUS_CODES:
+            return True
+        if status is not None and _QUOTA_MESSAGE.search(str(current)):
+            return True
+        current = getattr(current, "original_error", None) or current.__cause__
+    return False
+
+
+class _Key:
+    __slots__ = (
+        "key",
+        "weight",
+        "in_flight",
+        "requests",
+        "errors",
+        "throttled",
+        "strikes",
+        "sidelined_until",
+        "busy_seconds",
+    )
+
+    def __init__(self, key: str, weight: float):
+        self.key = key
+        self.weight = weight
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.strikes = 0
+        self.sidelined_until = 0.0
+        self.busy_seconds = 0.0
+
+
+class KeyPool:
+    """A pool of API keys that jobs are spread across.
+
+    Each job leases one key for its duration. ``"least_loaded"`` picks the
+    key with the fewest jobs in flight relative to its weight;
+    ``"weighted"`` picks at random in proportion to the weights. A key whose
+    job fails with a 429 or quota error is sidelined for ``cooldown``
+    seconds, doubling on repeated failures up to ``max_cooldown``, and is
+    only used again once no other key is available. Keys are given as a list
+    or as a mapping of key to weight.
+    """
+
+    def __init__(
+        self,
+        keys: Union[Sequence[str], Mapping[str, float]],
+        strategy: Literal["least_loaded", "weighted"] = "least_loaded",
+        cooldown: float = 30.0,
+        max_cooldown: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        weights = dict(keys) if isinstance(keys, Mapping) else dict.fromkeys(keys, 1.0)
+        if not weights:
+            raise ValueError("KeyPool needs at least one API key")
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError("key weights must be positive")
+        if strategy not in ("least_loaded", "weighted"):
+            raise ValueError(f"unknown key pool strategy: {strategy!r}")
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys = [_Key(key, float(weight)) for key, weight in weights.items()]
+
+    @property
+    def keys(self) -> List[str]:
+        return [entry.key for entry in self._keys]
+
+    def current(self) -> Optional[str]:
+        """The key leased by the job running in this context, if any."""
+        leased = _leased.get()
+        if leased is None or leased[0] is not self:
+            return None
+        return leased[1]
+
+    def _pick(self) -> _Key:
+        now = self._clock()
+        candidates = [e for e in self._keys if e.sidelined_until <= now]
+        if not candidates:
+            return min(self._keys, key=lambda e: e.sidelined_until)
+        if self.strategy == "weighted":
+            return random.choices(candidates, [e.weight for e in candidates])[0]
+        return min(candidates, key=lambda e: (e.in_flight + 1) / e.weight)
+
+    @contextmanager
+    def lease(self) -> Iterator[str]:
+        """Lease a key for one job, recording its outcome."""
+        with self._lock:
+            entry = self._pick()
+            entry.in_flight += 1
+            entry.requests += 1
+        token = _leased.set((self, entry.key))
+        started = self._clock()
+        error: Optional[BaseException] = None
+        try:
+            yield entry.key
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _leased.reset(token)
+            self._release(entry, self._clock() - started, error)
+
+    def _release(
+        self, entry: _Key, seconds: float, error: Optional[BaseException]
+    ) -> None:
+        with self._lock:
+            entry.in_flight -= 1
+            entry.busy_seconds += seconds
+            if error is None:
+                entry.strikes = 0
+            elif isinstance(error, Exception):
+                entry.errors += 1
+                if is_exhausted_error(error):
+                    entry.throttled += 1
+                    self._sideline(entry, None)
+
+    def _sideline(self, entry: _Key, seconds: Optional[float]) -> None:
+        if seconds is None:
+            entry.strikes += 1
+            seconds = min(self.cooldown * 2 ** (entry.strikes - 1), self.max_cooldown)
+        entry.sidelined_until = max(entry.sidelined_until, self._clock() + seconds)
+
+    def sideline(self, key: str, seconds: Optional[float] = None) -> None:
+        """Take ``key`` out of rotation for ``seconds`` (or its next cooldown)."""
+        with self._lock:
+            for entry in self._keys:
+                if entry.key == key:
+                    self._sideline(entry, seconds)
+                    return
+        raise KeyError(key)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-key metrics in pool order, with keys masked."""
+        now = self._clock()
+        with self._lock:
+            return [
+                {
+                    "key": f"...{entry.key[-4:]}",
+                    "weight": entry.weight,
+                    "in_flight": entry.in_flight,
+                    "requests": entry.requests,
+                    "errors": entry.errors,
+                    "throttled": entry.throttled,
+                    "sidelined_for": max(entry.sidelined_until - now, 0.0),
+                    "busy_seconds": entry.busy_seconds,
+                }
+                for entry in self._keys
+            ]
+
+
+def as_key_pool(value: Any) -> Any:
+    """Build a :class:`KeyPool` from a list of keys or a key-to-weight mapping."""
+    if isinstance(value, (list, tuple, dict)):
+        return KeyPool(value)
+    return value
@@ -0,0 +1,171 @@
+"""Tracking of in-flight remote jobs so that tools and loaders shut down cleanly."""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+# Statuses after which an agent task no longer runs (or bills).
+TERMINAL_STATUSES = frozenset({"completed", "failed", "stopped"})
+
+
+class JobTracker:
+    """Count in-flight remote jobs and coordinate their shutdown.
+
+    Every remote call runs inside :meth:`track`. :meth:`close` stops new
+    calls from being admitted; :meth:`drain` and :meth:`adrain` then wait
+    for the calls already running. With ``cancel=True``, agent tasks started
+    through :meth:`run` or :meth:`arun` are stopped server-side instead of
+    being left to finish. Scrape, crawl and extract jobs cannot be stopped
+    through the API, so they are always drained.
+    """
+
+    def __init__(self, poll_interval: float = 2.0):
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._closed = False
+        self._cancelled = threading.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def in_flight(self) -> int:
+        """Number of remote calls currently running."""
+        return self._in_flight
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count a remote call as in flight while the block runs."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot start a job after close()")
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if not self._in_flight:
+                    self._idle.notify_all()
+
+    def close(self, cancel: bool = False) -> None:
+        """Stop admitting calls and, with ``cancel``, stop running agent tasks."""
+        with self._lock:
+            self._closed = True
+        if cancel:
+            self._cancelled.set()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for in-flight calls to finish; return False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._in_flight, timeout)
+
+    async def adrain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for in-flight calls without blocking the event loop."""
+        return await asyncio.to_thread(self.drain, timeout)
+
+    def _stop(self, manager: Any, job_id: str) -> None:
+        try:
+            manager.stop(job_id)
+        except Exception:
+            pass  # The task may already have finished.
+
+    async def _astop(self, manager: Any, job_id: str) -> None:
+        try:
+            await manager.stop(job_id)
+        except Exception:
+            pass
+
+    def _should_stop(self, deadline: Optional[float]) -> bool:
+        if self._cancelled.is_set():
+            return True
+        return deadline is not None and time.monotonic() >= deadline
+
+    def run(self, manager: Any, params: Any, timeout: Optional[float] = None) -> Any:
+        """Start an agent task with ``manager`` and poll it to completion.
+
+        Behaves like the SDK's ``start_and_wait``, but the task is stopped
+        when the tracker is closed with ``cancel=True`` or after ``timeout``
+        seconds. A stopped task still returns its partial result.
+        """
+        from hyperbrowser.exceptions import HyperbrowserError
+        from hyperbrowser.models.consts import POLLING_ATTEMPTS
+
+        with self.track():
+            job_id = manager.start(params).job_id
+            if not job_id:
+                raise HyperbrowserError("Failed to start agent task")
+            deadline = None if timeout is None else time.monotonic() + timeout
+            stopped = False
+            failures = 0
+            while True:
+                if not stopped and self._should_stop(deadline):
+                    stopped = True
+                    self._stop(manager, job_id)
+                try:
+                    if manager.get_status(job_id).status in TERMINAL_STATUSES:
+                        return manager.get(job_id)
+                    failures = 0
+                except Exception as e:
+                    failures += 1
+                    if failures >= POLLING_ATTEMPTS:
+                        raise HyperbrowserError(
+                            f"Failed to poll agent task {job_id} after "
+                            f"{POLLING_ATTEMPTS} attempts: {e}",
+                            original_error=e,
+                        )
+                wait = self.poll_interval
+                if deadline is not None and not stopped:
+                    wait = min(wait, max(deadline - time.monotonic(), 0.0))
+                self._cancelled.wait(wait)
+
+    async def arun(
+        self, manager: Any, params: Any, timeout: Optional[float] = None
+    ) -> Any:
+        """Async version of :meth:`run`.
+
+        The task is also stopped when the awaiting coroutine is cancelled,
+        so an abandoned call does not keep the agent running.
+        """
+        from hyperbrowser.exceptions import HyperbrowserError
+        from hyperbrowser.models.consts import POLLING_ATTEMPTS
+
+        with self.track():
+            job_id = (await manager.start(params)).job_id
+            if not job_id:
+                raise HyperbrowserError("Failed to start agent task")
+            deadline = None if timeout is None else time.monotonic() + timeout
+            stopped = False
+            failures = 0
+            try:
+                while True:
+                    if not stopped and self._should_stop(deadline):
+                        stopped = True
+                        await self._astop(manager, job_id)
+                    try:
+                        status = (await manager.get_status(job_id)).status
+                        if status in TERMINAL_STATUSES:
+                            return await manager.get(job_id)
+                        failures = 0
+                    except Exception as e:
+                        failures += 1
+                        if failures >= POLLING_ATTEMPTS:
+                            raise HyperbrowserError(
+                                f"Failed to poll agent task {job_id} after "
+                                f"{POLLING_ATTEMPTS} attempts: {e}",
+                                original_error=e,
+                            )
+                    wake = time.monotonic() + self.poll_interval
+                    while time.monotonic() < wake and (
+                        stopped or not self._should_stop(deadline)
+                    ):
+                        await asyncio.sleep(min(0.1, self.poll_interval))
+            except asyncio.CancelledError:
+                if not stopped:
+                    await asyncio.shield(self._astop(manager, job_id))
+                raise
@@ -0,0 +1,429 @@
+"""Local HTML to Markdown conversion."""
+
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_SKIP_TAGS = frozenset(
+    {"script", "style", "noscript", "template", "svg", "iframe", "canvas"}
+)
+_VOID_TAGS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+        "meta", "param", "source", "track", "wbr",
+    }
+)  # fmt: skip
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "div", "dl", "dd", "dt", "fieldset",
+        "figure", "figcaption", "footer", "form", "header", "main", "nav",
+        "p", "section", "table", "tr",
+    }
+)  # fmt: skip
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_WHITESPACE = re.compile(r"\s+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+# Boilerplate detection: page chrome elements, landmark roles and class or id
+# hints. Headers and footers are only chrome outside of a main or article
+# element, where they usually hold the article title or byline.
+_BOILERPLATE_TAGS = frozenset({"nav", "aside", "form", "button", "dialog"})
+_CHROME_TAGS = frozenset({"header", "footer"})
+_BOILERPLATE_ROLES = frozenset(
+    {"navigation", "banner", "contentinfo", "complementary", "search", "dialog"}
+)
+_BOILERPLATE_HINT = re.compile(
+    r"(?:^|[\s_-])(?:nav|navbar|menu|footer|sidebar|breadcrumbs?|cookies?|consent"
+    r"|banner|share|social|advert|ads|promo|newsletter|subscribe|related"
+    r"|comments?|popup|modal)(?:$|[\s_-])",
+    re.IGNORECASE,
+)
+_CONTENT_TAGS = frozenset({"html", "body", "main", "article"})
+
+# Below this many documents a process pool costs more than it saves.
+_POOL_THRESHOLD = 8
+
+
+class MarkdownConverter(HTMLParser):
+    """Incremental HTML to Markdown converter.
+
+    Markup is consumed with :meth:`feed` in arbitrary chunks and the Markdown
+    is available from :meth:`markdown` after :meth:`close`. Scripts, styles
+    and other non-content elements are dropped; headings, paragraphs, links,
+    emphasis, code, lists, block quotes, images and simple tables are kept.
+    The document ``<title>`` and meta description are collected as
+    :attr:`title` and :attr:`description`.
+
+    With ``remove_boilerplate``, navigation, sidebars, page headers and
+    footers, forms and elements whose class or id marks them as menus, ads,
+    cookie banners and the like are dropped as they stream past. With
+    ``main_content``, only the ``<main>`` element (or the longest
+    ``<article>``) is returned when the page has one.
+    """
+
+    def __init__(
+        self, remove_boilerplate: bool = False, main_content: bool = False
+    ) -> None:
+        super().__init__(convert_charrefs=True)
+        self.remove_boilerplate = remove_boilerplate
+        self.main_content = main_content
+        self.title: Optional[str] = None
+        self.description: Optional[str] = None
+        self._out: List[str] = []
+        self._trailing_newlines = 0
+        # Open elements as (tag, skipped, is main content, opens a region).
+        self._stack: List[Tuple[str, bool, bool, bool]] = []
+        self._skip_depth = 0
+        self._content_depth = 0
+        self._region_start: Optional[Tuple[str, int]] = None
+        self._regions: List[Tuple[str, int, int]] = []
+        self._in_title = False
+        self._title_parts: List[str] = []
+        self._pre_depth = 0
+        self._lists: List[Tuple[str, int]] = []
+        self._quotes: List[int] = []
+        self._links: List[Optional[str]] = []
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._header_row_done = False
+
+    # Output helpers
+
+    def _write(self, text: str) -> None:
+        if not text:
+            return
+        if self._cell is not None:
+            self._cell.append(text)
+            return
+        self._out.append(text)
+        stripped = text.rstrip("\n")
+        if stripped:
+            self._trailing_newlines = len(text) - len(stripped)
+        else:
+            self._trailing_newlines += len(text)
+
+    def _newline(self, count: int = 1) -> None:
+        """End the current line, leaving ``count`` newlines at the end."""
+        if self._cell is not None:
+            self._cell.append(" ")
+            return
+        if self._out and self._trailing_newlines < count:
+            self._write("\n" * (count - self._trailing_newlines))
+
+    # Element tracking
+
+    def _is_boilerplate(self, tag: str, attributes: Dict[str, Optional[str]]) -> bool:
+        if tag in _BOILERPLATE_TAGS:
+            return True
+        if tag in _CHROME_TAGS and not self._content_depth:
+            return True
+        if (attributes.get("role") or "").lower() in _BOILERPLATE_ROLES:
+            return True
+        if tag in _CONTENT_TAGS:
+            return False
+        hints = f"{attributes.get('class') or ''} {attributes.get('id') or ''}"
+        return _BOILERPLATE_HINT.search(hints) is not None
+
+    def _open(self, tag: str, attributes: Dict[str, Optional[str]]) -> bool:
+        """Track an opened element and return whether its content is skipped."""
+        skipped = tag in _SKIP_TAGS or (
+            self.remove_boilerplate
+            and not self._skip_depth
+            and self._is_boilerplate(tag, attributes)
+        )
+        is_content = tag in ("main", "article") or attributes.get("role") == "main"
+        region = False
+        if is_content and not self._skip_depth and not skipped:
+            if self._region_start is None:
+                kind = "article" if tag == "article" else "main"
+                self._region_start = (kind, len(self._out))
+                region = True
+        if tag in _VOID_TAGS:
+            return skipped
+        self._stack.append((tag, skipped, is_content, region))
+        if skipped:
+            self._skip_depth += 1
+        if is_content:
+            self._content_depth += 1
+        return skipped
+
+    def _close(self, tag: str) -> None:
+        """Close ``tag`` and any elements left open inside it."""
+        if not any(entry[0] == tag for entry in self._stack):
+            return
+        while self._stack:
+            open_tag, skipped, is_content, region = self._stack.pop()
+            if skipped:
+                self._skip_depth -= 1
+            elif not self._skip_depth:
+                self._end(open_tag)
+            if is_content:
+                self._content_depth -= 1
+            if region and self._region_start is not None:
+                kind, start = self._region_start
+                self._region_start = None
+                self._newline(2)
+                self._regions.append((kind, start, len(self._out)))
+            if open_tag == tag:
+                return
+
+    # Parser callbacks
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = dict(attrs)
+        if tag == "meta":
+            self._handle_meta(attributes)
+            return
+        if self._open(tag, attributes) or self._skip_depth:
+            return
+        if tag == "title":
+            self._in_title = True
+        elif tag in _HEADINGS:
+            self._newline(2)
+            self._write("#" * _HEADINGS[tag] + " ")
+        elif tag in ("p", "div", "section", "article", "main", "header", "footer"):
+            self._newline(2)
+        elif tag in _BLOCK_TAGS and tag != "tr":
+            self._newline(1)
+        elif tag == "br":
+            self._write("  \n" if self._cell is None else " ")
+        elif tag == "hr":
+            self._newline(2)
+            self._write("---")
+            self._newline(2)
+        elif tag in ("strong", "b"):
+            self._write("**")
+        elif tag in ("em", "i"):
+            self._write("*")
+        elif tag == "code" and not self._pre_depth:
+            self._write("`")
+        elif tag == "pre":
+            self._pre_depth += 1
+            self._newline(2)
+            self._write("```\n")
+        elif tag == "blockquote":
+            self._newline(2)
+            self._quotes.append(len(self._out))
+        elif tag in ("ul", "ol"):
+            if not self._lists:
+                self._newline(2)
+            self._lists.append((tag, 0))
+        elif tag == "li":
+            self._newline(1)
+            indent = "  " * max(len(self._lists) - 1, 0)
+            if self._lists and self._lists[-1][0] == "ol":
+                kind, count = self._lists[-1]
+                self._lists[-1] = (kind, count + 1)
+                self._write(f"{indent}{count + 1}. ")
+            else:
+                self._write(f"{indent}- ")
+        elif tag == "a":
+            href = attributes.get("href")
+            if href and not href.startswith(("javascript:", "#")):
+                self._links.append(href)
+                self._write("[")
+            else:
+                self._links.append(None)
+        elif tag == "img":
+            src = attributes.get("src")
+            if src and not src.startswith("data:"):
+                alt = (attributes.get("alt") or "").replace("]", "")
+                self._write(f"![{alt}]({src})")
+        elif tag == "tr":
+            self._row = []
+        elif tag in ("td", "th"):
+            self._cell = []
+
+    def handle_endtag(self, tag: str) -> None:
+        self._close(tag)
+
+    def _end(self, tag: str) -> None:
+        """Write the Markdown that closes ``tag``."""
+        if tag == "title":
+            self._in_title = False
+            self.title = (
+                _WHITESPACE.sub(" ", "".join(self._title_parts)).strip() or None
+            )
+        elif tag in _HEADINGS or tag in ("p", "div", "section", "article", "main"):
+            self._newline(2)
+        elif tag in _BLOCK_TAGS and tag not in ("tr", "table"):
+            self._newline(1)
+        elif tag in ("strong", "b"):
+            self._write("**")
+        elif tag in ("em", "i"):
+            self._write("*")
+        elif tag == "code" and not self._pre_depth:
+            self._write("`")
+        elif tag == "pre" and self._pre_depth:
+            self._pre_depth -= 1
+            self._newline(1)
+            self._write("```")
+            self._newline(2)
+        elif tag == "blockquote" and self._quotes:
+            start = self._quotes.pop()
+            quoted = "".join(self._out[start:]).strip("\n")
+            del self._out[start:]
+            self._trailing_newlines = 0
+            self._write("\n".join(f"> {line}".rstrip() for line in quoted.split("\n")))
+            self._newline(2)
+        elif tag in ("ul", "ol") and self._lists:
+            self._lists.pop()
+            if not self._lists:
+                self._newline(2)
+        elif tag == "a" and self._links:
+            href = self._links.pop()
+            if href is not None:
+                self._write(f"]({href})")
+        elif tag in ("td", "th") and self._cell is not None:
+            cell = _WHITESPACE.sub(" ", "".join(self._cell)).strip().replace("|", "\\|")
+            self._cell = None
+            if self._row is not None:
+                self._row.append(cell)
+        elif tag == "tr" and self._row is not None:
+            row, self._row = self._row, None
+            if row:
+                self._newline(1)
+                self._write("| " + " | ".join(row) + " |")
+                if not self._header_row_done:
+                    self._newline(1)
+                    self._write("|" + " --- |" * len(row))
+                    self._header_row_done = True
+        elif tag == "table":
+            self._header_row_done = False
+            self._newline(2)
+
+    def handle_startendtag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self._close(tag)
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self._title_parts.append(data)
+            return
+        if self._skip_depth:
+            return
+        if self._pre_depth:
+            self._write(data)
+            return
+        text = _WHITESPACE.sub(" ", data)
+        if not text.strip():
+            if text and self._out and not self._out[-1].endswith((" ", "\n")):
+                self._write(" ")
+            return
+        if self._out and self._out[-1].endswith("\n"):
+            text = text.lstrip()
+        self._write(text)
+
+    def _handle_meta(self, attributes: Dict[str, Optional[str]]) -> None:
+        name = (attributes.get("name") or attributes.get("property") or "").lower()
+        if name in ("description", "og:description") and self.description is None:
+            content = attributes.get("content")
+            self.description = content.strip() if content else None
+
+    def _content(self) -> str:
+        if self.main_content and self._regions:
+            mains = [r for r in self._regions if r[0] == "main"]
+            if mains:
+                return "".join("".join(self._out[s:e]) for _, s, e in mains)
+            _, start, end = max(
+                self._regions, key=lambda r: sum(len(t) for t in self._out[r[1] : r[2]])
+            )
+            return "".join(self._out[start:end])
+        return "".join(self._out)
+
+    def markdown(self) -> str:
+        """Return the Markdown produced so far."""
+        lines = self._content().split("\n")
+        # Keep the two trailing spaces of hard line breaks only.
+        text = "\n".join(
+            line if line.endswith("  ") and line.strip() else line.rstrip()
+            for line in lines
+        )
+        return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def html_to_markdown(
+    html: str, remove_boilerplate: bool = False, main_content: bool = False
+) -> str:
+    """Convert an HTML document or fragment to Markdown."""
+    converter = MarkdownConverter(
+        remove_boilerplate=remove_boilerplate, main_content=main_content
+    )
+    converter.feed(html)
+    converter.close()
+    return converter.markdown()
+
+
+def _convert(args: Tuple[str, bool, bool]) -> str:
+    return html_to_markdown(*args)
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared pool of ``workers`` processes, starting it if needed.
+
+    Workers are spawned, not forked: conversions are started from worker
+    threads (the async loader runs them in ``asyncio.to_thread``), and forking
+    a multi-threaded process can leave locks held in the child.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return pool
+
+
+def convert_many(
+    documents: Sequence[str],
+    remove_boilerplate: bool = False,
+    main_content: bool = False,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """Convert many HTML documents, using a process pool for large batches.
+
+    Conversion is CPU-bound, so bulk crawls are spread over ``max_workers``
+    processes (one per CPU by default); small batches run in-process. The
+    pool is kept for later batches of the same size.
+    """
+    jobs = [(html, remove_boilerplate, main_content) for html in documents]
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < _POOL_THRESHOLD:
+        return [_convert(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    pool = _pool(workers)
+    try:
+        return list(pool.map(_convert, jobs, chunksize=chunksize))
+    except BrokenProcessPool:
+        with _pools_lock:
+            if _pools.get(workers) is pool:
+                del _pools[workers]
+        raise
+
+
+def add_markdown(pages: Iterable[Any], **options: Any) -> List[Any]:
+    """Fill in ``markdown`` from ``html`` on scraped or crawled pages lacking it.
+
+    Works on ``ScrapeJobData``, ``CrawledPage`` and any object with ``html``
+    and ``markdown`` attributes. ``options`` are passed to
+    :func:`convert_many`. The pages are updated in place and returned.
+    """
+    pages = list(pages)
+    pending = [page for page in pages if page.html and not page.markdown]
+    for page, markdown in zip(
+        pending, convert_many([page.html for page in pending], **options)
+    ):
+        page.markdown = markdown
+    return pages
@@ -1,13 +1,10 @@
 """Hyperbrowser browser use tool."""
 
-from typing import Optional, Dict, Any
-from langchain_core.tools import BaseTool
-from hyperbrowser import Hyperbrowser, AsyncHyperbrowser
+from typing import Optional, Any
 from hyperbrowser.models import (
     StartCuaTaskParams,
-    CreateSessionParams,
 )
-from pydantic import BaseModel, Field, SecretStr, model_validator
+from pydantic import BaseModel, Field, field_validator
 
 from langchain_core.callbacks import (
     CallbackManagerForToolRun,
@@ -15,7 +12,9 @@ from langchain_core.callbacks import (
 
 from langchain_hyperbrowser.common import SimpleSessionParams
 
-from ._utilities import initialize_client
+from ._base import HyperbrowserBaseTool
+from .profiling import phase
+from .trajectory import TrajectoryReplayer, as_replayer
 
 
 class OpenAICUAArgs(BaseModel):
@@ -24,7 +23,7 @@ class OpenAICUAArgs(BaseModel):
     session_options: Optional[SimpleSessionParams] = Field(default=None)
 
 
-class HyperbrowserOpenAICUATool(BaseTool):
+class HyperbrowserOpenAICUATool(HyperbrowserBaseTool):
     """Tool for executing tasks using a browser agent."""
 
     name: str = "hyperbrowser_browser_use"
@@ -34,17 +33,18 @@ class HyperbrowserOpenAICUATool(BaseTool):
     Provide a task description and optionally configure the agent's behavior.
     Returns the task result and metadata."""
     )
-    client: Hyperbrowser = Field(default=None)  # type: ignore
-    async_client: AsyncHyperbrowser = Field(default=None)  # type: ignore
-    api_key: SecretStr = Field(default=None)  # type: ignore
     args_schema: type[OpenAICUAArgs] = OpenAICUAArgs
+    trajectories: Optional[TrajectoryReplayer] = Field(
+        default=None,
+        description=(
+            "Record the actions of successful tasks and replay them on later "
+            "runs of the same task with different inputs, falling back to the "
+            "agent when replay diverges. Accepts a TrajectoryReplayer, a "
+            "trajectory database path or True"
+        ),
+    )
 
-    @model_validator(mode="before")
-    @classmethod
-    def validate_environment(cls, values: Dict) -> Any:
-        """Validate the environment."""
-        values = initialize_client(values)
-        return values
+    _build_trajectories = field_validator("trajectories", mode="before")(as_replayer)
 
     def _run(
         self,
@@ -52,7 +52,7 @@ class HyperbrowserOpenAICUATool(BaseTool):
         max_steps: Optional[int] = None,
         session_options: Optional[SimpleSessionParams] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> Dict[str, Any]:
+    ) -> Any:
         """Execute a task using OpenAI CUA agent.
 
         Args:
@@ -65,27 +65,31 @@ class HyperbrowserOpenAICUATool(BaseTool):
         """
 
         # Create browser use task parameters
-        task_params = StartCuaTaskParams(
-            task=task,
-            max_steps=max_steps,
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options is not None
-                else None
-            ),
-        )
+        with phase("params"):
+            task_params = StartCuaTaskParams(
+                task=task,
+                max_steps=max_steps,
+                session_options=self._session_params(session_options),
+            )
 
         # Start and wait for browser use task
-        response = self.client.agents.cua.start_and_wait(task_params)
-        return {
+        with self._job_slot():
+            client = self._get_client()
+            agent = client.agents.cua
+            if self.trajectories is not None:
+                response = self.trajectories.run(
+                    task_params,
+                    lambda params: self._jobs.run(agent, params),
+                    client.sessions,
+                    "cua",
+                )
+            else:
+                response = self._jobs.run(agent, task_params)
+        result = {
             "data": response.data.final_result if response.data is not None else None,
             "error": response.error,
         }
+        return self._format_result(result)
 
     async def _arun(
         self,
@@ -93,7 +97,7 @@ class HyperbrowserOpenAICUATool(BaseTool):
         max_steps: Optional[int] = None,
         session_options: Optional[SimpleSessionParams] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> Dict[str, Any]:
+    ) -> Any:
         """Execute a task using OpenAI CUA agent.
 
         Args:
@@ -106,25 +110,29 @@ class HyperbrowserOpenAICUATool(BaseTool):
         """
 
         # Create browser use task parameters
-        task_params = StartCuaTaskParams(
-            task=task,
-            max_steps=max_steps,
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options is not None
-                else None
-            ),
-        )
+        with phase("params"):
+            task_params = StartCuaTaskParams(
+                task=task,
+                max_steps=max_steps,
+                session_options=self._session_params(session_options),
+            )
 
         # Start and wait for browser use task
-        response = await self.async_client.agents.cua.start_and_wait(task_params)
+        async with self._ajob_slot():
+            client = self._get_async_client()
+            agent = client.agents.cua
+            if self.trajectories is not None:
+                response = await self.trajectories.arun(
+                    task_params,
+                    lambda params: self._jobs.arun(agent, params),
+                    client.sessions,
+                    "cua",
+                )
+            else:
+                response = await self._jobs.arun(agent, task_params)
 
-        return {
+        result = {
             "data": response.data.final_result if response.data is not None else None,
             "error": response.error,
         }
+        return self._format_result(result)
@@ -0,0 +1,142 @@
+"""Compact encoding of tool results for the message history."""
+
+import json
+from typing import Any, Collection, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# Per-page content formats a scrape can return. Formats that were not
+# requested are dropped from compact output.
+SCRAPE_FORMATS = frozenset({"html", "markdown", "links", "screenshot"})
+
+
+class OutputOptions(BaseModel):
+    """How a tool encodes its result.
+
+    When set on a tool, the result is returned as a compact JSON string
+    instead of a dict of response objects: empty values are dropped and
+    ``fields`` selects what is kept.
+    """
+
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Dotted paths to keep, e.g. 'data.markdown' or 'data.metadata.title'; "
+            "list items are matched element-wise. Everything is kept when unset"
+        ),
+    )
+    drop_empty: bool = Field(
+        default=True, description="Drop None, empty strings and empty containers"
+    )
+    max_chars: Optional[int] = Field(
+        default=None, ge=1, description="Truncate string values to this length"
+    )
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        value = value.model_dump(exclude_none=True)
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and len(value) == 0)
+
+
+def _omit_page_keys(value: Any, omit: Collection[str]) -> Any:
+    """Drop ``omit`` keys from the page objects held in a result's ``data``."""
+    if not omit or not isinstance(value, dict) or "data" not in value:
+        return value
+
+    def page(item: Any) -> Any:
+        if not isinstance(item, dict):
+            return item
+        return {key: field for key, field in item.items() if key not in omit}
+
+    data = value["data"]
+    data = [page(item) for item in data] if isinstance(data, list) else page(data)
+    return {**value, "data": data}
+
+
+def _prune(value: Any, options: OutputOptions) -> Any:
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            item = _prune(item, options)
+            if options.drop_empty and _is_empty(item):
+                continue
+            pruned[key] = item
+        return pruned
+    if isinstance(value, list):
+        items = [_prune(item, options) for item in value]
+        if options.drop_empty:
+            items = [item for item in items if not _is_empty(item)]
+        return items
+    if (
+        isinstance(value, str)
+        and options.max_chars is not None
+        and len(value) > options.max_chars
+    ):
+        return value[: options.max_chars]
+    return value
+
+
+def _field_tree(fields: List[str]) -> Dict[str, Any]:
+    tree: Dict[str, Any] = {}
+    for path in fields:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _project(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: _project(value[key], subtree)
+            for key, subtree in tree.items()
+            if key in value
+        }
+    return value
+
+
+def compact_output(
+    result: Any, options: OutputOptions, omit: Collection[str] = ()
+) -> Any:
+    """Reduce a tool result to plain data following ``options``.
+
+    ``omit`` names keys dropped from the pages in the result's ``data``, such
+    as scrape formats that were not requested. Keys of the same name deeper
+    down, e.g. in page metadata, are kept.
+    """
+    value = _omit_page_keys(_to_plain(result), omit)
+    if options.fields:
+        value = _project(value, _field_tree(options.fields))
+    return _prune(value, options)
+
+
+def dumps(value: Any) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+    return orjson.dumps(value, default=str).decode()
+
+
+def encode_output(
+    result: Any, options: OutputOptions, omit: Collection[str] = ()
+) -> str:
+    """Encode a tool result as a compact JSON string."""
+    return dumps(compact_output(result, options, omit))
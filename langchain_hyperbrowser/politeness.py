@@ -0,0 +1,358 @@
+"""Per-domain politeness scheduling for multi-URL loads."""
+
+import asyncio
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel, Field
+
+RobotsFetcher = Callable[[str], Optional[str]]
+
+_RATE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class PolitenessPolicy(BaseModel):
+    """Limits applied to every host while loading many URLs concurrently."""
+
+    per_host_concurrency: int = Field(
+        default=2, ge=1, description="Maximum in-flight jobs for a single host"
+    )
+    per_host_delay: float = Field(
+        default=0.0,
+        ge=0,
+        description="Minimum number of seconds between job starts on the same host",
+    )
+    respect_robots_txt: bool = Field(
+        default=True,
+        description="Honor Crawl-delay and Request-rate hints from robots.txt",
+    )
+    robots_user_agent: str = Field(
+        default="*", description="User agent used to look up robots.txt hints"
+    )
+    robots_timeout: float = Field(
+        default=5.0, gt=0, description="Timeout in seconds for fetching robots.txt"
+    )
+    max_crawl_delay: float = Field(
+        default=30.0,
+        ge=0,
+        description="Upper bound applied to delays advertised by robots.txt",
+    )
+
+
+def host_key(url: str) -> str:
+    """Return the scheduling key (host and port) for a URL."""
+    return urlsplit(url).netloc.lower()
+
+
+def fetch_robots_txt(url: str, timeout: float = 5.0) -> Optional[str]:
+    """Fetch a robots.txt file, returning None when it is missing or unreachable."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.read().decode("utf-8", errors="replace")
+    except Exception:
+        return None
+
+
+def parse_crawl_delay(robots_txt: str, user_agent: str = "*") -> Optional[float]:
+    """Extract the delay hint for ``user_agent`` from robots.txt content.
+
+    ``Crawl-delay`` takes precedence over ``Request-rate``. Unlike
+    :class:`urllib.robotparser.RobotFileParser`, fractional delays are kept.
+    """
+    groups: List[Tuple[List[str], Dict[str, str]]] = []
+    agents: List[str] = []
+    rules: Dict[str, str] = {}
+    for raw_line in robots_txt.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        field, value = (part.strip() for part in line.split(":", 1))
+        field = field.lower()
+        if field == "user-agent":
+            if rules:
+                groups.append((agents, rules))
+                agents, rules = [], {}
+            agents.append(value.lower())
+        elif agents:
+            rules.setdefault(field, value)
+    if agents:
+        groups.append((agents, rules))
+
+    name = user_agent.lower()
+    default_rules: Optional[Dict[str, str]] = None
+    for group_agents, group_rules in groups:
+        if any(agent != "*" and agent in name for agent in group_agents):
+            return _delay_from_rules(group_rules)
+        if "*" in group_agents and default_rules is None:
+            default_rules = group_rules
+    return _delay_from_rules(default_rules) if default_rules is not None else None
+
+
+def _delay_from_rules(rules: Dict[str, str]) -> Optional[float]:
+    try:
+        if "crawl-delay" in rules:
+            return float(rules["crawl-delay"])
+        if "request-rate" in rules:
+            requests, period = rules["request-rate"].split()[0].split("/", 1)
+            unit = _RATE_UNITS.get(period[-1:].lower(), 1)
+            if int(requests) > 0:
+                return float(period.rstrip("smhdSMHD")) * unit / int(requests)
+    except ValueError:
+        pass
+    return None
+
+
+class _HostState:
+    __slots__ = ("pending", "in_flight", "next_start", "delay", "ready")
+
+    def __init__(self, delay: float, ready: bool):
+        self.pending: Deque[str] = deque()
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.delay = delay
+        self.ready = ready
+
+
+class DomainScheduler:
+    """Run a function over many URLs while bounding the load put on each host.
+
+    URLs are grouped by host and dispatched round-robin across hosts, so a list
+    dominated by a few domains is interleaved with the long tail instead of
+    hammering the same site back to back. Global concurrency is capped by
+    ``max_concurrency`` while every host is additionally limited to
+    ``policy.per_host_concurrency`` in-flight jobs and a minimum delay between
+    job starts, taken from the policy or from the host's robots.txt hints.
+
+    ``urls`` may be a lazy iterator, such as URLs streamed from sitemaps. It is
+    read while jobs run, keeping at most ``lookahead`` URLs queued; sequences
+    are queued in full.
+
+    Results are yielded as ``(url, result)`` pairs in completion order.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        max_concurrency: int = 4,
+        policy: Optional[PolitenessPolicy] = None,
+        robots_fetcher: Optional[RobotsFetcher] = None,
+        clock: Callable[[], float] = time.monotonic,
+        lookahead: int = 1000,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.lookahead = lookahead
+        self.policy = policy or PolitenessPolicy()
+        self._robots_fetcher = robots_fetcher or (
+            lambda url: fetch_robots_txt(url, timeout=self.policy.robots_timeout)
+        )
+        self._clock = clock
+        self._robots_urls: Dict[str, str] = {}
+        self._hosts: Dict[str, _HostState] = {}
+        self._ring: Deque[str] = deque()
+        self._queued = 0
+        # Hosts whose robots.txt has not been requested yet.
+        self._unresolved: List[str] = []
+        self._source: Optional[Iterator[str]] = None
+
+        if isinstance(urls, Sequence):
+            for url in urls:
+                self._add(url)
+        else:
+            self._source = iter(urls)
+
+    def _add(self, url: str) -> None:
+        key = host_key(url)
+        state = self._hosts.get(key)
+        if state is None:
+            state = _HostState(
+                delay=self.policy.per_host_delay,
+                ready=not self.policy.respect_robots_txt,
+            )
+            self._hosts[key] = state
+            if self.policy.respect_robots_txt:
+                parts = urlsplit(url)
+                self._robots_urls[key] = f"{parts.scheme}://{parts.netloc}/robots.txt"
+                self._unresolved.append(key)
+        if not state.pending:
+            self._ring.append(key)
+        state.pending.append(url)
+        self._queued += 1
+
+    def _needs_fill(self) -> bool:
+        return self._source is not None and self._queued <= self.lookahead // 2
+
+    def _fill(self) -> None:
+        """Read URLs from a lazy source until ``lookahead`` are queued."""
+        while self._source is not None and self._queued < self.lookahead:
+            url = next(self._source, None)
+            if url is None:
+                self._source = None
+            else:
+                self._add(url)
+
+    def _take_unresolved(self) -> List[str]:
+        keys, self._unresolved = self._unresolved, []
+        return keys
+
+    def _host_delay(self, key: str) -> float:
+        """Resolve the delay for a host, combining the policy and robots.txt."""
+        delay = self.policy.per_host_delay
+        try:
+            robots_txt = self._robots_fetcher(self._robots_urls[key])
+        except Exception:
+            robots_txt = None
+        if robots_txt:
+            hint = parse_crawl_delay(robots_txt, self.policy.robots_user_agent)
+            if hint is not None:
+                delay = max(delay, min(hint, self.policy.max_crawl_delay))
+        return delay
+
+    def _set_delay(self, key: str, delay: float) -> None:
+        state = self._hosts[key]
+        state.delay = delay
+        state.ready = True
+
+    def _pop_ready(self, now: float) -> Optional[str]:
+        """Take the next dispatchable URL, rotating through hosts round-robin."""
+        for _ in range(len(self._ring)):
+            key = self._ring[0]
+            state = self._hosts[key]
+            self._ring.rotate(-1)
+            if (
+                state.ready
+                and state.in_flight < self.policy.per_host_concurrency
+                and now >= state.next_start
+            ):
+                state.in_flight += 1
+                state.next_start = now + state.delay
+                self._queued -= 1
+                url = state.pending.popleft()
+                if not state.pending:
+                    # Rotated to the back above; re-added when URLs arrive.
+                    self._ring.pop()
+                return url
+        return None
+
+    def _release(self, url: str) -> None:
+        self._hosts[host_key(url)].in_flight -= 1
+
+    def _next_wakeup(self, now: float) -> Optional[float]:
+        """Seconds until a host that is only blocked by its delay becomes ready."""
+        waits = [
+            state.next_start - now
+            for state in self._hosts.values()
+            if state.pending
+            and state.ready
+            and state.in_flight < self.policy.per_host_concurrency
+        ]
+        if not waits:
+            return None
+        return max(min(waits), 0.0)
+
+    def _has_pending(self) -> bool:
+        return self._queued > 0 or self._source is not None
+
+    def map(self, fn: Callable[[str], Any]) -> Iterator[Tuple[str, Any]]:
+        """Apply ``fn`` to every URL using a thread pool."""
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        robots_pool = ThreadPoolExecutor(max_workers=8)
+        jobs: Dict[Future, str] = {}
+        robots: Dict[Future, str] = {}
+        try:
+            while self._has_pending() or jobs:
+                if self._needs_fill():
+                    self._fill()
+                for key in self._take_unresolved():
+                    robots[robots_pool.submit(self._host_delay, key)] = key
+                while len(jobs) < self.max_concurrency:
+                    url = self._pop_ready(self._clock())
+                    if url is None:
+                        break
+                    jobs[pool.submit(fn, url)] = url
+
+                waiting: List[Future] = [*jobs, *robots]
+                timeout = (
+                    self._next_wakeup(self._clock())
+                    if len(jobs) < self.max_concurrency
+                    else None
+                )
+                if not waiting:
+                    time.sleep(timeout or 0.0)
+                    continue
+                done, _ = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in robots:
+                        self._set_delay(robots.pop(future), future.result())
+                    else:
+                        url = jobs.pop(future)
+                        self._release(url)
+                        yield url, future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            robots_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def amap(
+        self, fn: Callable[[str], Awaitable[Any]]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Apply the coroutine function ``fn`` to every URL."""
+        jobs: Dict[asyncio.Task, str] = {}
+        robots: Dict[asyncio.Task, str] = {}
+        try:
+            while self._has_pending() or jobs:
+                if self._needs_fill():
+                    # The source may do blocking I/O, e.g. fetching sitemaps.
+                    await asyncio.to_thread(self._fill)
+                for key in self._take_unresolved():
+                    task = asyncio.ensure_future(
+                        asyncio.to_thread(self._host_delay, key)
+                    )
+                    robots[task] = key
+                while len(jobs) < self.max_concurrency:
+                    url = self._pop_ready(self._clock())
+                    if url is None:
+                        break
+                    jobs[asyncio.ensure_future(fn(url))] = url
+
+                waiting = {*jobs, *robots}
+                timeout = (
+                    self._next_wakeup(self._clock())
+                    if len(jobs) < self.max_concurrency
+                    else None
+                )
+                if not waiting:
+                    await asyncio.sleep(timeout or 0.0)
+                    continue
+                done, _ = await asyncio.wait(
+                    waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task in robots:
+                        self._set_delay(robots.pop(task), task.result())
+                    else:
+                        url = jobs.pop(task)
+                        self._release(url)
+                        yield url, task.result()
+        finally:
+            for task in [*jobs, *robots]:
+                task.cancel()
@@ -0,0 +1,369 @@
+"""Cheap HTTP pre-flight checks that weed out URLs before a browser job."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    import httpx
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Extensions that are never worth a browser job, skipped without a request.
+ASSET_EXTENSIONS = frozenset(
+    {
+        ".7z", ".avi", ".bmp", ".css", ".csv", ".doc", ".docx", ".exe", ".gif",
+        ".gz", ".ico", ".jpeg", ".jpg", ".js", ".json", ".mov", ".mp3", ".mp4",
+        ".pdf", ".png", ".ppt", ".pptx", ".rar", ".svg", ".tar", ".tgz", ".wav",
+        ".webm", ".webp", ".woff", ".woff2", ".xls", ".xlsx", ".xml", ".zip",
+    }
+)  # fmt: skip
+
+
+class PrefilterOptions(BaseModel):
+    """Settings for probing URLs before they are scraped."""
+
+    concurrency: int = Field(default=16, ge=1, description="Concurrent probes")
+    timeout: float = Field(default=10.0, gt=0, description="Timeout per probe")
+    allowed_content_types: List[str] = Field(
+        default=["text/html", "application/xhtml+xml"],
+        description="Content types worth scraping; others are skipped",
+    )
+    dead_statuses: List[int] = Field(
+        default=[404, 410],
+        description=(
+            "Statuses treated as dead links. Other errors (403, 429, 5xx) often "
+            "come from bot protection a browser gets past, so those URLs are kept"
+        ),
+    )
+    keep_unreachable: bool = Field(
+        default=True, description="Keep URLs whose probe failed to connect"
+    )
+    skip_unchanged: bool = Field(
+        default=False,
+        description=(
+            "Skip URLs whose ETag or Last-Modified matches the previous probe, or "
+            "that were probed within cache_ttl"
+        ),
+    )
+    cache_ttl: float = Field(
+        default=3600.0, ge=0, description="Seconds a probe result is reused"
+    )
+    cache_path: Optional[str] = Field(
+        default=None,
+        description="JSON file persisting probe results across runs",
+    )
+    user_agent: str = Field(
+        default="Mozilla/5.0 (compatible; langchain-hyperbrowser prefilter)",
+        description="User-Agent sent with probes",
+    )
+
+
+class ProbeResult(BaseModel):
+    url: str
+    final_url: str
+    status: Optional[int] = None
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+    checked_at: float = Field(default_factory=time.time)
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize scheme and host case, default ports, empty paths and fragments."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port is not None and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += f":{parts.password}"
+        host = f"{userinfo}@{host}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def _is_asset(url: str) -> bool:
+    path = urlsplit(url).path.lower()
+    return os.path.splitext(path)[1] in ASSET_EXTENSIONS
+
+
+class ProbeCache:
+    """Thread-safe probe results by URL, optionally persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._results: Dict[str, ProbeResult] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for url, result in json.load(f).items():
+                    self._results[url] = ProbeResult(**result)
+
+    def get(self, url: str) -> Optional[ProbeResult]:
+        with self._lock:
+            return self._results.get(url)
+
+    def put(self, result: ProbeResult) -> None:
+        with self._lock:
+            self._results[result.url] = result
+
+    def save(self) -> None:
+        """Write the cache to ``path``, if one is configured."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {url: r.model_dump() for url, r in self._results.items()}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+class URLPrefilter:
+    """Probe URLs with HEAD (or header-only GET) requests and keep the survivors.
+
+    URLs pointing at known asset extensions are dropped without a request.
+    The rest are probed concurrently over a pooled HTTP client, following
+    redirects. A URL is skipped when its probe shows a dead link, a non-HTML
+    content type, or (with ``skip_unchanged``) unchanged validators; redirect
+    targets are canonicalized and duplicates removed. Survivors are returned
+    as their canonical final URLs, in input order. Reasons for skipped URLs
+    are kept in :attr:`skipped`.
+
+    Probe results for survivors are staged, not cached: call :meth:`commit`
+    once a survivor has been scraped, and :meth:`save` to persist the cache.
+    A URL whose scrape failed is therefore probed and fetched again next run.
+
+    ``transport`` is passed to the underlying httpx clients, e.g. to route
+    probes through a proxy transport.
+    """
+
+    def __init__(
+        self,
+        options: Optional[PrefilterOptions] = None,
+        transport: Optional[Any] = None,
+    ):
+        self.options = options or PrefilterOptions()
+        self.transport = transport
+        self.cache = ProbeCache(self.options.cache_path)
+        self.skipped: Dict[str, str] = {}
+        self._staged: Dict[str, List[ProbeResult]] = {}
+        self._client: Optional["httpx.Client"] = None
+        self._lock = threading.Lock()
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        import httpx
+
+        kwargs: Dict[str, Any] = {
+            "timeout": self.options.timeout,
+            "follow_redirects": True,
+            "headers": {"User-Agent": self.options.user_agent},
+            "limits": httpx.Limits(max_connections=self.options.concurrency),
+        }
+        if self.transport is not None:
+            kwargs["transport"] = self.transport
+        return kwargs
+
+    def _get_client(self) -> "httpx.Client":
+        with self._lock:
+            if self._client is None:
+                import httpx
+
+                self._client = httpx.Client(**self._client_kwargs())
+            return self._client
+
+    def close(self) -> None:
+        """Close the pooled HTTP client."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def _fresh(self, cached: ProbeResult) -> bool:
+        return (
+            cached.error is None
+            and time.time() - cached.checked_at < self.options.cache_ttl
+        )
+
+    def _conditional_headers(self, cached: Optional[ProbeResult]) -> Dict[str, str]:
+        headers = {}
+        if cached is not None and self.options.skip_unchanged:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def _needs_get(self, response: "httpx.Response") -> bool:
+        """HEAD is often rejected or answered without headers; retry with GET."""
+        status = response.status_code
+        if status == 304 or status in self.options.dead_statuses:
+            return False
+        return status >= 400 or "content-type" not in response.headers
+
+    @staticmethod
+    def _result(url: str, response: "httpx.Response") -> ProbeResult:
+        content_type = response.headers.get("content-type")
+        return ProbeResult(
+            url=url,
+            final_url=str(response.url),
+            status=response.status_code,
+            content_type=(
+                content_type.split(";", 1)[0].strip().lower() if content_type else None
+            ),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+    def _verdict(
+        self, result: ProbeResult, previous: Optional[ProbeResult], reused: bool
+    ) -> Optional[str]:
+        """Return why ``result`` should be skipped, or None to keep it."""
+        if result.error is not None:
+            return None if self.options.keep_unreachable else "unreachable"
+        if result.status == 304:
+            return "unchanged"
+        if result.status in self.options.dead_statuses:
+            return "dead"
+        if result.content_type and not any(
+            result.content_type.startswith(allowed)
+            for allowed in self.options.allowed_content_types
+        ):
+            return "non-html"
+        if self.options.skip_unchanged and previous is not None:
+            if reused:
+                return "unchanged"
+            if (result.etag and result.etag == previous.etag) or (
+                result.last_modified and result.last_modified == previous.last_modified
+            ):
+                return "unchanged"
+        return None
+
+    def _settle(
+        self, url: str, result: ProbeResult, previous: Optional[ProbeResult]
+    ) -> ProbeResult:
+        if result.status == 304 and previous is not None:
+            # Not modified: keep the previous validators and final URL.
+            result = previous.model_copy(update={"checked_at": result.checked_at})
+        return result
+
+    def probe(self, url: str) -> Tuple[ProbeResult, Optional[str]]:
+        """Probe one URL and return the result with the reason to skip it."""
+        previous = self.cache.get(url)
+        if previous is not None and self._fresh(previous):
+            return previous, self._verdict(previous, previous, reused=True)
+        client = self._get_client()
+        headers = self._conditional_headers(previous)
+        try:
+            response = client.head(url, headers=headers)
+            if self._needs_get(response):
+                with client.stream("GET", url, headers=headers) as response:
+                    pass
+            result = self._result(url, response)
+        except Exception as e:
+            result = ProbeResult(url=url, final_url=url, error=str(e) or repr(e))
+        result = self._settle(url, result, previous)
+        return result, self._verdict(result, previous, reused=False)
+
+    async def aprobe(
+        self, client: "httpx.AsyncClient", url: str
+    ) -> Tuple[ProbeResult, Optional[str]]:
+        """Asynchronously probe one URL with ``client``."""
+        previous = self.cache.get(url)
+        if previous is not None and self._fresh(previous):
+            return previous, self._verdict(previous, previous, reused=True)
+        headers = self._conditional_headers(previous)
+        try:
+            response = await client.head(url, headers=headers)
+            if self._needs_get(response):
+                async with client.stream("GET", url, headers=headers) as response:
+                    pass
+            result = self._result(url, response)
+        except Exception as e:
+            result = ProbeResult(url=url, final_url=url, error=str(e) or repr(e))
+        result = self._settle(url, result, previous)
+        return result, self._verdict(result, previous, reused=False)
+
+    def _survivors(
+        self,
+        urls: Sequence[str],
+        probed: Dict[str, Tuple[ProbeResult, Optional[str]]],
+    ) -> List[str]:
+        survivors = []
+        staged: Dict[str, List[ProbeResult]] = {}
+        for url in urls:
+            if url in self.skipped:
+                continue
+            result, reason = probed[url]
+            canonical = canonicalize_url(result.final_url)
+            if reason is None and canonical in staged:
+                reason = "duplicate"
+            if reason is None:
+                staged[canonical] = [result]
+                survivors.append(canonical)
+            elif reason == "duplicate":
+                staged[canonical].append(result)
+                self.skipped[url] = reason
+            else:
+                self.cache.put(result)
+                self.skipped[url] = reason
+        with self._lock:
+            self._staged.update(staged)
+        self.cache.save()
+        return survivors
+
+    def commit(self, url: str) -> None:
+        """Cache the staged probe results of a survivor that was scraped."""
+        with self._lock:
+            results = self._staged.pop(url, [])
+        for result in results:
+            self.cache.put(result)
+
+    def save(self) -> None:
+        """Persist committed probe results to ``cache_path``."""
+        self.cache.save()
+
+    def _candidates(self, urls: Sequence[str]) -> List[str]:
+        self.skipped = {}
+        with self._lock:
+            self._staged = {}
+        candidates = []
+        for url in dict.fromkeys(urls):
+            if _is_asset(url):
+                self.skipped[url] = "non-html"
+            else:
+                candidates.append(url)
+        return candidates
+
+    def filter(self, urls: Sequence[str]) -> List[str]:
+        """Return the URLs worth a browser job."""
+        candidates = self._candidates(urls)
+        with ThreadPoolExecutor(max_workers=self.options.concurrency) as pool:
+            probed = dict(zip(candidates, pool.map(self.probe, candidates)))
+        return self._survivors(urls, probed)
+
+    async def afilter(self, urls: Sequence[str]) -> List[str]:
+        """Asynchronously return the URLs worth a browser job."""
+        import httpx
+
+        candidates = self._candidates(urls)
+        semaphore = asyncio.Semaphore(self.options.concurrency)
+
+        async def probe(url: str) -> Tuple[ProbeResult, Optional[str]]:
+            async with semaphore:
+                return await self.aprobe(client, url)
+
+        async with httpx.AsyncClient(**self._client_kwargs()) as client:
+            results = await asyncio.gather(*(probe(url) for url in candidates))
+        probed = dict(zip(candidates, results))
+        return await asyncio.to_thread(self._survivors, urls, probed)
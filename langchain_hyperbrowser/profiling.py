@@ -0,0 +1,283 @@
+"""Opt-in profiling of tool calls and loader URLs, broken down into phases."""
+
+import asyncio
+import functools
+import json
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# SDK manager methods that are timed, and the phase each one is recorded as.
+# ``start_and_wait`` calls these through ``self``, so the time left over in
+# the surrounding "job" phase is spent in polling sleeps.
+_MANAGER_PHASES = {"start": "start", "get_status": "poll", "get": "fetch"}
+_MANAGER_PATHS = (
+    ("scrape",),
+    ("scrape", "batch"),
+    ("crawl",),
+    ("extract",),
+    ("agents", "browser_use"),
+    ("agents", "cua"),
+    ("agents", "claude_computer_use"),
+)
+
+# Histogram bucket upper bounds in seconds: 1ms doubling up to about 17min.
+_BUCKETS = tuple(0.001 * 2**i for i in range(21))
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total", "min", "max", "allocations")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.allocations = 0
+
+    def add(self, seconds: float, allocations: int) -> None:
+        index = 0
+        while index < len(_BUCKETS) and seconds > _BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.allocations += allocations
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return _BUCKETS[index] if index < len(_BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "allocations": self.allocations,
+            "buckets": {
+                (f"le_{_BUCKETS[i]:g}" if i < len(_BUCKETS) else "inf"): count
+                for i, count in enumerate(self.counts)
+                if count
+            },
+        }
+
+
+class _Phase:
+    """Time and allocated blocks spent in one phase path of a call."""
+
+    __slots__ = ("seconds", "allocations")
+
+    def __init__(self, seconds: float = 0.0, allocations: int = 0):
+        self.seconds = seconds
+        self.allocations = allocations
+
+
+class _Call:
+    """Phase timings of one profiled call, keyed by phase path."""
+
+    __slots__ = ("name", "lock", "phases", "track_allocations")
+
+    def __init__(self, name: str, track_allocations: bool):
+        self.name = name
+        # Phases may finish in worker threads running a copy of the context.
+        self.lock = threading.Lock()
+        self.phases: Dict[Tuple[str, ...], _Phase] = {}
+        self.track_allocations = track_allocations
+
+
+_active: ContextVar[Optional[_Call]] = ContextVar("hyperbrowser_profile", default=None)
+# Phase path within the active call; per context, so threads keep their own.
+_path: ContextVar[Tuple[str, ...]] = ContextVar("hyperbrowser_phase", default=())
+
+
+def _allocated_blocks(call: _Call) -> int:
+    return sys.getallocatedblocks() if call.track_allocations else 0
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a phase of the profiled call in progress; a no-op outside one."""
+    call = _active.get()
+    if call is None:
+        yield
+        return
+    path = _path.get() + (name,)
+    token = _path.set(path)
+    blocks = _allocated_blocks(call)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        allocations = _allocated_blocks(call) - blocks
+        with call.lock:
+            entry = call.phases.setdefault(path, _Phase())
+            entry.seconds += elapsed
+            entry.allocations += allocations
+        _path.reset(token)
+
+
+def _timed(method: Any, name: str) -> Any:
+    if asyncio.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def atimed(*args: Any, **kwargs: Any) -> Any:
+            with phase(name):
+                return await method(*args, **kwargs)
+
+        return atimed
+
+    @functools.wraps(method)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        with phase(name):
+            return method(*args, **kwargs)
+
+    return timed
+
+
+_instrumented_lock = threading.Lock()
+
+
+def instrument_client(client: Any) -> Any:
+    """Time the HTTP calls a Hyperbrowser client's job managers make.
+
+    The managers' ``start``, ``get_status`` and ``get`` methods are wrapped
+    in place, so ``start_and_wait`` reports "start", "poll" and "fetch"
+    phases. Instrumenting a client twice has no further effect.
+
+    The patch is permanent and process-wide: tools and loaders share one
+    client per API key, so every holder of ``client`` gets the wrappers, now
+    and after the profiled tool is gone. The wrappers only record inside a
+    call profiled with :meth:`Profiler.call` (by any profiler) and otherwise
+    just forward, costing one context variable lookup per HTTP call.
+    """
+    with _instrumented_lock:
+        if getattr(client, "_hyperbrowser_profiled", False) is True:
+            return client
+        for path in _MANAGER_PATHS:
+            manager = client
+            for attribute in path:
+                manager = getattr(manager, attribute, None)
+            if manager is None:
+                continue
+            for method_name, phase_name in _MANAGER_PHASES.items():
+                method = getattr(manager, method_name, None)
+                if method is not None:
+                    setattr(manager, method_name, _timed(method, phase_name))
+        client._hyperbrowser_profiled = True
+    return client
+
+
+class Profiler:
+    """Collect per-phase timings of tool calls and loader URLs.
+
+    Each call is recorded under its name (the tool name, or
+    ``"loader.scrape"`` and ``"loader.crawl"``) with nested phases such as
+    "params" (building SDK request models), "queue" (waiting for a scheduler
+    slot), "job" (the remote job, with "start", "poll" and "fetch" HTTP calls
+    inside it; the rest is polling sleeps), and "result" or "document"
+    (encoding the tool result or building the Document). Timings are
+    aggregated into histograms per phase.
+
+    With ``track_allocations``, the change in the interpreter's allocated
+    block count is recorded per phase too. The count is process-wide, so it
+    is only meaningful while calls are not running concurrently.
+
+    :meth:`to_json` returns the histograms; :meth:`folded` returns the self
+    time of each phase in the folded stack format read by flamegraph.pl,
+    speedscope and similar tools.
+    """
+
+    def __init__(self, track_allocations: bool = False):
+        self.track_allocations = track_allocations
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, ...], _Histogram] = {}
+        self._self_times: Dict[Tuple[str, ...], float] = {}
+
+    @contextmanager
+    def call(self, name: str) -> Iterator[None]:
+        """Profile one call; nested calls are folded into the outer one."""
+        if _active.get() is not None:
+            with phase(name):
+                yield
+            return
+        record = _Call(name, self.track_allocations)
+        token = _active.set(record)
+        path_token = _path.set(())
+        blocks = _allocated_blocks(record)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            allocations = _allocated_blocks(record) - blocks
+            _path.reset(path_token)
+            _active.reset(token)
+            self._add(record, elapsed, allocations)
+
+    def _add(self, record: _Call, elapsed: float, allocations: int) -> None:
+        phases = {(record.name,) + path: entry for path, entry in record.phases.items()}
+        phases[(record.name,)] = _Phase(elapsed, allocations)
+        with self._lock:
+            for path, entry in phases.items():
+                self._histograms.setdefault(path, _Histogram()).add(
+                    entry.seconds, entry.allocations
+                )
+                children = sum(
+                    child_entry.seconds
+                    for child, child_entry in phases.items()
+                    if len(child) == len(path) + 1 and child[:-1] == path
+                )
+                self._self_times[path] = self._self_times.get(path, 0.0) + max(
+                    entry.seconds - children, 0.0
+                )
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._histograms.clear()
+            self._self_times.clear()
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the histograms, keyed by ``call/phase/...`` paths."""
+        with self._lock:
+            return {
+                "/".join(path): histogram.to_dict()
+                for path, histogram in sorted(self._histograms.items())
+            }
+
+    def dump_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, indent=2)
+
+    def folded(self) -> str:
+        """Return folded stacks with self time in microseconds."""
+        with self._lock:
+            lines = [
+                f"{';'.join(path)} {round(seconds * 1e6)}"
+                for path, seconds in sorted(self._self_times.items())
+                if seconds > 0
+            ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def dump_folded(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.folded())
@@ -1,9 +1,12 @@
-from typing import Optional, Union, Dict, Any
-from langchain_core.tools import BaseTool
-from hyperbrowser import Hyperbrowser, AsyncHyperbrowser
-from hyperbrowser.models.scrape import StartScrapeJobParams, ScrapeOptions
-from hyperbrowser.models.session import CreateSessionParams
-from pydantic import BaseModel, Field, SecretStr, model_validator
+import asyncio
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+from hyperbrowser.models.scrape import (
+    ScrapeJobData,
+    ScrapeOptions,
+    StartBatchScrapeJobParams,
+    StartScrapeJobParams,
+)
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
 from langchain_core.callbacks import (
     CallbackManagerForToolRun,
@@ -11,7 +14,13 @@ from langchain_core.callbacks import (
 
 from langchain_hyperbrowser.common import SimpleSessionParams, SimpleScrapeOptions
 
-from ._utilities import initialize_client
+from ._base import HyperbrowserBatchTool
+from .artifacts import ArtifactStore, as_artifact_store, store_screenshot
+from .fastpath import FastPathFetcher, FastPathOptions, needs_browser
+from .hedging import Hedger, as_hedger
+from .output import SCRAPE_FORMATS
+from .profiling import phase
+from .spill import ResultBudget, apply_budget
 
 
 class ScrapeArgs(BaseModel):
@@ -24,24 +33,247 @@ class ScrapeArgs(BaseModel):
     )
 
 
-class HyperbrowserScrapeTool(BaseTool):
+def _options_key(options: Optional[BaseModel]) -> Optional[str]:
+    return options.model_dump_json() if options is not None else None
+
+
+def _scrape_options(
+    scrape_options: Optional[SimpleScrapeOptions],
+) -> Optional[ScrapeOptions]:
+    return ScrapeOptions(formats=scrape_options.formats) if scrape_options else None
+
+
+def _formats(scrape_options: Optional[SimpleScrapeOptions]) -> List[str]:
+    return list(scrape_options.formats) if scrape_options else ["markdown"]
+
+
+def _unrequested_formats(scrape_options: Optional[SimpleScrapeOptions]) -> frozenset:
+    return SCRAPE_FORMATS.difference(_formats(scrape_options))
+
+
+class HyperbrowserScrapeTool(HyperbrowserBatchTool):
     name: str = "hyperbrowser_scrape_data"
     description: str = (
         """Scrape content from a webpage.
     Provide a URL and optionally configure scraping options.
     Returns the scraped content in markdown or HTML format along with metadata."""
     )
-    client: Hyperbrowser = Field(default=None)  # type: ignore
-    async_client: AsyncHyperbrowser = Field(default=None)  # type: ignore
-    api_key: SecretStr = Field(default=None)  # type: ignore
     args_schema: type[ScrapeArgs] = ScrapeArgs
+    max_batch_size: int = Field(
+        default=100, ge=1, description="Maximum URLs per batch scrape job"
+    )
+    result_budget: Optional[ResultBudget] = Field(
+        default=None,
+        description=(
+            "Byte limit on the returned page; larger pages are written to disk "
+            "and returned as a reference with a preview"
+        ),
+    )
+    fast_path: Optional[FastPathFetcher] = Field(
+        default=None,
+        description=(
+            "Fetch static pages over plain HTTP and convert them locally, "
+            "scraping with Hyperbrowser only when a page looks JS-rendered or "
+            "blocked. Accepts FastPathOptions, a dict of them or True"
+        ),
+    )
+
+    hedging: Optional[Hedger] = Field(
+        default=None,
+        description=(
+            "Fire a duplicate scrape job when one runs past the recent latency "
+            "percentile and keep the first result. Accepts HedgingPolicy, a "
+            "dict of it or True"
+        ),
+    )
+
+    artifacts: Optional[ArtifactStore] = Field(
+        default=None,
+        description=(
+            "Store screenshots in a local content-addressed directory and "
+            "return their artifact:// URI instead of the base64 data. Accepts "
+            "an ArtifactStore, a directory path or True"
+        ),
+    )
+
+    _build_hedging = field_validator("hedging", mode="before")(as_hedger)
+    _build_artifacts = field_validator("artifacts", mode="before")(as_artifact_store)
 
-    @model_validator(mode="before")
+    @field_validator("fast_path", mode="before")
     @classmethod
-    def validate_environment(cls, values: Dict) -> Any:
-        """Validate the environment."""
-        values = initialize_client(values)
-        return values
+    def _build_fast_path(cls, value: Any) -> Any:
+        if value is True:
+            return FastPathFetcher()
+        if value is False:
+            return None
+        if isinstance(value, dict):
+            value = FastPathOptions(**value)
+        if isinstance(value, FastPathOptions):
+            return FastPathFetcher(value)
+        return value
+
+    def close(self, timeout: Optional[float] = None, cancel: bool = False) -> bool:
+        drained = super().close(timeout, cancel)
+        if self.fast_path is not None:
+            self.fast_path.close()
+        if self.hedging is not None:
+            self.hedging.close()
+        return drained
+
+    async def aclose(
+        self, timeout: Optional[float] = None, cancel: bool = False
+    ) -> bool:
+        drained = await super().aclose(timeout, cancel)
+        if self.fast_path is not None:
+            await self.fast_path.aclose()
+            self.fast_path.close()
+        if self.hedging is not None:
+            self.hedging.close()
+        return drained
+
+    def _finish(
+        self, result: Dict[str, Any], scrape_options: Optional[SimpleScrapeOptions]
+    ) -> Any:
+        """Store artifacts, then apply the budget and output options to a result."""
+        if self.artifacts is not None and result["data"] is not None:
+            with phase("artifacts"):
+                store_screenshot(result["data"], self.artifacts)
+        if self.result_budget is not None and result["data"] is not None:
+            with phase("budget"):
+                data = apply_budget(
+                    result["data"], self.result_budget, prefix="hyperbrowser-scrape-"
+                )
+            result = {"data": data, "error": result["error"]}
+        return self._format_result(result, _unrequested_formats(scrape_options))
+
+    def _batch_key(self, **kwargs: Any) -> Optional[Hashable]:
+        return (
+            kwargs["url"],
+            _options_key(kwargs.get("scrape_options")),
+            _options_key(kwargs.get("session_options")),
+        )
+
+    def _batch_jobs(
+        self, args: List[Dict[str, Any]]
+    ) -> List[Tuple[StartBatchScrapeJobParams, Tuple[Optional[str], Optional[str]]]]:
+        """Group scrape arguments sharing the same options into batch jobs.
+
+        Arguments that fail validation are left to the per-item call, which
+        reports the error, as are URLs the fast path will try locally. Groups
+        with a single URL are not worth a batch job.
+        """
+        groups: Dict[Tuple[Optional[str], Optional[str]], List[ScrapeArgs]] = {}
+        for tool_args in args:
+            try:
+                parsed = ScrapeArgs.model_validate(tool_args)
+            except ValidationError:
+                continue
+            session_params = self._session_params(parsed.session_options)
+            if (
+                self.fast_path is not None
+                and not needs_browser(session_options=session_params)
+                and self.fast_path.would_try(
+                    parsed.url, _formats(parsed.scrape_options)
+                )
+            ):
+                continue
+            key = (
+                _options_key(parsed.scrape_options),
+                _options_key(parsed.session_options),
+            )
+            group = groups.setdefault(key, [])
+            if all(item.url != parsed.url for item in group):
+                group.append(parsed)
+
+        jobs = []
+        for key, group in groups.items():
+            if len(group) < 2:
+                continue
+            for start in range(0, len(group), self.max_batch_size):
+                chunk = group[start : start + self.max_batch_size]
+                params = StartBatchScrapeJobParams(
+                    urls=[item.url for item in chunk],
+                    scrape_options=_scrape_options(chunk[0].scrape_options),
+                    session_options=self._session_params(chunk[0].session_options),
+                )
+                jobs.append((params, key))
+        return jobs
+
+    @staticmethod
+    def _batch_results(
+        response: Any,
+        params: StartBatchScrapeJobParams,
+        key: Tuple[Optional[str], Optional[str]],
+    ) -> Dict[Hashable, Any]:
+        """Key a batch response's pages by the URLs that were submitted.
+
+        The backend reports each page's own URL, which can differ from the
+        submitted one after a redirect or normalization. Pages are matched to
+        submitted URLs exactly first; the rest are paired in submission order
+        when their counts agree, and otherwise left to the per-item call.
+        """
+        pages: Dict[str, Any] = {}
+        unmatched_pages = []
+        for page in response.data or []:
+            if page.url in params.urls and page.url not in pages:
+                pages[page.url] = page
+            else:
+                unmatched_pages.append(page)
+        unmatched_urls = [url for url in params.urls if url not in pages]
+        if len(unmatched_urls) == len(unmatched_pages):
+            pages.update(zip(unmatched_urls, unmatched_pages))
+
+        results: Dict[Hashable, Any] = {}
+        for url, page in pages.items():
+            data = ScrapeJobData(
+                metadata=page.metadata,
+                html=page.html,
+                markdown=page.markdown,
+                links=page.links,
+                screenshot=page.screenshot,
+            )
+            results[(url, *key)] = {"data": data, "error": page.error}
+        return results
+
+    def _prefetch_batch(self, args: List[Dict[str, Any]]) -> Dict[Hashable, Any]:
+        """Scrape URLs sharing the same options with one batch scrape job.
+
+        URLs missing from a batch response, or whose batch job failed, are
+        scraped individually by the per-item call instead.
+        """
+        results: Dict[Hashable, Any] = {}
+        for params, key in self._batch_jobs(args):
+            try:
+                with self._job_slot():
+                    response = self._get_client().scrape.batch.start_and_wait(params)
+            except Exception:
+                continue
+            results.update(self._batch_results(response, params, key))
+        return results
+
+    async def _aprefetch_batch(
+        self, args: List[Dict[str, Any]]
+    ) -> Dict[Hashable, Any]:
+        """Asynchronously scrape URLs sharing the same options in batch jobs."""
+
+        async def run(
+            params: StartBatchScrapeJobParams,
+            key: Tuple[Optional[str], Optional[str]],
+        ) -> Dict[Hashable, Any]:
+            try:
+                async with self._ajob_slot():
+                    client = self._get_async_client()
+                    response = await client.scrape.batch.start_and_wait(params)
+            except Exception:
+                return {}
+            return self._batch_results(response, params, key)
+
+        results: Dict[Hashable, Any] = {}
+        for batch in await asyncio.gather(
+            *(run(params, key) for params, key in self._batch_jobs(args))
+        ):
+            results.update(batch)
+        return results
 
     def _run(
         self,
@@ -61,30 +293,40 @@ class HyperbrowserScrapeTool(BaseTool):
         Returns:
             Dict containing the scraped content and metadata
         """
-        # Create scrape job parameters
-        scrape_params = StartScrapeJobParams(
-            url=url,
-            scrape_options=(
-                ScrapeOptions(formats=scrape_options.formats)
-                if scrape_options
-                else None
-            ),
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options
-                else None
-            ),
+        found, result = self._take_prefetched(
+            url=url, scrape_options=scrape_options, session_options=session_options
         )
+        if found:
+            return self._finish(result, scrape_options)
+
+        session_params = self._session_params(session_options)
+        if self.fast_path is not None and not needs_browser(
+            session_options=session_params
+        ):
+            with phase("fast_path"):
+                data = self.fast_path.fetch(url, _formats(scrape_options))
+            if data is not None:
+                return self._finish({"data": data, "error": None}, scrape_options)
+
+        # Create scrape job parameters
+        with phase("params"):
+            scrape_params = StartScrapeJobParams(
+                url=url,
+                scrape_options=_scrape_options(scrape_options),
+                session_options=session_params,
+            )
 
         # Start and wait for scrape job
-        response = self.client.scrape.start_and_wait(scrape_params)
+        with self._job_slot():
+            manager = self._get_client().scrape
+            if self.hedging is not None:
+                response = self.hedging.run(manager, scrape_params)
+            else:
+                response = manager.start_and_wait(scrape_params)
 
-        return {"data": response.data, "error": response.error}
+        return self._finish(
+            {"data": response.data, "error": response.error}, scrape_options
+        )
 
     async def _arun(
         self,
@@ -104,27 +346,43 @@ class HyperbrowserScrapeTool(BaseTool):
         Returns:
             Dict containing the scraped content and metadata
         """
-        # Create scrape job parameters
-        scrape_params = StartScrapeJobParams(
-            url=url,
-            scrape_options=(
-                ScrapeOptions(formats=scrape_options.formats)
-                if scrape_options
-                else None
-            ),
-            session_options=(
-                CreateSessionParams(
-                    use_proxy=session_options.use_proxy,
-                    proxy_country=session_options.proxy_country,
-                    solve_captchas=session_options.solve_captchas,
-                    adblock=session_options.adblock,
-                )
-                if session_options
-                else None
-            ),
+        found, result = self._take_prefetched(
+            url=url, scrape_options=scrape_options, session_options=session_options
         )
+        if found:
+            return await asyncio.to_thread(self._finish, result, scrape_options)
+
+        session_params = self._session_params(session_options)
+        if self.fast_path is not None and not needs_browser(
+            session_options=session_params
+        ):
+            with phase("fast_path"):
+                data = await self.fast_path.afetch(url, _formats(scrape_options))
+            if data is not None:
+                return await asyncio.to_thread(
+                    self._finish, {"data": data, "error": None}, scrape_options
+                )
+
+        # Create scrape job parameters
+        with phase("params"):
+            scrape_params = StartScrapeJobParams(
+                url=url,
+                scrape_options=_scrape_options(scrape_options),
+                session_options=session_params,
+            )
 
         # Start and wait for scrape job
-        response = await self.async_client.scrape.start_and_wait(scrape_params)
+        async with self._ajob_slot():
+            amanager = self._get_async_client().scrape
+            if self.hedging is not None:
+                response = await self.hedging.arun(amanager, scrape_params)
+            else:
+                response = await amanager.start_and_wait(scrape_params)
 
-        return {"data": response.data, "error": response.error}
+        # Storing screenshots and spilling large results block; keep them off
+        # the event loop.
+        return await asyncio.to_thread(
+            self._finish,
+            {"data": response.data, "error": response.error},
+            scrape_options,
+        )
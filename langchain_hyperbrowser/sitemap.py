@@ -0,0 +1,254 @@
+"""Streaming sitemap discovery for bulk loading."""
+
+import re
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from typing import (
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    cast,
+)
+from urllib.parse import urljoin, urlsplit
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from pydantic import BaseModel, Field
+
+SitemapFetcher = Callable[[str], Iterable[bytes]]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SitemapOptions(BaseModel):
+    """Filters applied while walking sitemaps."""
+
+    modified_since: Optional[datetime] = Field(
+        default=None, description="Only keep URLs with a lastmod at or after this"
+    )
+    include_undated: bool = Field(
+        default=True, description="Keep URLs without lastmod when filtering by date"
+    )
+    include_patterns: List[str] = Field(
+        default_factory=list,
+        description="Regular expressions; when given, a URL must match one of them",
+    )
+    exclude_patterns: List[str] = Field(
+        default_factory=list, description="Regular expressions of URLs to skip"
+    )
+    max_urls: Optional[int] = Field(
+        default=None, ge=1, description="Stop after this many URLs"
+    )
+    max_depth: int = Field(
+        default=3, ge=0, description="Maximum nesting depth of sitemap indexes"
+    )
+    timeout: float = Field(
+        default=30.0, gt=0, description="Timeout in seconds per sitemap request"
+    )
+
+
+class SitemapEntry(NamedTuple):
+    url: str
+    lastmod: Optional[datetime]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime as found in ``<lastmod>``, assuming UTC when naive."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return _as_utc(parsed)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def fetch_sitemap(url: str, timeout: float = 30.0) -> Iterator[bytes]:
+    """Stream the body of a sitemap over HTTP."""
+    import httpx
+
+    with httpx.stream("GET", url, timeout=timeout, follow_redirects=True) as response:
+        response.raise_for_status()
+        yield from response.iter_bytes()
+
+
+def _decompressed(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Transparently gunzip a chunk stream that starts with the gzip magic."""
+    decompressor = None
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            first = False
+            if chunk[:2] == _GZIP_MAGIC:
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if decompressor is None:
+            yield chunk
+        else:
+            yield decompressor.decompress(chunk)
+    if decompressor is not None:
+        yield decompressor.flush()
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_sitemap(chunks: Iterable[bytes]) -> Iterator[Tuple[str, SitemapEntry]]:
+    """Incrementally parse a urlset or sitemap index.
+
+    Yields ``("url", SitemapEntry)`` for pages and ``("sitemap", SitemapEntry)``
+    for nested sitemaps. Processed elements are detached from the tree, so
+    memory stays flat regardless of the sitemap size.
+    """
+    parser: "XMLPullParser[Element]" = XMLPullParser(events=("start", "end"))
+    stack: List[Element] = []
+    for chunk in _decompressed(chunks):
+        parser.feed(chunk)
+        yield from _drain(parser, stack)
+    parser.close()
+    yield from _drain(parser, stack)
+
+
+def _drain(
+    parser: "XMLPullParser[Element]", stack: List[Element]
+) -> Iterator[Tuple[str, SitemapEntry]]:
+    # Only start and end events are requested, and both carry an element.
+    events = cast(Iterator[Tuple[str, Element]], parser.read_events())
+    for event, element in events:
+        if event == "start":
+            stack.append(element)
+            continue
+        stack.pop()
+        kind = _local_name(element.tag)
+        if kind not in ("url", "sitemap"):
+            continue
+        loc = lastmod = None
+        for child in element:
+            name = _local_name(child.tag)
+            if name == "loc":
+                loc = (child.text or "").strip()
+            elif name == "lastmod":
+                lastmod = child.text
+        if stack:
+            stack[-1].remove(element)
+        if loc:
+            yield kind, SitemapEntry(loc, parse_lastmod(lastmod))
+
+
+def _robots_sitemaps(robots_txt: str) -> List[str]:
+    return [
+        line.split(":", 1)[1].strip()
+        for line in robots_txt.splitlines()
+        if line.lower().startswith("sitemap:")
+    ]
+
+
+def _looks_like_sitemap(url: str) -> bool:
+    path = urlsplit(url).path.lower()
+    return path.endswith((".xml", ".xml.gz", ".gz"))
+
+
+class SitemapWalker:
+    """Walk (possibly gzipped, nested) sitemaps and yield the matching page URLs.
+
+    A start URL that does not point at a sitemap file is treated as a site
+    root: its robots.txt ``Sitemap:`` directives are used, falling back to
+    ``/sitemap.xml``. Sitemap indexes are followed breadth-first up to
+    ``options.max_depth`` levels, skipping nested sitemaps whose lastmod is
+    older than ``options.modified_since``. Page URLs are deduplicated.
+    """
+
+    def __init__(
+        self,
+        options: Optional[SitemapOptions] = None,
+        fetcher: Optional[SitemapFetcher] = None,
+    ):
+        self.options = options or SitemapOptions()
+        self._fetch = fetcher or (
+            lambda url: fetch_sitemap(url, timeout=self.options.timeout)
+        )
+        self._include = [re.compile(p) for p in self.options.include_patterns]
+        self._exclude = [re.compile(p) for p in self.options.exclude_patterns]
+        self._since = (
+            _as_utc(self.options.modified_since)
+            if self.options.modified_since is not None
+            else None
+        )
+
+    def _fresh(self, lastmod: Optional[datetime]) -> bool:
+        if self._since is None:
+            return True
+        if lastmod is None:
+            return self.options.include_undated
+        return lastmod >= self._since
+
+    def _wanted(self, entry: SitemapEntry) -> bool:
+        if not self._fresh(entry.lastmod):
+            return False
+        if self._include and not any(p.search(entry.url) for p in self._include):
+            return False
+        return not any(p.search(entry.url) for p in self._exclude)
+
+    def _start_sitemaps(self, url: str) -> List[str]:
+        if _looks_like_sitemap(url):
+            return [url]
+        parts = urlsplit(url)
+        root = f"{parts.scheme}://{parts.netloc}/"
+        try:
+            robots_txt = b"".join(self._fetch(urljoin(root, "robots.txt")))
+            sitemaps = _robots_sitemaps(robots_txt.decode("utf-8", errors="replace"))
+        except Exception:
+            sitemaps = []
+        return sitemaps or [urljoin(root, "sitemap.xml")]
+
+    def walk(self, urls: Iterable[str]) -> Iterator[SitemapEntry]:
+        """Yield the page entries reachable from the given sitemaps or sites."""
+        queue: Deque[Tuple[str, int]] = deque()
+        for url in urls:
+            queue.extend((sitemap, 0) for sitemap in self._start_sitemaps(url))
+        visited_sitemaps = set()
+        seen_urls = set()
+        emitted = 0
+        while queue:
+            sitemap_url, depth = queue.popleft()
+            if sitemap_url in visited_sitemaps:
+                continue
+            visited_sitemaps.add(sitemap_url)
+            try:
+                for kind, entry in parse_sitemap(self._fetch(sitemap_url)):
+                    if kind == "sitemap":
+                        if depth < self.options.max_depth and self._fresh(
+                            entry.lastmod
+                        ):
+                            queue.append((entry.url, depth + 1))
+                        continue
+                    if entry.url in seen_urls or not self._wanted(entry):
+                        continue
+                    seen_urls.add(entry.url)
+                    yield entry
+                    emitted += 1
+                    if (
+                        self.options.max_urls is not None
+                        and emitted >= self.options.max_urls
+                    ):
+                        return
+            except Exception:
+                # A broken nested sitemap should not abort the whole walk.
+                if depth == 0:
+                    raise
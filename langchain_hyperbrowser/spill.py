@@ -0,0 +1,157 @@
+"""Size budgets for tool results, spilling oversized results to disk."""
+
+import os
+import tempfile
+from typing import IO, Any, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .output import _to_plain, dumps
+
+
+class ResultBudget(BaseModel):
+    """Limits on how much of a result is held in memory and returned inline."""
+
+    max_bytes: int = Field(
+        default=1_000_000,
+        ge=1,
+        description="Maximum serialized size of the pages returned inline",
+    )
+    max_pages: Optional[int] = Field(
+        default=None, ge=0, description="Maximum number of pages returned inline"
+    )
+    spill_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for spilled results; the system temp dir if unset",
+    )
+    summary_pages: int = Field(
+        default=20, ge=0, description="Pages listed in the summary of a spill"
+    )
+    preview_chars: int = Field(
+        default=200, ge=0, description="Characters of content previewed per page"
+    )
+    batch_size: int = Field(
+        default=100, ge=1, description="Pages fetched per request when crawling"
+    )
+
+
+class PageSummary(BaseModel):
+    url: Optional[str] = None
+    title: Optional[str] = None
+    preview: Optional[str] = None
+
+
+class SpilledResult(BaseModel):
+    """Reference to a result written to disk instead of returned inline.
+
+    ``path`` is a JSON Lines file with one page per line.
+    """
+
+    path: str
+    pages: int
+    bytes: int
+    summary: List[PageSummary] = Field(default_factory=list)
+
+
+class SpillBuffer:
+    """Collect pages in memory until the budget is exceeded, then stream to disk.
+
+    Once spilled, pages are written as they arrive and only a bounded summary
+    is kept, so memory stays flat however many pages are added.
+    """
+
+    def __init__(self, budget: ResultBudget, prefix: str = "hyperbrowser-"):
+        self.budget = budget
+        self.prefix = prefix
+        self.pages = 0
+        self.bytes = 0
+        self._inline: List[Any] = []
+        self._lines: List[str] = []
+        self._summary: List[PageSummary] = []
+        self._file: Optional[IO[str]] = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def _over_budget(self) -> bool:
+        if self.bytes > self.budget.max_bytes:
+            return True
+        return self.budget.max_pages is not None and self.pages > self.budget.max_pages
+
+    def _open(self) -> IO[str]:
+        directory = self.budget.spill_dir or tempfile.gettempdir()
+        os.makedirs(directory, exist_ok=True)
+        return tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            prefix=self.prefix,
+            suffix=".jsonl",
+            dir=directory,
+            delete=False,
+        )
+
+    def _summarize(self, plain: Any) -> None:
+        if len(self._summary) >= self.budget.summary_pages:
+            return
+        if not isinstance(plain, dict):
+            return
+        metadata = plain.get("metadata") or {}
+        title = metadata.get("title")
+        if isinstance(title, list):
+            title = title[0] if title else None
+        content = plain.get("markdown") or plain.get("html") or ""
+        self._summary.append(
+            PageSummary(
+                url=plain.get("url") or metadata.get("sourceURL"),
+                title=title,
+                preview=content[: self.budget.preview_chars] or None,
+            )
+        )
+
+    def add(self, page: Any) -> None:
+        """Add one page of the result."""
+        plain = _to_plain(page)
+        line = dumps(plain)
+        self.pages += 1
+        self.bytes += len(line.encode("utf-8"))
+        self._summarize(plain)
+        if self._file is not None:
+            self._file.write(line + "\n")
+            return
+        self._inline.append(page)
+        self._lines.append(line)
+        if self._over_budget():
+            self._file = self._open()
+            for buffered in self._lines:
+                self._file.write(buffered + "\n")
+            self._inline.clear()
+            self._lines.clear()
+
+    def result(self) -> Any:
+        """Return the pages inline, or a :class:`SpilledResult` once spilled."""
+        if self._file is None:
+            return list(self._inline)
+        self._file.close()
+        return SpilledResult(
+            path=self._file.name,
+            pages=self.pages,
+            bytes=self.bytes,
+            summary=self._summary,
+        )
+
+    def discard(self) -> None:
+        """Drop buffered pages and delete any spill file."""
+        self._inline.clear()
+        self._lines.clear()
+        if self._file is not None:
+            self._file.close()
+            os.unlink(self._file.name)
+            self._file = None
+
+
+def apply_budget(page: Any, budget: ResultBudget, prefix: str) -> Any:
+    """Return ``page`` unchanged, or a :class:`SpilledResult` if it is too large."""
+    buffer = SpillBuffer(budget, prefix)
+    buffer.add(page)
+    return buffer.result() if buffer.spilled else page
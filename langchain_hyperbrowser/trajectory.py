@@ -0,0 +1,431 @@
+"""Record computer-use trajectories and replay them on later runs of a task."""
+
+import inspect
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .output import _to_plain
+
+# Quoted strings and numbers in a task are its inputs; the rest is the
+# workflow. Single quotes only count at word boundaries, so "don't" is text.
+_INPUT = re.compile(r"\"([^\"]*)\"|(?<!\w)'([^']*)'(?!\w)|\b(\d+(?:\.\d+)?)\b")
+
+_GUIDED = (
+    "{task}\n\nThese computer actions completed this task before. Follow them "
+    "unless the page differs, then give the final answer:\n{actions}"
+)
+_FINISH = (
+    "The browser is already at the end of this task: {task}\n"
+    "Do not navigate; give the final answer from the current page."
+)
+_CONTINUE = "Continue this task in the current browser, partway through it: {task}"
+
+# Runs an agent task with the given params and returns its response.
+AgentRunner = Callable[[Any], Any]
+AsyncAgentRunner = Callable[[Any], Awaitable[Any]]
+# Performs one recorded action in a session, raising if the page diverged.
+ActionExecutor = Callable[[Any, Dict[str, Any]], Any]
+
+
+def task_template(task: str) -> Tuple[str, List[str]]:
+    """Split a task into its workflow template and its inputs.
+
+    ``'search for "red shoes" under 50'`` becomes the template
+    ``'search for "{0}" under {1}'`` and the inputs ``["red shoes", "50"]``.
+    """
+    inputs: List[str] = []
+
+    def placeholder(match: "re.Match[str]") -> str:
+        value = next(group for group in match.groups() if group is not None)
+        marker = "{%d}" % len(inputs)
+        inputs.append(value)
+        return match.group(0).replace(value, marker, 1) if value else marker
+
+    return _INPUT.sub(placeholder, task), inputs
+
+
+def computer_actions(steps: Any) -> List[Dict[str, Any]]:
+    """The browser actions of a Claude Computer Use or OpenAI CUA run, in order.
+
+    Claude steps carry actions in ``tool_use`` content blocks, CUA steps in
+    ``computer_call`` output items.
+    """
+    actions = []
+    for step in _to_plain(list(steps or [])):
+        for block in step.get("content") or []:
+            if isinstance(block, dict) and block.get("type") == "tool_use":
+                actions.append(block.get("input") or {})
+        for item in step.get("output") or []:
+            if isinstance(item, dict) and item.get("type") == "computer_call":
+                actions.append(item.get("action") or {})
+    return actions
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def _token(value: str, joiners: str = r".+\-") -> str:
+    # An input only counts where it is not part of a longer word, number or
+    # key combination, so "1" is not found in "10", "1.5" or "ctrl+1".
+    return rf"(?<![\w{joiners}])" + re.escape(value) + rf"(?![\w{joiners}])"
+
+
+def bind_actions(
+    actions: Any, recorded: List[str], current: List[str]
+) -> Optional[Any]:
+    """Substitute a run's inputs for the recorded ones in action strings.
+
+    Only whole values and whole tokens equal to a recorded input are
+    replaced. Returns ``None`` when that is ambiguous: an input that is
+    empty, contains another input, is given two different new values or
+    is joined to other text by ``.``, ``+`` or ``-`` (as in ``ctrl+1``).
+    """
+    mapping: Dict[str, str] = {}
+    for old, new in zip(recorded, current):
+        if old != new and mapping.setdefault(old, new) != new:
+            return None
+    if not mapping:
+        return actions
+    olds = list(mapping)
+    if any(not old or any(o != old and old in o for o in olds) for old in olds):
+        return None
+    strings = list(_strings(actions))
+    for old in olds:
+        token, word = re.compile(_token(old)), re.compile(_token(old, joiners=""))
+        if any(len(word.findall(t)) != len(token.findall(t)) for t in strings):
+            return None
+    pattern = re.compile("|".join(_token(old) for old in olds))
+
+    def bind(value: Any) -> Any:
+        if isinstance(value, str):
+            return pattern.sub(lambda match: mapping[match.group(0)], value)
+        if isinstance(value, dict):
+            return {key: bind(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [bind(item) for item in value]
+        return value
+
+    return bind(actions)
+
+
+def _succeeded(response: Any) -> bool:
+    return (
+        response.status == "completed"
+        and response.error is None
+        and response.data is not None
+    )
+
+
+class Trajectory(BaseModel):
+    """The actions of a successful run of a task template by one agent."""
+
+    kind: str
+    template: str
+    inputs: List[str] = Field(default_factory=list)
+    actions: List[Dict[str, Any]] = Field(default_factory=list)
+    final_result: Optional[str] = None
+
+
+class TrajectoryStore:
+    """Trajectories in a SQLite database, one per agent kind and task template.
+
+    Agents record actions in different shapes, so a template's trajectory is
+    kept apart for each ``kind`` of agent, such as ``"claude_computer_use"``
+    or ``"cua"``.
+
+    ``":memory:"`` keeps them for the life of the process; a file path keeps
+    them across runs and can be shared by processes on one machine.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trajectories ("
+            "kind TEXT NOT NULL, template TEXT NOT NULL, trajectory TEXT NOT NULL, "
+            "PRIMARY KEY (kind, template))"
+        )
+
+    def get(self, kind: str, template: str) -> Optional[Trajectory]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT trajectory FROM trajectories WHERE kind = ? AND template = ?",
+                (kind, template),
+            ).fetchone()
+        return Trajectory.model_validate_json(row[0]) if row else None
+
+    def put(self, trajectory: Trajectory) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trajectories VALUES (?, ?, ?)",
+                (trajectory.kind, trajectory.template, trajectory.model_dump_json()),
+            )
+
+    def delete(self, kind: str, template: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM trajectories WHERE kind = ? AND template = ?",
+                (kind, template),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM trajectories").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class TrajectoryReplayer:
+    """Replay recorded trajectories of computer-use tasks, recording new ones.
+
+    A task's quoted strings and numbers are its inputs, and runs of the same
+    template share a trajectory with the inputs substituted. A task with no
+    trajectory, or whose inputs cannot be substituted unambiguously (see
+    :func:`bind_actions`), runs the agent as usual and, if it succeeds, its
+    actions are recorded.
+
+    With an ``executor``, replay is deterministic: a session is created, the
+    executor performs each recorded action in it (for instance with
+    Playwright over the session's ``ws_endpoint``; the API has no action
+    endpoint) and raises if the page diverged. The agent then only gives the
+    final answer, in at most ``finish_steps`` steps, or, after a divergence,
+    continues the task from where replay stopped and the trajectory is
+    re-recorded. Without an executor the agent is given the recorded
+    actions to follow; these runs are counted as ``guided``, not as hits,
+    since nothing is replayed. Either way, a replay that does not succeed
+    falls back to a full agent run.
+    """
+
+    def __init__(
+        self,
+        store: Optional[TrajectoryStore] = None,
+        executor: Optional[ActionExecutor] = None,
+        finish_steps: int = 5,
+    ):
+        self.store = store if store is not None else TrajectoryStore()
+        self.executor = executor
+        self.finish_steps = finish_steps
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {
+            "hits": 0,
+            "guided": 0,
+            "misses": 0,
+            "divergences": 0,
+            "recorded": 0,
+            "replayed_actions": 0,
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        """Return replay hits, guided runs, misses, divergences and recordings.
+
+        ``hit_rate`` is the share of runs fully replayed by the executor.
+        """
+        with self._lock:
+            counts: Dict[str, Any] = dict(self._counts)
+        runs = sum(counts[name] for name in ("hits", "guided", "misses", "divergences"))
+        counts["hit_rate"] = counts["hits"] / runs if runs else 0.0
+        return counts
+
+    def _record(
+        self,
+        kind: str,
+        template: str,
+        inputs: List[str],
+        response: Any,
+        prefix: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        if not _succeeded(response):
+            return
+        actions = list(prefix or []) + computer_actions(response.data.steps)
+        if not actions:
+            return
+        self.store.put(
+            Trajectory(
+                kind=kind,
+                template=template,
+                inputs=inputs,
+                actions=actions,
+                final_result=response.data.final_result,
+            )
+        )
+        self._count("recorded")
+
+    def _lookup(
+        self, kind: str, task: str
+    ) -> Tuple[str, List[str], Optional[List[Any]]]:
+        template, inputs = task_template(task)
+        trajectory = self.store.get(kind, template)
+        if trajectory is None:
+            return template, inputs, None
+        return (
+            template,
+            inputs,
+            bind_actions(trajectory.actions, trajectory.inputs, inputs),
+        )
+
+    @staticmethod
+    def _guided(params: Any, actions: List[Dict[str, Any]]) -> Any:
+        listing = "\n".join(json.dumps(action) for action in actions)
+        task = _GUIDED.format(task=params.task, actions=listing)
+        return params.model_copy(update={"task": task})
+
+    def _in_session(self, params: Any, session: Any, replayed: int, total: int) -> Any:
+        finished = replayed == total
+        template = _FINISH if finished else _CONTINUE
+        return params.model_copy(
+            update={
+                "task": template.format(task=params.task),
+                "session_id": session.id,
+                "session_options": None,
+                "max_steps": self.finish_steps if finished else params.max_steps,
+            }
+        )
+
+    def run(self, params: Any, run_agent: AgentRunner, sessions: Any, kind: str) -> Any:
+        """Run an agent task, replaying its template's trajectory if recorded.
+
+        ``params`` are the task's start params, ``run_agent`` runs a task,
+        ``sessions`` is the client's session manager and ``kind`` names the
+        agent whose trajectories are used.
+        """
+        template, inputs, actions = self._lookup(kind, params.task)
+        if actions is None:
+            self._count("misses")
+            response = run_agent(params)
+            self._record(kind, template, inputs, response)
+            return response
+
+        replayed = len(actions)
+        if self.executor is None:
+            response = run_agent(self._guided(params, actions))
+        else:
+            session = sessions.create(params.session_options)
+            try:
+                replayed = self._replay(session, actions)
+                response = run_agent(
+                    self._in_session(params, session, replayed, len(actions))
+                )
+            finally:
+                try:
+                    sessions.stop(session.id)
+                except Exception:
+                    pass
+        if self._settle(kind, template, inputs, actions, replayed, response):
+            return response
+        return self._fallback(kind, template, inputs, run_agent(params))
+
+    async def arun(
+        self, params: Any, run_agent: AsyncAgentRunner, sessions: Any, kind: str
+    ) -> Any:
+        """Async version of :meth:`run`; the executor may be a coroutine."""
+        template, inputs, actions = self._lookup(kind, params.task)
+        if actions is None:
+            self._count("misses")
+            response = await run_agent(params)
+            self._record(kind, template, inputs, response)
+            return response
+
+        replayed = len(actions)
+        if self.executor is None:
+            response = await run_agent(self._guided(params, actions))
+        else:
+            session = await sessions.create(params.session_options)
+            try:
+                replayed = await self._areplay(session, actions)
+                response = await run_agent(
+                    self._in_session(params, session, replayed, len(actions))
+                )
+            finally:
+                try:
+                    await sessions.stop(session.id)
+                except Exception:
+                    pass
+        if self._settle(kind, template, inputs, actions, replayed, response):
+            return response
+        return self._fallback(kind, template, inputs, await run_agent(params))
+
+    def _replay(self, session: Any, actions: List[Dict[str, Any]]) -> int:
+        """Perform actions until one fails; return how many succeeded."""
+        assert self.executor is not None
+        for index, action in enumerate(actions):
+            try:
+                self.executor(session, action)
+            except Exception:
+                self._count("replayed_actions", index)
+                return index
+        self._count("replayed_actions", len(actions))
+        return len(actions)
+
+    async def _areplay(self, session: Any, actions: List[Dict[str, Any]]) -> int:
+        assert self.executor is not None
+        for index, action in enumerate(actions):
+            try:
+                result = self.executor(session, action)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self._count("replayed_actions", index)
+                return index
+        self._count("replayed_actions", len(actions))
+        return len(actions)
+
+    def _settle(
+        self,
+        kind: str,
+        template: str,
+        inputs: List[str],
+        actions: List[Dict[str, Any]],
+        replayed: int,
+        response: Any,
+    ) -> bool:
+        """Count a replay that succeeded; return whether it did."""
+        if not _succeeded(response):
+            return False
+        if self.executor is None:
+            self._count("guided")
+        elif replayed == len(actions):
+            self._count("hits")
+        else:
+            self._count("divergences")
+            self._record(kind, template, inputs, response, prefix=actions[:replayed])
+        return True
+
+    def _fallback(
+        self, kind: str, template: str, inputs: List[str], response: Any
+    ) -> Any:
+        self._count("divergences")
+        self._record(kind, template, inputs, response)
+        return response
+
+
+def as_replayer(value: Any) -> Any:
+    """Build a :class:`TrajectoryReplayer` from ``True`` or a store path."""
+    if value is True:
+        return TrajectoryReplayer()
+    if value is False:
+        return None
+    if isinstance(value, str):
+        return TrajectoryReplayer(TrajectoryStore(value))
+    return value
@@ -0,0 +1,84 @@
+"""Benchmark local HTML to Markdown conversion on large synthetic pages.
+
+Usage: python scripts/benchmark_markdown.py [--pages N] [--sections N]
+
+Compares the single-process converter, boilerplate removal and the process
+pool used for crawls, plus markdownify and html2text when they are installed.
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from langchain_hyperbrowser.markdown import convert_many, html_to_markdown
+
+
+def make_page(sections: int, seed: int) -> str:
+    parts = [
+        "<html><head><title>Benchmark page</title>",
+        "<script>var x = 1;</script><style>body { margin: 0 }</style></head><body>",
+        "<header class='site-header'><nav><ul>",
+        *(f"<li><a href='/nav/{i}'>Link {i}</a></li>" for i in range(30)),
+        "</ul></nav></header><div class='cookie-banner'>We use cookies</div>",
+        "<main><article>",
+    ]
+    for i in range(sections):
+        parts.append(
+            f"<h2>Section {seed}.{i}</h2><p>Lorem <b>ipsum</b> dolor sit amet, "
+            f"<a href='/p/{i}'>consectetur</a> adipiscing <em>elit</em>. "
+            "Sed do eiusmod tempor incididunt ut labore et dolore magna.</p>"
+            "<ul><li>alpha</li><li>beta<ul><li>gamma</li></ul></li></ul>"
+            "<table><tr><th>Key</th><th>Value</th></tr>"
+            f"<tr><td>{i}</td><td>{i * seed}</td></tr></table>"
+            "<pre><code>for i in range(10):\n    print(i)</code></pre>"
+        )
+    parts.append("</article></main><aside class='sidebar'>Related posts</aside>")
+    parts.append("<footer>Copyright</footer></body></html>")
+    return "".join(parts)
+
+
+def timed(name: str, pages: List[str], convert: Callable[[List[str]], List[str]]):
+    start = time.perf_counter()
+    convert(pages)
+    elapsed = time.perf_counter() - start
+    megabytes = sum(len(page) for page in pages) / 1e6
+    print(  # noqa: T201
+        f"{name:<28} {elapsed:8.3f}s {megabytes / elapsed:8.2f} MB/s "
+        f"{len(pages) / elapsed:8.1f} pages/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--sections", type=int, default=400)
+    args = parser.parse_args()
+
+    pages = [make_page(args.sections, seed) for seed in range(args.pages)]
+    size = sum(len(page) for page in pages) / 1e6
+    print(f"{len(pages)} pages, {size:.1f} MB of HTML")  # noqa: T201
+
+    timed("html_to_markdown", pages, lambda p: [html_to_markdown(h) for h in p])
+    timed(
+        "html_to_markdown (clean)",
+        pages,
+        lambda p: [html_to_markdown(h, True, True) for h in p],
+    )
+    timed("convert_many (pool)", pages, lambda p: convert_many(p, True, True))
+
+    try:
+        from markdownify import markdownify  # type: ignore[import-not-found]
+
+        timed("markdownify", pages, lambda p: [markdownify(h) for h in p])
+    except ImportError:
+        pass
+    try:
+        import html2text  # type: ignore[import-not-found]
+
+        timed("html2text", pages, lambda p: [html2text.html2text(h) for h in p])
+    except ImportError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Unit tests for the adaptive concurrency limiter."""
+
+from contextlib import ExitStack
+
+import pytest
+from hyperbrowser.exceptions import HyperbrowserError
+
+from langchain_hyperbrowser.adaptive import AdaptiveLimiter, is_overload_error
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _burst(limiter: AdaptiveLimiter, clock: FakeClock, latency: float) -> None:
+    """Run ``limiter.limit`` jobs at once, each taking ``latency`` seconds."""
+    with ExitStack() as stack:
+        for _ in range(limiter.limit):
+            stack.enter_context(limiter.slot())
+        clock.now += latency
+
+
+def _rate_limited(limiter: AdaptiveLimiter) -> None:
+    with pytest.raises(HyperbrowserError):
+        with limiter.slot():
+            raise HyperbrowserError("Too many requests", status_code=429)
+
+
+def test_limit_grows_while_healthy():
+    """Test additive increase while the limit is fully used."""
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=6, clock=clock)
+
+    for _ in range(30):
+        _burst(limiter, clock, 1.0)
+
+    assert limiter.limit == 6
+    assert limiter.stats()["limit"] == 6
+
+
+def test_rate_limit_backs_off_once_per_latency_interval():
+    """Test multiplicative decrease, with a burst of 429s counted once."""
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(initial_limit=8, clock=clock)
+    _burst(limiter, clock, 1.0)
+
+    _rate_limited(limiter)
+    _rate_limited(limiter)
+    assert limiter.limit == 4
+
+    clock.now += 2.0
+    _rate_limited(limiter)
+    assert limiter.limit == 2
+    assert limiter.stats()["overloads"] == 3
+
+
+def test_rising_latency_shrinks_limit():
+    """Test that inflated latency (e.g. server-side queueing) lowers the limit."""
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(initial_limit=8, clock=clock)
+    _burst(limiter, clock, 1.0)
+
+    for _ in range(10):
+        _burst(limiter, clock, 10.0)
+
+    assert limiter.limit < 8
+
+
+def test_is_overload_error_follows_wrapped_errors():
+    """Test overload detection through wrapped SDK errors."""
+    inner = HyperbrowserError("busy", status_code=503)
+    assert is_overload_error(HyperbrowserError("failed", original_error=inner))
+    assert not is_overload_error(HyperbrowserError("bad", status_code=400))
@@ -0,0 +1,113 @@
+"""Unit tests for the content-addressed artifact store."""
+
+import base64
+import hashlib
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from hyperbrowser.models.scrape import ScrapeJobData
+
+from langchain_hyperbrowser import HyperbrowserLoader, HyperbrowserScrapeTool
+from langchain_hyperbrowser.artifacts import ArtifactStore
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 3
+
+
+def test_put_base64_decodes_in_chunks_and_dedupes(tmp_path):
+    """Test that base64 data is stored once under its digest and mapped back."""
+    store = ArtifactStore(str(tmp_path), chunk_chars=8)
+    encoded = base64.b64encode(PNG).decode()
+
+    ref = store.put_base64(encoded)
+    again = store.put_base64("data:image/png;base64," + encoded)
+
+    assert ref == again
+    assert ref.sha256 == hashlib.sha256(PNG).hexdigest()
+    assert ref.size == len(PNG)
+    assert ref.media_type == "image/png"
+    view = store.open(ref.uri)
+    assert isinstance(view, memoryview)
+    assert view == PNG
+    assert store.get(ref.model_dump()) == ref
+    assert len(list(tmp_path.rglob("*"))) == 2  # the shard directory and file
+
+
+def test_put_base64_accepts_line_wrapped_data(tmp_path):
+    """Test that MIME-style line breaks do not split chunks off a 4-char boundary."""
+    store = ArtifactStore(str(tmp_path), chunk_chars=64)
+
+    ref = store.put_base64(base64.encodebytes(PNG).decode())
+
+    assert store.open(ref) == PNG
+
+
+def test_scrape_tool_returns_screenshot_reference(tmp_path):
+    """Test that the scrape tool returns an artifact URI, not base64 data."""
+    client = Mock()
+    client.scrape.start_and_wait.return_value = Mock(
+        data=ScrapeJobData(screenshot=base64.b64encode(PNG).decode()), error=None
+    )
+    tool = HyperbrowserScrapeTool(api_key="test-key", artifacts=str(tmp_path))
+
+    with patch.object(HyperbrowserScrapeTool, "_get_client", return_value=client):
+        result = tool.invoke(
+            {
+                "url": "https://example.com",
+                "scrape_options": {"formats": ["screenshot"]},
+            }
+        )
+
+    uri = result["data"].screenshot
+    assert uri.startswith("artifact://sha256/")
+    assert tool.artifacts.open(uri) == PNG
+
+
+@pytest.mark.asyncio
+async def test_async_scrape_stores_screenshots_off_the_event_loop(tmp_path):
+    """Test that decoding and writing a screenshot runs in a worker thread."""
+    client = Mock()
+    client.scrape.start_and_wait = AsyncMock(
+        return_value=Mock(
+            data=ScrapeJobData(screenshot=base64.b64encode(PNG).decode()), error=None
+        )
+    )
+    tool = HyperbrowserScrapeTool(api_key="test-key", artifacts=str(tmp_path))
+    threads = []
+    put_base64 = tool.artifacts.put_base64
+
+    def record(data):
+        threads.append(threading.current_thread())
+        return put_base64(data)
+
+    with patch.object(
+        HyperbrowserScrapeTool, "_get_async_client", return_value=client
+    ), patch.object(tool.artifacts, "put_base64", side_effect=record):
+        result = await tool.ainvoke({"url": "https://example.com"})
+
+    assert result["data"].screenshot.startswith("artifact://sha256/")
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_loader_puts_screenshot_reference_in_metadata(tmp_path):
+    """Test that Documents reference stored screenshots and keep URLs as is."""
+    screenshots = iter([base64.b64encode(PNG).decode(), "https://cdn.test/a.png"])
+
+    def scrape(params):
+        return Mock(data=ScrapeJobData(markdown="page", screenshot=next(screenshots)))
+
+    loader = HyperbrowserLoader(
+        urls=["https://example.com/a", "https://example.com/b"],
+        api_key="test-key",
+        params={"scrape_options": {"formats": ["markdown", "screenshot"]}},
+        artifacts=str(tmp_path),
+    )
+    loader.hyperbrowser = Mock()
+    loader.hyperbrowser.scrape.start_and_wait.side_effect = scrape
+
+    stored, remote = loader.load()
+
+    assert stored.metadata["screenshot"]["media_type"] == "image/png"
+    assert loader.artifacts.open(stored.metadata["screenshot"]) == PNG
+    assert remote.metadata["screenshot"] == "https://cdn.test/a.png"
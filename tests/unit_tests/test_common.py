@@ -0,0 +1,30 @@
+"""Unit tests for shared session profiles."""
+
+from langchain_hyperbrowser.common import (
+    SimpleSessionParams,
+    register_session_profile,
+    session_params,
+)
+
+
+def test_session_params_are_built_once_and_shared():
+    """Test that equal options return the same validated instance."""
+    first = session_params(SimpleSessionParams(use_proxy=True, proxy_country="US"))
+    second = session_params(SimpleSessionParams(use_proxy=True, proxy_country="US"))
+
+    assert first is second
+    assert first.use_proxy and first.proxy_country == "US"
+    assert session_params(None) is None
+
+
+def test_profile_fields_are_overridden_by_explicit_options():
+    """Test that explicitly set options are applied on top of a profile."""
+    register_session_profile("test-geo", use_proxy=True, proxy_country="DE")
+
+    params = session_params(
+        SimpleSessionParams(session_profile="test-geo", proxy_country="FR")
+    )
+    default = session_params(None, default_profile="test-geo")
+
+    assert params.use_proxy and params.proxy_country == "FR"
+    assert default.proxy_country == "DE"
@@ -0,0 +1,87 @@
+"""Unit tests for distributed loading through a work queue."""
+
+import time
+from unittest.mock import Mock
+
+from langchain_hyperbrowser import HyperbrowserLoader
+from langchain_hyperbrowser.distributed import MemorySink, SQLiteWorkQueue, Worker
+
+
+def test_expired_lease_is_completed_once():
+    """Test that only the current lease holder can complete a URL."""
+    now = [0.0]
+    queue = SQLiteWorkQueue(clock=lambda: now[0])
+    assert queue.enqueue(["https://example.com/a", "https://example.com/a"]) == 1
+
+    (stale,) = queue.lease(10, visibility_timeout=30)
+    assert queue.lease(10, visibility_timeout=30) == []
+    now[0] = 31
+    (fresh,) = queue.lease(10, visibility_timeout=30)
+
+    assert fresh.attempts == 2
+    assert queue.complete(stale) is False
+    assert queue.complete(fresh) is True
+    assert queue.complete(fresh) is False
+    assert queue.stats() == {"pending": 0, "leased": 0, "done": 1, "failed": 0}
+
+
+def test_workers_drain_queue_into_sink():
+    """Test that workers scrape every URL once and retry failures."""
+    urls = [f"https://example.com/{i}" for i in range(5)]
+    loader = HyperbrowserLoader(urls=urls, api_key="test-key", max_concurrency=2)
+    failed_once = set()
+
+    def start_and_wait(params):
+        if params.url.endswith("/3") and params.url not in failed_once:
+            failed_once.add(params.url)
+            raise RuntimeError("transient")
+        return Mock(data=Mock(markdown=params.url, html=None, metadata={}))
+
+    loader.hyperbrowser = Mock()
+    loader.hyperbrowser.scrape.start_and_wait.side_effect = start_and_wait
+    queue = SQLiteWorkQueue()
+    sink = MemorySink()
+
+    assert loader.enqueue(queue) == 5
+    stats = Worker(loader, queue, sink, poll_interval=0).run()
+
+    assert stats == {"completed": 5, "failed": 1, "lost": 0}
+    assert sorted(doc.page_content for doc in sink.documents()) == urls
+    assert queue.stats()["done"] == 5
+
+
+def test_worker_prepares_params_and_heartbeats_slow_scrapes():
+    """Test that profile names resolve and slow scrapes keep their lease."""
+    loader = HyperbrowserLoader(
+        urls="https://example.com/slow",
+        api_key="test-key",
+        params={"session_options": "stealth", "scrape_options": {"formats": ["html"]}},
+    )
+    loader._prepare_params()
+    sessions = []
+    stolen = []
+
+    def start_and_wait(params):
+        sessions.append(params.session_options)
+        time.sleep(0.5)
+        stolen.extend(queue.lease(1, visibility_timeout=10))
+        return Mock(data=Mock(markdown=None, html="<p>slow</p>", metadata={}))
+
+    loader.hyperbrowser = Mock()
+    loader.hyperbrowser.scrape.start_and_wait.side_effect = start_and_wait
+    queue = SQLiteWorkQueue()
+    loader.enqueue(queue)
+
+    worker = Worker(
+        loader,
+        queue,
+        MemorySink(),
+        visibility_timeout=0.2,
+        poll_interval=0,
+        heartbeat_interval=0.05,
+    )
+    stats = worker.run()
+
+    assert sessions[0].use_stealth is True
+    assert stolen == []
+    assert stats == {"completed": 1, "failed": 0, "lost": 0}
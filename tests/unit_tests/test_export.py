@@ -0,0 +1,88 @@
+"""Unit tests for streaming loader output to files."""
+
+import gzip
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from langchain_hyperbrowser import HyperbrowserLoader
+from langchain_hyperbrowser.export import JSONLinesSink, ParquetSink, flatten_metadata
+
+
+def test_flatten_metadata():
+    """Test that metadata becomes flat, column-safe scalar fields."""
+    columns = flatten_metadata(
+        {"title": "Home", "og:image": ["a.png"], "http": {"status-code": 200}}
+    )
+
+    assert columns == {
+        "meta_title": "Home",
+        "meta_og_image": '["a.png"]',
+        "meta_http_status_code": 200,
+    }
+
+
+def test_crawl_export_streams_batches_to_jsonl(tmp_path):
+    """Test that crawled pages are written batch by batch without Documents."""
+    pages = [
+        Mock(
+            url=f"https://example.com/{i}",
+            markdown=f"page {i}",
+            html=None,
+            metadata={"title": f"Page {i}"},
+        )
+        for i in range(3)
+    ]
+    client = Mock()
+    client.crawl.start.return_value = Mock(job_id="job-1")
+    client.crawl.get_status.return_value = Mock(status="completed")
+    client.crawl.get.side_effect = [
+        Mock(data=pages[:2], current_page_batch=1, total_page_batches=2),
+        Mock(data=pages[2:], current_page_batch=2, total_page_batches=2),
+    ]
+    loader = HyperbrowserLoader(
+        urls="https://example.com", api_key="test-key", operation="crawl"
+    )
+    loader.hyperbrowser = client
+    path = str(tmp_path / "pages.jsonl.gz")
+
+    with JSONLinesSink(path, buffer_rows=2) as sink:
+        assert loader.export(sink, batch_size=2) == 3
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert rows[2] == {
+        "url": "https://example.com/2",
+        "content": "page 2",
+        "meta_title": "Page 2",
+    }
+    assert client.crawl.get.call_count == 2
+
+
+def test_parquet_keeps_unknown_metadata_in_extra_column(tmp_path):
+    """Test that metadata outside the schema, even an ``extra`` key, survives."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "pages.parquet")
+
+    with ParquetSink(path, row_group_size=1) as sink:
+        sink.write("https://a.com/1", "one", {"title": "One", "extra": "kept"})
+        sink.write("https://a.com/2", "two", {"title": "Two", "lang": "en"})
+
+    rows = pq.read_table(path).to_pylist()
+    assert rows == [
+        {
+            "url": "https://a.com/1",
+            "content": "one",
+            "meta_title": "One",
+            "meta_extra": "kept",
+            "extra_metadata": None,
+        },
+        {
+            "url": "https://a.com/2",
+            "content": "two",
+            "meta_title": "Two",
+            "meta_extra": None,
+            "extra_metadata": '{"meta_lang": "en"}',
+        },
+    ]
@@ -0,0 +1,111 @@
+"""Unit tests for the local fast path."""
+
+import json
+from unittest.mock import Mock, patch
+
+import httpx
+
+from langchain_hyperbrowser import HyperbrowserLoader, HyperbrowserScrapeTool
+from langchain_hyperbrowser.fastpath import FastPathFetcher, FastPathOptions
+
+ARTICLE = (
+    "<html><head><title>Docs</title></head><body><h1>Guide</h1>"
+    + "<p>Static documentation text.</p>" * 20
+    + "</body></html>"
+)
+SPA = '<html><body><div id="root"></div><script src="app.js"></script></body></html>'
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "spa.com":
+        return httpx.Response(200, html=SPA)
+    if request.url.host == "blocked.com":
+        return httpx.Response(403, html="Forbidden")
+    return httpx.Response(200, html=ARTICLE)
+
+
+def test_fetch_serves_static_pages_locally():
+    """Test that a static page is converted without a browser job."""
+    fetcher = FastPathFetcher(transport=httpx.MockTransport(_handler))
+
+    data = fetcher.fetch("https://docs.com/guide")
+
+    assert data.markdown.startswith("# Guide")
+    assert data.html is None
+    assert data.metadata["title"] == "Docs"
+
+
+def test_fetch_falls_back_and_learns_per_domain():
+    """Test fallback on JS shells and the learned browser decision."""
+    transport = Mock(wraps=httpx.MockTransport(_handler))
+    fetcher = FastPathFetcher(
+        FastPathOptions(learn_min_samples=2, domains={"blocked.com": "browser"}),
+        transport=transport,
+    )
+
+    assert fetcher.fetch("https://blocked.com/") is None
+    assert fetcher.fetch("https://spa.com/a") is None
+    assert fetcher.fetch("https://spa.com/b") is None
+    requests = transport.handle_request.call_count
+    assert fetcher.fetch("https://spa.com/c") is None
+
+    assert transport.handle_request.call_count == requests == 2
+    assert fetcher.stats()["spa.com"] == {"local": 0, "fallback": 2, "mode": "browser"}
+    assert not fetcher.would_try("https://docs.com/", ["screenshot"])
+
+
+def test_loader_uses_fast_path_before_hyperbrowser():
+    """Test that the loader only scrapes pages the fast path cannot serve."""
+    loader = HyperbrowserLoader(
+        urls=["https://docs.com/guide", "https://spa.com/"],
+        api_key="test-key",
+        fast_path=True,
+    )
+    loader.fast_path.transport = httpx.MockTransport(_handler)
+    loader.hyperbrowser = Mock()
+    loader.hyperbrowser.scrape.start_and_wait.return_value = Mock(
+        data=Mock(markdown="Rendered", html=None, metadata={"title": "SPA"})
+    )
+
+    docs = loader.load()
+
+    assert docs[0].metadata["fetchedVia"] == "local"
+    assert docs[1].page_content == "Rendered"
+    loader.hyperbrowser.scrape.start_and_wait.assert_called_once()
+
+
+def test_learned_decisions_are_saved_in_batches(tmp_path):
+    """Test that the cache file is written per interval and on close."""
+    path = tmp_path / "fastpath.json"
+    fetcher = FastPathFetcher(
+        FastPathOptions(cache_path=str(path), save_interval=3600),
+        transport=httpx.MockTransport(_handler),
+    )
+
+    fetcher.fetch("https://docs.com/a")
+    fetcher.fetch("https://spa.com/b")
+    assert list(json.loads(path.read_text())) == ["docs.com"]
+
+    fetcher.close()
+    assert sorted(json.loads(path.read_text())) == ["docs.com", "spa.com"]
+
+
+def test_session_options_skip_the_fast_path():
+    """Test that proxied or stealth calls always use a browser session."""
+    client = Mock()
+    client.scrape.start_and_wait.return_value = Mock(data="browser", error=None)
+    transport = Mock(wraps=httpx.MockTransport(_handler))
+    tool = HyperbrowserScrapeTool(
+        api_key="test-key", fast_path=FastPathFetcher(transport=transport)
+    )
+
+    with patch.object(HyperbrowserScrapeTool, "_get_client", return_value=client):
+        result = tool.invoke(
+            {
+                "url": "https://docs.com/guide",
+                "session_options": {"use_proxy": True, "proxy_country": "DE"},
+            }
+        )
+
+    assert result["data"] == "browser"
+    transport.handle_request.assert_not_called()
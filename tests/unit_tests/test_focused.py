@@ -0,0 +1,56 @@
+"""Unit tests for the focused client-side crawler."""
+
+from unittest.mock import Mock
+
+from langchain_hyperbrowser import HyperbrowserLoader
+from langchain_hyperbrowser.focused import BloomFilter
+
+SITE = {
+    "https://example.com/": "[Docs](/docs) [Blog](/blog) [Away](https://other.com/)",
+    "https://example.com/docs": "[Guide](/docs/guide#intro) [Home](/)",
+    "https://example.com/blog": "[Post](/blog/post)",
+    "https://example.com/docs/guide": "guide",
+    "https://example.com/blog/post": "post",
+}
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that added items are always reported as seen."""
+    seen = BloomFilter(capacity=1000, error_rate=0.01)
+    urls = [f"https://example.com/{i}" for i in range(1000)]
+
+    assert all(seen.add(url) for url in urls[:500])
+    assert all(url in seen for url in urls[:500])
+    assert sum(url in seen for url in urls[500:]) < 25
+
+
+def test_focused_crawl_visits_best_links_first():
+    """Test that pattern scores order the frontier within the page budget."""
+
+    def start_and_wait(params):
+        return Mock(
+            data=Mock(
+                markdown=SITE[params.url],
+                html=None,
+                links=None,
+                metadata={"sourceURL": params.url},
+            )
+        )
+
+    loader = HyperbrowserLoader(
+        urls="https://example.com/",
+        api_key="test-key",
+        operation="focused_crawl",
+        crawl_options={"max_pages": 3, "pattern_weights": {"/docs": 1.0}},
+    )
+    loader.hyperbrowser = Mock()
+    loader.hyperbrowser.scrape.start_and_wait.side_effect = start_and_wait
+
+    docs = loader.load()
+
+    assert [doc.metadata["sourceURL"] for doc in docs] == [
+        "https://example.com/",
+        "https://example.com/docs",
+        "https://example.com/docs/guide",
+    ]
+    assert [doc.metadata["crawl_depth"] for doc in docs] == [0, 1, 2]
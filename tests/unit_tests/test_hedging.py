@@ -0,0 +1,75 @@
+"""Unit tests for hedged scrape and extract jobs."""
+
+from unittest.mock import Mock, patch
+
+from langchain_hyperbrowser import HyperbrowserScrapeTool
+from langchain_hyperbrowser.hedging import Hedger, HedgingPolicy
+from langchain_hyperbrowser.profiling import Profiler, instrument_client
+
+
+class SlowFirstJobManager:
+    """The first job never finishes; later ones complete at once."""
+
+    def __init__(self):
+        self.started = []
+
+    def start(self, params):
+        job_id = f"job-{len(self.started) + 1}"
+        self.started.append(job_id)
+        return Mock(job_id=job_id)
+
+    def get_status(self, job_id):
+        return Mock(status="running" if job_id == "job-1" else "completed")
+
+    def get(self, job_id):
+        return Mock(data=Mock(markdown=f"from {job_id}"), error=None)
+
+
+def test_slow_job_is_hedged_and_first_result_wins():
+    """Test that a slow scrape fires a duplicate whose result is returned."""
+    manager = SlowFirstJobManager()
+    client = Mock(scrape=manager)
+    tool = HyperbrowserScrapeTool(
+        api_key="test-key",
+        hedging={"initial_delay": 0.05, "budget_ratio": 1, "poll_interval": 0.01},
+    )
+
+    with patch.object(HyperbrowserScrapeTool, "_get_client", return_value=client):
+        result = tool._run(url="https://example.com")
+
+    assert result["data"].markdown == "from job-2"
+    assert manager.started == ["job-1", "job-2"]
+    assert tool.hedging.stats()["hedge_wins"] == 1
+    tool.close()
+
+
+def test_hedged_jobs_are_profiled():
+    """Test that SDK calls made from hedge threads show up in the profile."""
+    client = instrument_client(Mock(scrape=SlowFirstJobManager()))
+    profiler = Profiler()
+    tool = HyperbrowserScrapeTool(
+        api_key="test-key",
+        profiler=profiler,
+        hedging={"initial_delay": 0.05, "budget_ratio": 1, "poll_interval": 0.01},
+    )
+
+    with patch.object(HyperbrowserScrapeTool, "_get_client", return_value=client):
+        tool.invoke({"url": "https://example.com"})
+
+    report = profiler.to_json()
+    for phase in ("start", "poll", "fetch"):
+        assert report[f"{tool.name}/job/{phase}"]["count"] == 1
+    tool.close()
+
+
+def test_hedge_budget_caps_duplicate_jobs():
+    """Test that hedges are limited to budget_ratio of the jobs started."""
+    hedger = Hedger(HedgingPolicy(budget_ratio=0.25, max_burst=1))
+
+    allowed = 0
+    for _ in range(20):
+        hedger._start()
+        allowed += hedger._try_hedge()
+
+    assert allowed == 5
+    assert hedger.stats()["hedge_ratio"] == 0.25
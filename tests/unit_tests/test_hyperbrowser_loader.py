@@ -2,19 +2,22 @@
 
 import pytest
 from unittest.mock import Mock, patch
+from langchain_hyperbrowser._utilities import close_clients
 from langchain_hyperbrowser.hyperbrowser_loader import HyperbrowserLoader
 from hyperbrowser.models.scrape import ScrapeJobData
 
 
 @pytest.fixture
 def mock_hyperbrowser():
-    with patch("langchain_hyperbrowser.hyperbrowser.Hyperbrowser") as mock:
+    close_clients()
+    with patch("hyperbrowser.Hyperbrowser") as mock:
         yield mock
+    close_clients()
 
 
 @pytest.fixture
 def mock_async_hyperbrowser():
-    with patch("langchain_hyperbrowser.hyperbrowser.AsyncHyperbrowser") as mock:
+    with patch("hyperbrowser.AsyncHyperbrowser") as mock:
         yield mock
 
 
@@ -88,3 +91,57 @@ def test_prepare_params():
     loader._prepare_params()
     assert "session_options" in loader.params
     assert "scrape_options" in loader.params
+
+
+def test_lazy_load_scrape_concurrent():
+    """Test concurrent scraping through the politeness scheduler."""
+    urls = ["https://a.com/1", "https://b.com/1", "https://a.com/2"]
+    loader = HyperbrowserLoader(
+        urls=urls,
+        api_key="test-key",
+        max_concurrency=3,
+        politeness={"respect_robots_txt": False},
+    )
+
+    def start_and_wait(params):
+        response = Mock()
+        response.data = ScrapeJobData(markdown=params.url, metadata={})
+        return response
+
+    loader.hyperbrowser = Mock()
+    loader.hyperbrowser.scrape.start_and_wait.side_effect = start_and_wait
+
+    docs = list(loader.lazy_load())
+
+    assert sorted(doc.page_content for doc in docs) == sorted(urls)
+
+
+def test_clients_are_lazy_and_shared(mock_hyperbrowser):
+    """Test that clients are only built on first use and shared per API key."""
+    first = HyperbrowserLoader(urls="https://example.com", api_key="test-key")
+    second = HyperbrowserLoader(urls="https://example.org", api_key="test-key")
+    mock_hyperbrowser.assert_not_called()
+
+    assert first.hyperbrowser is second.hyperbrowser
+    mock_hyperbrowser.assert_called_once()
+
+
+def test_lazy_load_sitemap():
+    """Test that the sitemap operation scrapes every discovered URL."""
+    loader = HyperbrowserLoader(
+        urls="https://a.com/sitemap.xml", api_key="test-key", operation="sitemap"
+    )
+
+    def start_and_wait(params):
+        response = Mock()
+        response.data = ScrapeJobData(markdown=params.url, metadata={})
+        return response
+
+    loader.hyperbrowser = Mock()
+    loader.hyperbrowser.scrape.start_and_wait.side_effect = start_and_wait
+    pages = ["https://a.com/1", "https://a.com/2"]
+
+    with patch.object(HyperbrowserLoader, "_sitemap_urls", return_value=pages):
+        docs = list(loader.lazy_load())
+
+    assert [doc.page_content for doc in docs] == pages
@@ -0,0 +1,91 @@
+"""Import surface and import-time regression tests."""
+
+import json
+import subprocess
+import sys
+
+import langchain_hyperbrowser
+
+# Generous upper bound on the cumulative import time of the package itself,
+# measured with ``-X importtime``. Eager imports of the tools and the SDK
+# pushed this well past the budget.
+PACKAGE_IMPORT_BUDGET_US = 150_000
+# Upper bound on the package modules imported with the loader, not counting
+# langchain-core. Eager imports of the opt-in helpers (fast path, sitemaps,
+# Markdown conversion, ...) roughly tripled it.
+LOADER_IMPORT_BUDGET_US = 25_000
+_LANGCHAIN_CORE = (
+    "import langchain_core.document_loaders.base, langchain_core.documents, "
+    "langchain_core.utils"
+)
+
+_DUMP_MODULES = "print(json.dumps(sorted(sys.modules)))"
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+
+def _loaded_modules(code: str) -> list:
+    output = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport json, sys\n{_DUMP_MODULES}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_all_exports_resolve():
+    """Test that every name in __all__ can be imported."""
+    for name in langchain_hyperbrowser.__all__:
+        assert getattr(langchain_hyperbrowser, name) is not None
+
+
+def test_package_import_is_lazy():
+    """Test that importing the package does not import the tools or the SDK."""
+    modules = _loaded_modules("import langchain_hyperbrowser")
+    assert "hyperbrowser" not in modules
+    assert "langchain_core.tools" not in modules
+    assert "langchain_hyperbrowser.scrape_tool" not in modules
+
+
+def test_loader_import_skips_tools_and_sdk():
+    """Test that the loader can be imported without the tools or the SDK."""
+    modules = _loaded_modules("from langchain_hyperbrowser import HyperbrowserLoader")
+    assert "langchain_hyperbrowser.hyperbrowser_loader" in modules
+    assert "hyperbrowser" not in modules
+    assert not any(name.endswith("_tool") for name in modules)
+    helpers = ["fastpath", "focused", "markdown", "politeness", "prefilter", "sitemap"]
+    for helper in helpers:
+        assert f"langchain_hyperbrowser.{helper}" not in modules
+
+
+def test_package_import_time_budget():
+    """Test that the package import stays within its time budget."""
+    stderr = _run("import langchain_hyperbrowser")
+    for line in stderr.splitlines():
+        fields = [part.strip() for part in line.replace("import time:", "").split("|")]
+        if len(fields) == 3 and fields[2] == "langchain_hyperbrowser":
+            assert int(fields[1]) < PACKAGE_IMPORT_BUDGET_US
+            return
+    raise AssertionError("langchain_hyperbrowser not found in -X importtime output")
+
+
+def test_loader_import_time_budget():
+    """Test that importing the loader stays within its time budget."""
+    stderr = _run(
+        f"{_LANGCHAIN_CORE}\nfrom langchain_hyperbrowser import HyperbrowserLoader"
+    )
+    total = 0
+    for line in stderr.splitlines():
+        fields = line.replace("import time:", "").split("|")
+        # Only top-level entries, whose cumulative times include their imports.
+        if len(fields) == 3 and fields[2].startswith(" langchain_hyperbrowser"):
+            total += int(fields[1])
+    assert 0 < total < LOADER_IMPORT_BUDGET_US
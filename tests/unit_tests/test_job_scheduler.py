@@ -0,0 +1,104 @@
+"""Unit tests for the priority job scheduler."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from langchain_hyperbrowser.job_scheduler import JobScheduler
+
+
+async def _run_queued(scheduler: JobScheduler, jobs: list) -> list:
+    """Hold the only slot, queue ``jobs`` in order, then record dispatch order."""
+    order = []
+    gate = asyncio.Event()
+
+    async def job(priority: str, name: str) -> None:
+        async with scheduler.aslot(priority):
+            order.append(name)
+            if name == "holder":
+                await gate.wait()
+
+    tasks = [asyncio.ensure_future(job("batch", "holder"))]
+    await asyncio.sleep(0)
+    for priority, name in jobs:
+        tasks.append(asyncio.ensure_future(job(priority, name)))
+        await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+    return order[1:]
+
+
+@pytest.mark.asyncio
+async def test_interactive_jobs_overtake_queued_batch_jobs():
+    """Test that a heavier class is served ahead of a queued backlog."""
+    scheduler = JobScheduler(1, {"interactive": 4.0, "batch": 1.0})
+    jobs = [("batch", f"b{i}") for i in range(3)]
+    jobs += [("interactive", f"i{i}") for i in range(3)]
+
+    order = await _run_queued(scheduler, jobs)
+
+    assert order == ["i0", "i1", "i2", "b0", "b1", "b2"]
+
+
+@pytest.mark.asyncio
+async def test_batch_jobs_are_not_starved():
+    """Test that the lighter class still gets its weighted share."""
+    scheduler = JobScheduler(1, {"interactive": 2.0, "batch": 1.0})
+    jobs = [("interactive", f"i{i}") for i in range(6)] + [("batch", "b0")]
+
+    order = await _run_queued(scheduler, jobs)
+
+    assert order.index("b0") < len(order) - 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    """Test that cancelling a queued job leaves capacity intact."""
+    scheduler = JobScheduler(1)
+    async with scheduler.aslot("batch"):
+        waiting = asyncio.ensure_future(scheduler.aslot("batch").__aenter__())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    async with scheduler.aslot("interactive"):
+        assert scheduler.stats()["interactive"]["running"] == 1
+
+
+def test_sync_slots_respect_capacity():
+    """Test that threads never hold more slots than the limit."""
+    scheduler = JobScheduler(2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def job(priority: str) -> None:
+        nonlocal active, peak
+        with scheduler.slot(priority):
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+    threads = [
+        threading.Thread(target=job, args=("batch" if i % 2 else "interactive",))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert scheduler.stats()["batch"]["dispatched"] == 4
+
+
+def test_unknown_priority():
+    """Test that an unknown priority class is rejected."""
+    with pytest.raises(ValueError, match="Unknown priority class"):
+        with JobScheduler().slot("urgent"):
+            pass
@@ -0,0 +1,49 @@
+"""Unit tests for spreading jobs over a pool of API keys."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from hyperbrowser.exceptions import HyperbrowserError
+
+from langchain_hyperbrowser import HyperbrowserScrapeTool
+from langchain_hyperbrowser.keypool import KeyPool
+
+
+def test_least_loaded_key_is_leased():
+    """Test that concurrent leases are spread by weight."""
+    pool = KeyPool({"key-a": 2, "key-b": 1})
+
+    with pool.lease() as first, pool.lease() as second, pool.lease() as third:
+        assert sorted([first, second, third]) == ["key-a", "key-a", "key-b"]
+        assert [stats["in_flight"] for stats in pool.stats()] == [2, 1]
+    assert pool.current() is None
+
+
+def test_throttled_key_is_sidelined():
+    """Test that a key returning 429 is skipped until its cooldown ends."""
+    now = [0.0]
+    pool = KeyPool(["key-a", "key-b"], cooldown=10, clock=lambda: now[0])
+    clients = {
+        "key-a": Mock(),
+        "key-b": Mock(),
+    }
+    clients["key-a"].scrape.start_and_wait.side_effect = HyperbrowserError(
+        "Too many requests", status_code=429
+    )
+    clients["key-b"].scrape.start_and_wait.return_value = Mock(data="ok", error=None)
+    tool = HyperbrowserScrapeTool(api_key="unused", key_pool=pool)
+
+    with patch(
+        "langchain_hyperbrowser._utilities._shared_client", side_effect=clients.get
+    ):
+        with pytest.raises(HyperbrowserError):
+            tool._run(url="https://example.com")
+        for _ in range(3):
+            assert tool._run(url="https://example.com")["data"] == "ok"
+
+    stats = pool.stats()
+    assert stats[0]["throttled"] == 1 and stats[0]["sidelined_for"] == 10
+    assert stats[1]["requests"] == 3
+    now[0] = 11
+    with pool.lease() as key:
+        assert key == "key-a"
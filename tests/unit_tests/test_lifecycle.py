@@ -0,0 +1,71 @@
+"""Unit tests for job tracking and shutdown."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from langchain_hyperbrowser import HyperbrowserBrowserUseTool
+from langchain_hyperbrowser.lifecycle import JobTracker
+
+
+def test_close_cancels_running_agent_task():
+    """Test that closing with cancel stops the task and drains the call."""
+    tracker = JobTracker(poll_interval=0.01)
+    manager = Mock()
+    manager.start.return_value = Mock(job_id="job-1")
+    manager.get_status.side_effect = lambda job_id: Mock(
+        status="stopped" if manager.stop.called else "running"
+    )
+    manager.get.return_value = "final"
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(tracker.run(manager, "params"))
+    )
+    thread.start()
+    while not manager.get_status.called:
+        pass
+
+    tracker.close(cancel=True)
+
+    assert tracker.drain(timeout=5)
+    thread.join()
+    manager.stop.assert_called_once_with("job-1")
+    assert results == ["final"]
+    with pytest.raises(RuntimeError):
+        tracker.run(manager, "params")
+
+
+async def test_cancelled_coroutine_stops_agent_task():
+    """Test that cancelling an awaiting call stops the remote task."""
+    tracker = JobTracker(poll_interval=0.01)
+    manager = Mock()
+    manager.start = AsyncMock(return_value=Mock(job_id="job-1"))
+    manager.get_status = AsyncMock(return_value=Mock(status="running"))
+    manager.stop = AsyncMock()
+    task = asyncio.create_task(tracker.arun(manager, "params"))
+    await asyncio.sleep(0.05)
+
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    manager.stop.assert_awaited_once_with("job-1")
+    assert tracker.in_flight == 0
+
+
+async def test_tool_async_context_manager_closes_clients():
+    """Test that leaving ``async with`` closes the tool's clients."""
+    with patch("hyperbrowser.AsyncHyperbrowser") as async_client, patch(
+        "hyperbrowser.Hyperbrowser"
+    ) as client:
+        async_client.return_value.close = AsyncMock()
+        async with HyperbrowserBrowserUseTool(api_key="lifecycle-key") as tool:
+            tool._get_async_client()
+            tool._get_client()
+
+    async_client.return_value.close.assert_awaited_once()
+    client.return_value.close.assert_called_once()
+    with pytest.raises(RuntimeError):
+        await tool.ainvoke({"task": "anything"})
@@ -0,0 +1,87 @@
+"""Unit tests for local HTML to Markdown conversion."""
+
+import asyncio
+
+from hyperbrowser.models.crawl import CrawledPage
+
+from langchain_hyperbrowser import markdown
+from langchain_hyperbrowser.markdown import (
+    MarkdownConverter,
+    add_markdown,
+    convert_many,
+    html_to_markdown,
+)
+
+
+def test_converts_common_elements():
+    """Test headings, emphasis, links, lists, code and tables."""
+    html = (
+        "<h2>Title</h2><p>Some <b>bold</b> and <a href='/x'>link</a>.</p>"
+        "<ul><li>one<ul><li>nested</li></ul></li></ul><ol><li>first</li></ol>"
+        "<pre><code>x = 1\ny = 2</code></pre>"
+        "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>"
+        "<script>ignored()</script>"
+    )
+
+    assert html_to_markdown(html) == (
+        "## Title\n\nSome **bold** and [link](/x).\n\n- one\n  - nested\n\n"
+        "1. first\n\n```\nx = 1\ny = 2\n```\n\n| A | B |\n| --- | --- |\n| 1 | 2 |"
+    )
+
+
+def test_streams_chunks_and_collects_title():
+    """Test that chunked input gives the same output and head metadata."""
+    html = "<html><head><title> Hi </title></head><body><p>Body text</p></body></html>"
+    converter = MarkdownConverter()
+    for i in range(0, len(html), 5):
+        converter.feed(html[i : i + 5])
+    converter.close()
+
+    assert converter.markdown() == "Body text"
+    assert converter.title == "Hi"
+
+
+def test_removes_boilerplate_and_keeps_main_content():
+    """Test that page chrome is dropped and only the main element is kept."""
+    html = (
+        "<body><header><a href='/'>Home</a></header><nav>Menu</nav>"
+        "<div class='cookie-banner'>Cookies</div><p>Intro</p>"
+        "<main><article><header><h1>Post</h1></header><p>Body</p>"
+        "<div class='share-links'>Share</div></article></main>"
+        "<aside>Related</aside><footer>Copyright</footer></body>"
+    )
+
+    assert html_to_markdown(html, remove_boilerplate=True) == (
+        "Intro\n\n# Post\n\nBody"
+    )
+    assert html_to_markdown(html, remove_boilerplate=True, main_content=True) == (
+        "# Post\n\nBody"
+    )
+
+
+def test_add_markdown_fills_html_only_pages():
+    """Test that pages with only HTML get Markdown and others are untouched."""
+    pages = [
+        CrawledPage(url=f"https://example.com/{i}", status="completed", html=html)
+        for i, html in enumerate(["<h1>A</h1>", "<p>B</p>"])
+    ]
+    pages.append(
+        CrawledPage(url="https://example.com/c", status="completed", markdown="C")
+    )
+
+    add_markdown(pages, max_workers=1)
+
+    assert [page.markdown for page in pages] == ["# A", "B", "C"]
+
+
+async def test_convert_many_reuses_a_spawned_pool_from_threads():
+    """Test that pooled conversion works off the event loop and is reused."""
+    documents = [f"<p>page {i}</p>" for i in range(markdown._POOL_THRESHOLD)]
+
+    first = await asyncio.to_thread(convert_many, documents, max_workers=2)
+    pool = markdown._pools[2]
+    second = await asyncio.to_thread(convert_many, documents, max_workers=2)
+
+    assert first == second == [f"page {i}" for i in range(len(documents))]
+    assert markdown._pools[2] is pool
+    assert pool._mp_context.get_start_method() == "spawn"
@@ -0,0 +1,72 @@
+"""Unit tests for compact tool output."""
+
+import json
+
+from hyperbrowser.models.scrape import ScrapeJobData
+
+from langchain_hyperbrowser.output import (
+    SCRAPE_FORMATS,
+    OutputOptions,
+    compact_output,
+    encode_output,
+)
+
+
+def test_drops_empty_fields_and_unrequested_formats():
+    """Test that nulls, empty values and unrequested page formats are removed."""
+    result = {
+        "data": ScrapeJobData(
+            markdown="# Hi",
+            html="<h1>Hi</h1>",
+            links=[],
+            metadata={"title": "Hi", "description": "", "links": "3"},
+        ),
+        "error": None,
+    }
+
+    encoded = encode_output(
+        result, OutputOptions(), SCRAPE_FORMATS.difference(["markdown"])
+    )
+
+    assert json.loads(encoded) == {
+        "data": {"markdown": "# Hi", "metadata": {"title": "Hi", "links": "3"}}
+    }
+    assert " " not in encoded.replace("# Hi", "")
+
+
+def test_projects_fields_through_lists():
+    """Test dotted field selection over a list of pages with truncation."""
+    result = {
+        "data": [
+            {"url": "https://a.com", "markdown": "abcdef", "metadata": {"title": "A"}},
+            {"url": "https://b.com", "markdown": "xyz", "metadata": {"lang": "en"}},
+        ]
+    }
+    options = OutputOptions(fields=["data.url", "data.markdown"], max_chars=4)
+
+    assert compact_output(result, options) == {
+        "data": [
+            {"url": "http", "markdown": "abcd"},
+            {"url": "http", "markdown": "xyz"},
+        ]
+    }
+
+
+def test_tool_returns_compact_json():
+    """Test that a tool with output options returns a JSON string."""
+    from unittest.mock import Mock, patch
+
+    from langchain_hyperbrowser import HyperbrowserScrapeTool
+
+    tool = HyperbrowserScrapeTool(
+        api_key="test-key", output={"fields": ["data.markdown"]}
+    )
+    client = Mock()
+    client.scrape.start_and_wait.return_value = Mock(
+        data=ScrapeJobData(markdown="# Hi", html="<p>"), error=None
+    )
+
+    with patch.object(HyperbrowserScrapeTool, "_get_client", return_value=client):
+        encoded = tool.invoke({"url": "https://a.com"})
+
+    assert encoded == '{"data":{"markdown":"# Hi"}}'
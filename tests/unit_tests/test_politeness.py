@@ -0,0 +1,126 @@
+"""Unit tests for the per-domain politeness scheduler."""
+
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from langchain_hyperbrowser.politeness import (
+    DomainScheduler,
+    PolitenessPolicy,
+    parse_crawl_delay,
+)
+
+NO_ROBOTS = PolitenessPolicy(respect_robots_txt=False)
+
+
+def test_interleaves_hosts():
+    """Test that URLs are dispatched round-robin across hosts."""
+    urls = [
+        "https://a.com/1",
+        "https://a.com/2",
+        "https://a.com/3",
+        "https://b.com/1",
+        "https://c.com/1",
+    ]
+    scheduler = DomainScheduler(urls, max_concurrency=1, policy=NO_ROBOTS)
+    order = [url for url, _ in scheduler.map(lambda url: url)]
+    assert order == [
+        "https://a.com/1",
+        "https://b.com/1",
+        "https://c.com/1",
+        "https://a.com/2",
+        "https://a.com/3",
+    ]
+
+
+def test_per_host_concurrency_is_bounded():
+    """Test that no host exceeds its in-flight limit."""
+    urls = [f"https://a.com/{i}" for i in range(6)] + ["https://b.com/1"]
+    lock = threading.Lock()
+    in_flight: Counter = Counter()
+    peak: Counter = Counter()
+
+    def fn(url: str) -> str:
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+        time.sleep(0.02)
+        with lock:
+            in_flight[host] -= 1
+        return url
+
+    policy = PolitenessPolicy(per_host_concurrency=2, respect_robots_txt=False)
+    scheduler = DomainScheduler(urls, max_concurrency=5, policy=policy)
+    results = dict(scheduler.map(fn))
+
+    assert sorted(results) == sorted(urls)
+    assert peak["a.com"] == 2
+
+
+def test_reads_lazy_sources_ahead_by_lookahead():
+    """Test that an iterator is consumed while jobs run, not up front."""
+    read = []
+
+    def source():
+        for i in range(10):
+            read.append(i)
+            yield f"https://{'ab'[i % 2]}.com/{i}"
+
+    robots = []
+    scheduler = DomainScheduler(
+        source(),
+        max_concurrency=1,
+        robots_fetcher=lambda url: robots.append(url),
+        lookahead=2,
+    )
+    backlog = [len(read) - done for done, _ in enumerate(scheduler.map(len))]
+
+    assert len(backlog) == 10
+    assert max(backlog) <= 3
+    assert sorted(robots) == ["https://a.com/robots.txt", "https://b.com/robots.txt"]
+
+
+def test_parse_crawl_delay():
+    """Test reading Crawl-delay and Request-rate hints."""
+    assert parse_crawl_delay("User-agent: *\nCrawl-delay: 3") == 3.0
+    assert parse_crawl_delay("User-agent: *\nRequest-rate: 1/5") == 5.0
+    assert parse_crawl_delay("User-agent: *\nDisallow: /private") is None
+
+
+def test_robots_crawl_delay_spaces_out_starts():
+    """Test that a robots.txt Crawl-delay is enforced between job starts."""
+    fetched = []
+
+    def fetcher(url: str) -> str:
+        fetched.append(url)
+        return "User-agent: *\nCrawl-delay: 0.05"
+
+    starts = []
+
+    def fn(url: str) -> str:
+        starts.append(time.monotonic())
+        return url
+
+    urls = [f"https://a.com/{i}" for i in range(3)]
+    scheduler = DomainScheduler(urls, max_concurrency=3, robots_fetcher=fetcher)
+    assert len(list(scheduler.map(fn))) == 3
+
+    assert fetched == ["https://a.com/robots.txt"]
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+@pytest.mark.asyncio
+async def test_amap():
+    """Test the async scheduler path."""
+    urls = ["https://a.com/1", "https://b.com/1", "https://a.com/2"]
+
+    async def fn(url: str) -> str:
+        return url.upper()
+
+    scheduler = DomainScheduler(urls, max_concurrency=2, policy=NO_ROBOTS)
+    results = {url: result async for url, result in scheduler.amap(fn)}
+    assert results == {url: url.upper() for url in urls}
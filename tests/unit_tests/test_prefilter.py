@@ -0,0 +1,108 @@
+"""Unit tests for the URL pre-filter."""
+
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from hyperbrowser.models.scrape import ScrapeJobData
+
+from langchain_hyperbrowser import HyperbrowserLoader
+from langchain_hyperbrowser.prefilter import (
+    PrefilterOptions,
+    URLPrefilter,
+    canonicalize_url,
+)
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == "/old":
+        return httpx.Response(301, headers={"location": "https://A.com:443/page#top"})
+    if path == "/gone":
+        return httpx.Response(404)
+    if path == "/feed":
+        return httpx.Response(200, headers={"content-type": "application/rss+xml"})
+    if path == "/head-blocked" and request.method == "HEAD":
+        return httpx.Response(405)
+    if request.headers.get("if-none-match") == '"v1"':
+        return httpx.Response(304)
+    return httpx.Response(
+        200, headers={"content-type": "text/html; charset=utf-8", "etag": '"v1"'}
+    )
+
+
+URLS = [
+    "https://a.com/page",
+    "https://a.com/old",
+    "https://a.com/gone",
+    "https://a.com/feed",
+    "https://a.com/report.pdf",
+    "https://a.com/head-blocked",
+]
+
+
+def test_filter_skips_dead_duplicate_and_non_html():
+    """Test that only live, unique HTML pages survive."""
+    prefilter = URLPrefilter(transport=httpx.MockTransport(_handler))
+
+    assert prefilter.filter(URLS) == [
+        "https://a.com/page",
+        "https://a.com/head-blocked",
+    ]
+    assert prefilter.skipped == {
+        "https://a.com/old": "duplicate",
+        "https://a.com/gone": "dead",
+        "https://a.com/feed": "non-html",
+        "https://a.com/report.pdf": "non-html",
+    }
+
+
+@pytest.mark.asyncio
+async def test_afilter_skips_unchanged_pages(tmp_path):
+    """Test conditional probes against a cache persisted across runs."""
+    options = PrefilterOptions(
+        skip_unchanged=True, cache_ttl=0, cache_path=str(tmp_path / "probes.json")
+    )
+    transport = httpx.MockTransport(_handler)
+
+    first_run = URLPrefilter(options, transport)
+    first = await first_run.afilter(["https://a.com/page"])
+    first_run.commit("https://a.com/page")
+    first_run.save()
+    second_run = URLPrefilter(options, transport)
+    second = await second_run.afilter(["https://a.com/page"])
+
+    assert first == ["https://a.com/page"]
+    assert second == []
+    assert second_run.skipped == {"https://a.com/page": "unchanged"}
+
+
+def test_failed_scrape_is_fetched_again_next_run(tmp_path):
+    """Test that probe results are only cached once the scrape succeeded."""
+    prefilter = {"skip_unchanged": True, "cache_path": str(tmp_path / "probes.json")}
+    urls = ["https://a.com/page", "https://a.com/other"]
+
+    def run(failing):
+        loader = HyperbrowserLoader(urls=urls, api_key="test-key", prefilter=prefilter)
+        loader.prefilter.transport = httpx.MockTransport(_handler)
+
+        def scrape(params):
+            if params.url in failing:
+                return Mock(data=None, error="timed out")
+            return Mock(data=ScrapeJobData(markdown="page"))
+
+        start_and_wait = Mock(side_effect=scrape)
+        loader.hyperbrowser = Mock()
+        loader.hyperbrowser.scrape.start_and_wait = start_and_wait
+        loader.load()
+        return [call.args[0].url for call in start_and_wait.call_args_list]
+
+    assert run(failing={"https://a.com/page"}) == urls
+    assert run(failing=set()) == ["https://a.com/page"]
+    assert run(failing=set()) == []
+
+
+def test_canonicalize_url():
+    """Test host, port, path and fragment normalization."""
+    assert canonicalize_url("HTTPS://Example.COM:443#x") == "https://example.com/"
+    assert canonicalize_url("http://a.com:8080/p?q=1") == "http://a.com:8080/p?q=1"
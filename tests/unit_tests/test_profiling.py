@@ -0,0 +1,55 @@
+"""Unit tests for per-phase profiling."""
+
+from unittest.mock import Mock
+
+from langchain_hyperbrowser import HyperbrowserLoader
+from langchain_hyperbrowser.profiling import Profiler, phase
+
+
+class FakeScrapeManager:
+    def start(self, params):
+        return Mock(job_id="job-1")
+
+    def get_status(self, job_id):
+        return Mock(status="completed")
+
+    def get(self, job_id):
+        return Mock(data=Mock(markdown="Content", html=None, metadata={}))
+
+    def start_and_wait(self, params):
+        job_id = self.start(params).job_id
+        self.get_status(job_id)
+        return self.get(job_id)
+
+
+def test_loader_records_sdk_phases():
+    """Test that loader URLs are broken down into params, job and HTTP phases."""
+    profiler = Profiler(track_allocations=True)
+    loader = HyperbrowserLoader(
+        urls=["https://example.com/a", "https://example.com/b"],
+        api_key="test-key",
+        profiler=profiler,
+    )
+    loader.hyperbrowser = Mock(scrape=FakeScrapeManager())
+
+    docs = loader.load()
+
+    assert [doc.page_content for doc in docs] == ["Content", "Content"]
+    report = profiler.to_json()
+    assert report["loader.scrape"]["count"] == 2
+    for path in ("params", "queue", "job", "job/start", "job/poll", "job/fetch"):
+        assert report[f"loader.scrape/{path}"]["count"] == 2
+    stacks = [line.rsplit(" ", 1)[0] for line in profiler.folded().splitlines()]
+    assert "loader.scrape;job;start" in stacks
+
+
+def test_phases_outside_a_call_are_ignored():
+    """Test that phases only record inside a profiled call."""
+    profiler = Profiler()
+    with phase("params"):
+        pass
+    with profiler.call("tool"):
+        with phase("params"):
+            pass
+
+    assert sorted(profiler.to_json()) == ["tool", "tool/params"]
@@ -0,0 +1,106 @@
+"""Unit tests for sitemap discovery."""
+
+import gzip
+from datetime import datetime, timezone
+
+from langchain_hyperbrowser.sitemap import (
+    SitemapOptions,
+    SitemapWalker,
+    parse_lastmod,
+)
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+INDEX = f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex {NS}>
+  <sitemap><loc>https://a.com/blog.xml.gz</loc><lastmod>2024-05-01</lastmod></sitemap>
+  <sitemap><loc>https://a.com/old.xml</loc><lastmod>2019-01-01</lastmod></sitemap>
+</sitemapindex>""".encode()
+
+BLOG = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset {NS}>
+  <url><loc>https://a.com/blog/new</loc><lastmod>2024-05-01T10:00:00Z</lastmod></url>
+  <url><loc>https://a.com/blog/stale</loc><lastmod>2020-01-01</lastmod></url>
+  <url><loc>https://a.com/blog/undated</loc></url>
+  <url><loc>https://a.com/tag/python</loc><lastmod>2024-05-02</lastmod></url>
+  <url><loc>https://a.com/blog/new</loc></url>
+</urlset>""".encode()
+
+OLD = f"""<urlset {NS}><url><loc>https://a.com/archive</loc></url></urlset>""".encode()
+
+
+def _fetcher(bodies: dict):
+    requested = []
+
+    def fetch(url: str):
+        requested.append(url)
+        body = bodies[url]
+        # Deliver in small chunks to exercise the incremental parser.
+        return (body[i : i + 7] for i in range(0, len(body), 7))
+
+    return fetch, requested
+
+
+def test_walks_nested_gzipped_sitemaps():
+    """Test following an index into a gzipped urlset with deduplication."""
+    fetch, _ = _fetcher(
+        {
+            "https://a.com/sitemap.xml": INDEX,
+            "https://a.com/blog.xml.gz": gzip.compress(BLOG),
+            "https://a.com/old.xml": OLD,
+        }
+    )
+    urls = [
+        e.url for e in SitemapWalker(fetcher=fetch).walk(["https://a.com/sitemap.xml"])
+    ]
+
+    assert urls == [
+        "https://a.com/blog/new",
+        "https://a.com/blog/stale",
+        "https://a.com/blog/undated",
+        "https://a.com/tag/python",
+        "https://a.com/archive",
+    ]
+
+
+def test_filters_by_lastmod_and_patterns():
+    """Test lastmod and pattern filters, including skipping stale indexes."""
+    fetch, requested = _fetcher(
+        {
+            "https://a.com/sitemap.xml": INDEX,
+            "https://a.com/blog.xml.gz": gzip.compress(BLOG),
+        }
+    )
+    options = SitemapOptions(
+        modified_since=datetime(2024, 1, 1),
+        include_undated=False,
+        include_patterns=[r"/blog/"],
+    )
+    walker = SitemapWalker(options, fetcher=fetch)
+
+    assert [e.url for e in walker.walk(["https://a.com/sitemap.xml"])] == [
+        "https://a.com/blog/new"
+    ]
+    assert "https://a.com/old.xml" not in requested
+
+
+def test_discovers_sitemaps_from_robots_txt():
+    """Test that a site root is resolved through robots.txt."""
+    fetch, _ = _fetcher(
+        {
+            "https://a.com/robots.txt": b"User-agent: *\nSitemap: https://a.com/old.xml\n",
+            "https://a.com/old.xml": OLD,
+        }
+    )
+    walker = SitemapWalker(SitemapOptions(max_urls=1), fetcher=fetch)
+
+    assert [e.url for e in walker.walk(["https://a.com"])] == ["https://a.com/archive"]
+
+
+def test_parse_lastmod():
+    """Test W3C datetime parsing."""
+    assert parse_lastmod("2024-05-01") == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert parse_lastmod("2024-05-01T10:00:00Z") == datetime(
+        2024, 5, 1, 10, tzinfo=timezone.utc
+    )
+    assert parse_lastmod("yesterday") is None
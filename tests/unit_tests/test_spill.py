@@ -0,0 +1,107 @@
+"""Unit tests for result budgets and spilling."""
+
+import json
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+from hyperbrowser.models.crawl import CrawledPage, CrawlJobResponse
+
+from langchain_hyperbrowser import HyperbrowserCrawlTool
+from langchain_hyperbrowser.spill import ResultBudget, SpillBuffer, SpilledResult
+
+
+def _page(i: int) -> CrawledPage:
+    return CrawledPage(
+        url=f"https://a.com/{i}",
+        status="completed",
+        markdown="x" * 100,
+        metadata={"title": f"Page {i}"},
+    )
+
+
+def test_buffer_stays_inline_within_budget(tmp_path):
+    """Test that small results are returned as the pages themselves."""
+    buffer = SpillBuffer(ResultBudget(spill_dir=str(tmp_path)))
+    buffer.add(_page(0))
+
+    assert buffer.result() == [_page(0)]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_buffer_spills_over_page_budget(tmp_path):
+    """Test that exceeding the budget writes every page to a JSONL file."""
+    budget = ResultBudget(max_pages=2, summary_pages=1, spill_dir=str(tmp_path))
+    buffer = SpillBuffer(budget)
+    for i in range(5):
+        buffer.add(_page(i))
+
+    result = buffer.result()
+
+    assert isinstance(result, SpilledResult)
+    assert result.pages == 5
+    assert [s.title for s in result.summary] == ["Page 0"]
+    with open(result.path) as f:
+        urls = [json.loads(line)["url"] for line in f]
+    assert urls == [f"https://a.com/{i}" for i in range(5)]
+
+
+def _batches():
+    return [
+        CrawlJobResponse(
+            jobId="job",
+            status="completed",
+            data=[_page(2 * batch), _page(2 * batch + 1)],
+            totalCrawledPages=4,
+            totalPageBatches=2,
+            currentPageBatch=batch + 1,
+            batchSize=2,
+        )
+        for batch in range(2)
+    ]
+
+
+def test_crawl_tool_pages_results_into_spill(tmp_path):
+    """Test that a budgeted crawl fetches batches and returns a reference."""
+    client = Mock()
+    client.crawl.start.return_value = Mock(job_id="job")
+    client.crawl.get_status.return_value = Mock(status="completed")
+    client.crawl.get.side_effect = _batches()
+    tool = HyperbrowserCrawlTool(
+        api_key="test-key",
+        result_budget={"max_bytes": 300, "batch_size": 2, "spill_dir": str(tmp_path)},
+    )
+
+    with patch.object(HyperbrowserCrawlTool, "_get_client", return_value=client):
+        result = tool.invoke({"url": "https://a.com"})
+
+    client.crawl.start_and_wait.assert_not_called()
+    assert client.crawl.get.call_count == 2
+    assert isinstance(result["data"], SpilledResult)
+    assert result["data"].pages == 4
+
+
+async def test_async_crawl_buffers_pages_off_the_event_loop(tmp_path):
+    """Test that an async budgeted crawl adds pages to the buffer in a thread."""
+    client = Mock()
+    client.crawl.start = AsyncMock(return_value=Mock(job_id="job"))
+    client.crawl.get_status = AsyncMock(return_value=Mock(status="completed"))
+    client.crawl.get = AsyncMock(side_effect=_batches())
+    tool = HyperbrowserCrawlTool(
+        api_key="test-key",
+        result_budget={"max_bytes": 300, "batch_size": 2, "spill_dir": str(tmp_path)},
+    )
+    threads = []
+    add = SpillBuffer.add
+
+    def record(buffer, page):
+        threads.append(threading.get_ident())
+        add(buffer, page)
+
+    with patch.object(
+        HyperbrowserCrawlTool, "_get_async_client", return_value=client
+    ), patch.object(SpillBuffer, "add", record):
+        result = await tool.ainvoke({"url": "https://a.com"})
+
+    assert result["data"].pages == 4
+    assert len(threads) == 4
+    assert threading.get_ident() not in threads
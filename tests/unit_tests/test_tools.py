@@ -0,0 +1,190 @@
+"""Unit tests for the Hyperbrowser tools."""
+
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from langchain_hyperbrowser import (
+    HyperbrowserBrowserUseTool,
+    HyperbrowserCrawlTool,
+    HyperbrowserExtractTool,
+    HyperbrowserScrapeTool,
+)
+from langchain_hyperbrowser._utilities import close_clients
+
+
+@pytest.fixture
+def mock_hyperbrowser():
+    close_clients()
+    with patch("hyperbrowser.Hyperbrowser") as mock:
+        yield mock
+    close_clients()
+
+
+def test_tool_client_is_lazy_and_shared(mock_hyperbrowser):
+    """Test that tools share one client per API key, built on first use."""
+    first = HyperbrowserScrapeTool(api_key="test-key")
+    second = HyperbrowserScrapeTool(api_key="test-key")
+    mock_hyperbrowser.assert_not_called()
+
+    assert first._get_client() is second._get_client()
+    mock_hyperbrowser.assert_called_once()
+
+
+def test_closing_a_tool_keeps_shared_client_open_for_others(mock_hyperbrowser):
+    """Test that a shared client is closed only when its last tool closes."""
+    first = HyperbrowserScrapeTool(api_key="test-key")
+    second = HyperbrowserScrapeTool(api_key="test-key")
+    client = first._get_client()
+    assert second._get_client() is client
+
+    first.close()
+    client.close.assert_not_called()
+    assert second._get_client() is client
+
+    second.close()
+    client.close.assert_called_once()
+
+
+def test_scrape_batch_uses_one_batch_job(mock_hyperbrowser):
+    """Test that scrape batches are fetched with a single batch scrape job."""
+    from hyperbrowser.models.scrape import ScrapedPage
+
+    client = mock_hyperbrowser.return_value
+    client.scrape.batch.start_and_wait.return_value = Mock(
+        data=[
+            ScrapedPage(url="https://a.com", status="completed", markdown="A"),
+            ScrapedPage(url="https://b.com", status="failed", error="boom"),
+        ]
+    )
+    client.scrape.start_and_wait.return_value = Mock(data="single", error=None)
+    tool = HyperbrowserScrapeTool(api_key="test-key")
+
+    results = tool.batch(
+        [
+            {"url": "https://b.com"},
+            {"url": "https://a.com"},
+            {"url": "https://c.com", "scrape_options": {"formats": ["html"]}},
+        ]
+    )
+
+    assert client.scrape.batch.start_and_wait.call_count == 1
+    params = client.scrape.batch.start_and_wait.call_args[0][0]
+    assert params.urls == ["https://b.com", "https://a.com"]
+    assert results[0]["error"] == "boom"
+    assert results[1]["data"].markdown == "A"
+    assert results[2] == {"data": "single", "error": None}
+
+
+def test_scrape_batch_matches_pages_to_submitted_urls(mock_hyperbrowser):
+    """Test that redirected batch pages still answer the URL that was asked for."""
+    from hyperbrowser.models.scrape import ScrapedPage
+
+    client = mock_hyperbrowser.return_value
+    client.scrape.batch.start_and_wait.return_value = Mock(
+        data=[
+            ScrapedPage(url="https://www.a.com/", status="completed", markdown="A"),
+            ScrapedPage(url="https://b.com/new", status="completed", markdown="B"),
+        ]
+    )
+    tool = HyperbrowserScrapeTool(api_key="test-key")
+
+    results = tool.batch([{"url": "https://a.com"}, {"url": "https://b.com/old"}])
+
+    assert [result["data"].markdown for result in results] == ["A", "B"]
+    client.scrape.start_and_wait.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_crawl_abatch_keeps_order_and_returns_exceptions():
+    """Test that abatch preserves input order and reports per-item errors."""
+
+    async def crawl(params):
+        if params.url == "https://bad.com":
+            raise RuntimeError("failed")
+        return Mock(data=params.url, error=None)
+
+    tool = HyperbrowserCrawlTool(api_key="test-key")
+    with patch("hyperbrowser.AsyncHyperbrowser") as mock_async:
+        mock_async.return_value.crawl.start_and_wait = AsyncMock(side_effect=crawl)
+        results = await tool.abatch(
+            ["https://a.com", "https://bad.com", "https://c.com"],
+            {"max_concurrency": 2},
+            return_exceptions=True,
+        )
+
+    assert results[0]["data"] == "https://a.com"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2]["data"] == "https://c.com"
+
+
+def test_browser_use_budget_caps_task_and_reports_usage():
+    """Test that budgets cap steps, pick vision and report usage."""
+    steps = [
+        Mock(metadata=Mock(input_tokens=100)),
+        Mock(metadata=Mock(input_tokens=250)),
+    ]
+    agent = Mock()
+    agent.start.return_value = Mock(job_id="job-1")
+    agent.get_status.return_value = Mock(status="completed")
+    agent.get.return_value = Mock(
+        status="completed", data=Mock(steps=steps, final_result="done"), error=None
+    )
+    client = Mock()
+    client.agents.browser_use = agent
+    tool = HyperbrowserBrowserUseTool(
+        api_key="test-key",
+        budget={"name": "lookup", "max_steps": 5, "max_input_tokens": 4000},
+    )
+
+    with patch.object(HyperbrowserBrowserUseTool, "_get_client", return_value=client):
+        result = tool.invoke({"task": "Find the CEO's name", "max_steps": 20})
+
+    params = agent.start.call_args[0][0]
+    assert (params.max_steps, params.max_input_tokens) == (5, 4000)
+    assert params.use_vision is False
+    assert result["data"] == "done"
+    assert result["usage"]["steps"] == 2
+    assert result["usage"]["input_tokens"] == 350
+    assert tool.usage_stats()["lookup"]["runs"] == 1
+
+
+class Author(BaseModel):
+    name: str
+
+
+def test_extract_many_runs_one_job_for_all_schemas():
+    """Test that several schemas are merged into one job and split by name."""
+    client = Mock()
+    client.extract.start_and_wait.return_value = Mock(
+        data={"Author": {"name": "Ada"}, "price": {"amount": 3}}, error=None
+    )
+    price = {"type": "object", "properties": {"amount": {"type": "number"}}}
+    tool = HyperbrowserExtractTool(api_key="test-key")
+
+    with patch.object(HyperbrowserExtractTool, "_get_client", return_value=client):
+        result = tool.extract_many(
+            "https://example.com", {"Author": Author, "price": price}
+        )
+
+    client.extract.start_and_wait.assert_called_once()
+    schema = client.extract.start_and_wait.call_args[0][0].schema_
+    assert schema["required"] == ["Author", "price"]
+    assert schema["properties"]["price"] == price
+    assert result["data"] == {"Author": {"name": "Ada"}, "price": {"amount": 3}}
+
+
+def test_merge_schemas_inlines_refs_of_dict_schemas():
+    """Test that a dict schema's ``$defs`` references still resolve when nested."""
+    from langchain_hyperbrowser.extract_tool import merge_schemas
+
+    class Book(BaseModel):
+        author: Author
+
+    merged = merge_schemas({"book": Book.model_json_schema()})
+
+    author = merged["properties"]["book"]["properties"]["author"]
+    assert author["properties"]["name"] == {"title": "Name", "type": "string"}
+    assert "$ref" not in json.dumps(merged)
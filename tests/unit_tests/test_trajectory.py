@@ -0,0 +1,162 @@
+"""Unit tests for trajectory record and replay of computer-use tasks."""
+
+from unittest.mock import Mock, patch
+
+from hyperbrowser.models import ClaudeComputerUseTaskResponse
+
+from langchain_hyperbrowser import (
+    HyperbrowserClaudeComputerUseTool,
+    HyperbrowserOpenAICUATool,
+)
+from langchain_hyperbrowser.trajectory import (
+    TrajectoryReplayer,
+    bind_actions,
+    task_template,
+)
+
+
+def _response(actions, final_result="done"):
+    step = {
+        "role": "assistant",
+        "type": "message",
+        "model": "claude",
+        "content": [
+            {"type": "tool_use", "name": "computer", "input": action}
+            for action in actions
+        ],
+    }
+    return ClaudeComputerUseTaskResponse(
+        jobId="job",
+        status="completed",
+        data={"steps": [step], "finalResult": final_result},
+    )
+
+
+def _agent(*responses):
+    agent = Mock()
+    agent.start.return_value = Mock(job_id="job")
+    agent.get_status.return_value = Mock(status="completed")
+    agent.get.side_effect = list(responses)
+    client = Mock()
+    client.agents.claude_computer_use = agent
+    client.sessions.create.return_value = Mock(id="session-1")
+    return client, agent
+
+
+def test_task_template_separates_inputs():
+    """Test that quoted strings and numbers are a task's inputs."""
+    assert task_template("Search 'red shoes' under 50, don't sort") == (
+        "Search '{0}' under {1}, don't sort",
+        ["red shoes", "50"],
+    )
+
+
+def test_bind_actions_replaces_whole_tokens_only():
+    """Test that inputs are swapped as whole tokens and ambiguity is refused."""
+    actions = [{"action": "type", "text": "size 10 red shoes, 1 pair"}]
+
+    assert bind_actions(actions, ["red shoes", "1"], ["blue hats", "3"]) == [
+        {"action": "type", "text": "size 10 blue hats, 3 pair"}
+    ]
+    assert bind_actions([{"key": "ctrl+1"}, {"text": "1"}], ["1"], ["3"]) is None
+    assert bind_actions(actions, ["1", "1"], ["2", "3"]) is None
+
+
+def test_replays_recorded_actions_with_new_inputs():
+    """Test that a recorded run is replayed, leaving only the final answer."""
+    recorded = [{"action": "left_click"}, {"action": "type", "text": "red shoes"}]
+    client, agent = _agent(_response(recorded), _response([], "3 results"))
+    performed = []
+    replayer = TrajectoryReplayer(
+        executor=lambda session, action: performed.append(action)
+    )
+    tool = HyperbrowserClaudeComputerUseTool(api_key="test-key", trajectories=replayer)
+
+    with patch.object(
+        HyperbrowserClaudeComputerUseTool, "_get_client", return_value=client
+    ):
+        tool.invoke({"task": 'Search for "red shoes"'})
+        result = tool.invoke({"task": 'Search for "blue hats"'})
+
+    assert performed == [
+        {"action": "left_click"},
+        {"action": "type", "text": "blue hats"},
+    ]
+    params = agent.start.call_args[0][0]
+    assert params.session_id == "session-1"
+    assert params.max_steps == replayer.finish_steps
+    client.sessions.stop.assert_called_once_with("session-1")
+    assert result["data"] == "3 results"
+    stats = replayer.stats()
+    assert (stats["misses"], stats["hits"], stats["recorded"]) == (1, 1, 1)
+
+
+def test_divergence_hands_over_to_the_agent_and_rerecords():
+    """Test that the agent continues after a diverged step and is recorded."""
+    client, agent = _agent(
+        _response([{"action": "left_click"}, {"action": "key", "text": "Enter"}]),
+        _response([{"action": "scroll"}]),
+    )
+
+    def executor(session, action):
+        if action["action"] == "key":
+            raise RuntimeError("element not found")
+
+    replayer = TrajectoryReplayer(executor=executor)
+    tool = HyperbrowserClaudeComputerUseTool(api_key="test-key", trajectories=replayer)
+
+    with patch.object(
+        HyperbrowserClaudeComputerUseTool, "_get_client", return_value=client
+    ):
+        tool.invoke({"task": "Open the first post"})
+        tool.invoke({"task": "Open the first post"})
+
+    assert agent.start.call_args[0][0].task.startswith("Continue this task")
+    trajectory = replayer.store.get("claude_computer_use", "Open the first post")
+    assert trajectory.actions == [{"action": "left_click"}, {"action": "scroll"}]
+    assert replayer.stats()["divergences"] == 1
+
+
+def test_guided_runs_are_not_counted_as_hits():
+    """Test that following recorded actions without an executor is not a hit."""
+    client, agent = _agent(_response([{"action": "left_click"}]), _response([]))
+    replayer = TrajectoryReplayer()
+    tool = HyperbrowserClaudeComputerUseTool(api_key="test-key", trajectories=replayer)
+
+    with patch.object(
+        HyperbrowserClaudeComputerUseTool, "_get_client", return_value=client
+    ):
+        tool.invoke({"task": "Open the first post"})
+        tool.invoke({"task": "Open the first post"})
+
+    assert agent.start.call_args[0][0].task != "Open the first post"
+    stats = replayer.stats()
+    assert (stats["hits"], stats["guided"], stats["hit_rate"]) == (0, 1, 0.0)
+
+
+def test_agents_sharing_a_store_keep_separate_trajectories():
+    """Test that one agent's trajectory is not replayed for another agent."""
+    client, claude = _agent(_response([{"action": "left_click"}]))
+    cua = Mock()
+    cua.start.return_value = Mock(job_id="job")
+    cua.get_status.return_value = Mock(status="completed")
+    cua.get.return_value = Mock(status="completed", error=None, data=Mock(steps=[]))
+    client.agents.cua = cua
+    performed = []
+    replayer = TrajectoryReplayer(
+        executor=lambda session, action: performed.append(action)
+    )
+    claude_tool = HyperbrowserClaudeComputerUseTool(
+        api_key="test-key", trajectories=replayer
+    )
+    cua_tool = HyperbrowserOpenAICUATool(api_key="test-key", trajectories=replayer)
+
+    with patch.object(
+        HyperbrowserClaudeComputerUseTool, "_get_client", return_value=client
+    ), patch.object(HyperbrowserOpenAICUATool, "_get_client", return_value=client):
+        claude_tool.invoke({"task": "Open the first post"})
+        cua_tool.invoke({"task": "Open the first post"})
+
+    assert performed == []
+    assert cua.start.call_args[0][0].task == "Open the first post"
+    assert replayer.stats()["misses"] == 2